@@ -0,0 +1,315 @@
+import numpy as np
+from typing import Optional
+from config.settings import INITIAL_HAND_SIZE
+from backend.legality import LEGAL_TABLE
+
+# Card kinds follow the 0-53 layout of rl_utils.get_card_index:
+# color c (Red, Blue, Green, Yellow) owns c*13 .. c*13+12
+# (0-9 numbers, 10 Skip, 11 Reverse, 12 Draw Two), 52 Wild, 53 Wild Draw Four.
+NUM_KINDS = 54
+NUM_COLORS = 4
+DECK_SIZE = 108
+WILD = 52
+WILD_DRAW_FOUR = 53
+NO_COLOR = NUM_COLORS  # Color slot used by wild kinds
+DRAW = -1  # Action value meaning "draw instead of playing"
+
+SKIP_SYMBOL = 10
+REVERSE_SYMBOL = 11
+DRAW_TWO_SYMBOL = 12
+
+# Challenge outcome codes stored in last_challenge_result
+CHALLENGE_NONE = 0
+CHALLENGE_SUCCEEDED = 1
+CHALLENGE_FAILED = 2
+
+KIND_COLOR = np.full(NUM_KINDS, NO_COLOR, dtype=np.int8)
+KIND_SYMBOL = np.zeros(NUM_KINDS, dtype=np.int8)
+for _c in range(NUM_COLORS):
+    KIND_COLOR[_c * 13:_c * 13 + 13] = _c
+    KIND_SYMBOL[_c * 13:_c * 13 + 13] = np.arange(13)
+KIND_SYMBOL[WILD] = 13
+KIND_SYMBOL[WILD_DRAW_FOUR] = 14
+
+# 1 zero, 2 of each 1-9 / Skip / Reverse / Draw Two per color, 4 Wild, 4 Wild Draw Four
+DECK_COUNTS = np.full(NUM_KINDS, 2, dtype=np.int16)
+DECK_COUNTS[[c * 13 for c in range(NUM_COLORS)]] = 1
+DECK_COUNTS[[WILD, WILD_DRAW_FOUR]] = 4
+DECK_KINDS = np.repeat(np.arange(NUM_KINDS, dtype=np.int8), DECK_COUNTS)
+
+
+class BatchedGameManager:
+    """
+    Array-backed UNO engine that advances N independent games at once.
+
+    Every game is stored as rows of NumPy arrays (hands as 54-bin count
+    matrices, draw and discard piles as card-kind stacks, color / direction /
+    turn as int vectors), so legal-move masks, card effects, penalty draws and
+    reshuffles are computed for all games in a single vectorized step.
+    Rules mirror GameManager, including the strict color rule on a Wild top card.
+    """
+
+    def __init__(self, num_games: int, num_players: int = 4, seed: Optional[int] = None):
+        self.num_games = num_games
+        self.num_players = num_players
+        self.rng = np.random.default_rng(seed)
+
+        n, p = num_games, num_players
+        self.hands = np.zeros((n, p, NUM_KINDS), dtype=np.int16)
+        self.draw_pile = np.zeros((n, DECK_SIZE), dtype=np.int8)
+        self.draw_size = np.zeros(n, dtype=np.int32)
+        self.discard_pile = np.zeros((n, DECK_SIZE), dtype=np.int8)
+        self.discard_size = np.zeros(n, dtype=np.int32)
+        self.current_color = np.zeros(n, dtype=np.int8)
+        self.direction = np.ones(n, dtype=np.int8)
+        self.current_player = np.zeros(n, dtype=np.int32)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, -1, dtype=np.int32)
+        self.last_challenge_result = np.zeros(n, dtype=np.int8)
+
+    # ------------------------------------------------------------------ setup
+
+    def start_game(self, games=None):
+        """Shuffle, deal and flip the start card for the given games (default: all)."""
+        g = self._as_games(games)
+        m = len(g)
+        if m == 0:
+            return
+
+        self.hands[g] = 0
+        self.discard_size[g] = 0
+        self.direction[g] = 1
+        self.current_player[g] = 0
+        self.game_over[g] = False
+        self.winner[g] = -1
+        self.last_challenge_result[g] = CHALLENGE_NONE
+
+        perm = np.argsort(self.rng.random((m, DECK_SIZE)), axis=1)
+        self.draw_pile[g] = DECK_KINDS[perm]
+        self.draw_size[g] = DECK_SIZE
+
+        # Deal round-robin from the end of the pile, like GameManager.start_game
+        n_deal = INITIAL_HAND_SIZE * self.num_players
+        dealt = self.draw_pile[g, DECK_SIZE - n_deal:][:, ::-1].reshape(m, INITIAL_HAND_SIZE, self.num_players)
+        rows = np.repeat(g, n_deal)
+        seats = np.tile(np.arange(self.num_players), m * INITIAL_HAND_SIZE)
+        np.add.at(self.hands, (rows, seats, dealt.reshape(-1)), 1)
+        self.draw_size[g] -= n_deal
+
+        # Flip start card; Wild Draw Four goes back into the pile and the pile is reshuffled
+        start = self._pop_draw(g)
+        redo = start == WILD_DRAW_FOUR
+        while redo.any():
+            rg = g[redo]
+            self.draw_pile[rg, self.draw_size[rg]] = WILD_DRAW_FOUR
+            self.draw_size[rg] += 1
+            self._shuffle_prefix(self.draw_pile, rg, self.draw_size[rg])
+            start[redo] = self._pop_draw(rg)
+            redo = start == WILD_DRAW_FOUR
+
+        self._push_discard(g, start)
+        color = KIND_COLOR[start]
+        wild = color == NO_COLOR
+        color[wild] = self.rng.integers(0, NUM_COLORS, wild.sum())
+        self.current_color[g] = color
+
+    # ---------------------------------------------------------------- queries
+
+    def top_card(self) -> np.ndarray:
+        """Kind index of the top discard card for every game."""
+        idx = np.maximum(self.discard_size - 1, 0)
+        return self.discard_pile[np.arange(self.num_games), idx].astype(np.int64)
+
+    def playable_kinds(self) -> np.ndarray:
+        """Boolean [N, 54]: which card kinds may legally be played on each game's top card."""
+        # Shared precomputed (top kind x active color x hand kind) table, same rules as GameManager
+        return LEGAL_TABLE[self.top_card(), self.current_color]
+
+    def current_hands(self) -> np.ndarray:
+        """Hand count matrix [N, 54] of the player to move in each game."""
+        return self.hands[np.arange(self.num_games), self.current_player]
+
+    def legal_mask(self) -> np.ndarray:
+        """Boolean [N, 54]: card kinds the current player holds and may play. All False once a game is over."""
+        mask = self.playable_kinds() & (self.current_hands() > 0)
+        mask[self.game_over] = False
+        return mask
+
+    def hand_sizes(self) -> np.ndarray:
+        """Hand sizes [N, P]."""
+        return self.hands.sum(axis=2)
+
+    def random_actions(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Uniformly random legal card kind per game, DRAW where nothing is playable (SimpleAI policy)."""
+        if mask is None:
+            mask = self.legal_mask()
+        keys = self.rng.random(mask.shape)
+        keys[~mask] = -1.0
+        actions = keys.argmax(axis=1)
+        actions[~mask.any(axis=1)] = DRAW
+        return actions
+
+    # ------------------------------------------------------------------- step
+
+    def step(self, cards, colors=None, challenges=None, play_drawn=None):
+        """
+        Advance every unfinished game by one turn.
+
+        Args:
+            cards: int [N], card kind to play or DRAW. Must be legal for the current player.
+            colors: int [N], color (COLOR_ORDER index) announced when a wild kind is played.
+                    Missing or out-of-range values fall back to a random color.
+            challenges: bool [N], whether the victim challenges a Wild Draw Four played this turn.
+            play_drawn: bool [N], whether a playable drawn card is played immediately (default True).
+        """
+        n = self.num_games
+        cards = np.asarray(cards, dtype=np.int64)
+        colors = np.full(n, -1, dtype=np.int64) if colors is None else np.asarray(colors, dtype=np.int64)
+        challenges = np.zeros(n, dtype=bool) if challenges is None else np.asarray(challenges, dtype=bool)
+        play_drawn = np.ones(n, dtype=bool) if play_drawn is None else np.asarray(play_drawn, dtype=bool)
+
+        active = ~self.game_over
+        self.last_challenge_result[active] = CHALLENGE_NONE
+        playable = self.playable_kinds()
+
+        play_games = np.flatnonzero(active & (cards >= 0))
+        play_kinds = cards[play_games]
+        ok = playable[play_games, play_kinds] & (self.hands[play_games, self.current_player[play_games], play_kinds] > 0)
+        if not ok.all():
+            bad = play_games[~ok][0]
+            raise ValueError(f"Illegal move in game {bad}: kind {cards[bad]}")
+
+        # Draw one card; a playable drawn card may be played right away
+        draw_games = np.flatnonzero(active & (cards < 0))
+        drawn = self._draw(draw_games, self.current_player[draw_games], 1)
+        can_play = (drawn >= 0) & playable[draw_games, np.maximum(drawn, 0)] & play_drawn[draw_games]
+        self._advance(draw_games[~can_play], 1)
+
+        self._play(
+            np.concatenate([play_games, draw_games[can_play]]),
+            np.concatenate([play_kinds, drawn[can_play]]),
+            colors, challenges,
+        )
+
+    def _play(self, g, kinds, colors, challenges):
+        if len(g) == 0:
+            return
+        p = self.num_players
+        actor = self.current_player[g].astype(np.int64)
+
+        self.hands[g, actor, kinds] -= 1
+        self._push_discard(g, kinds)
+
+        won = self.hands[g, actor].sum(axis=1) == 0
+        self.game_over[g[won]] = True
+        self.winner[g[won]] = actor[won]
+        g, kinds, actor = g[~won], kinds[~won], actor[~won]
+        if len(g) == 0:
+            return
+
+        previous_color = self.current_color[g].astype(np.int64)
+        kind_color = KIND_COLOR[kinds]
+        wild = kind_color == NO_COLOR
+        chosen = colors[g]
+        fallback = wild & ((chosen < 0) | (chosen >= NUM_COLORS))
+        chosen[fallback] = self.rng.integers(0, NUM_COLORS, fallback.sum())
+        self.current_color[g] = np.where(wild, chosen, kind_color)
+
+        symbol = KIND_SYMBOL[kinds]
+        reverse = symbol == REVERSE_SYMBOL
+        self.direction[g[reverse]] *= -1
+        extra = (symbol == SKIP_SYMBOL) | (symbol == DRAW_TWO_SYMBOL)
+        if p == 2:
+            # 2 Players: Reverse acts as Skip
+            extra |= reverse
+
+        victim = (actor + self.direction[g]) % p
+        d2 = symbol == DRAW_TWO_SYMBOL
+        self._draw(g[d2], victim[d2], 2)
+
+        w4 = kinds == WILD_DRAW_FOUR
+        if w4.any():
+            wg, wactor, wvictim, wprev = g[w4], actor[w4], victim[w4], previous_color[w4]
+            # Bluff check: does actor still hold a card of the previous color?
+            bluff = ((self.hands[wg, wactor] > 0) & (KIND_COLOR[None, :] == wprev[:, None])).any(axis=1)
+            challenged = challenges[wg]
+            succeeded = challenged & bluff
+            failed = challenged & ~bluff
+
+            # Successful challenge: actor takes back the +4 and draws 4, color reverts
+            sg = wg[succeeded]
+            self.discard_size[sg] -= 1
+            self.hands[sg, wactor[succeeded], WILD_DRAW_FOUR] += 1
+            self._draw(sg, wactor[succeeded], 4)
+            self.current_color[sg] = wprev[succeeded]
+            # Failed challenge: victim draws 6. No challenge: victim draws 4.
+            self._draw(wg[failed], wvictim[failed], 6)
+            self._draw(wg[~challenged], wvictim[~challenged], 4)
+
+            self.last_challenge_result[wg[succeeded]] = CHALLENGE_SUCCEEDED
+            self.last_challenge_result[wg[failed]] = CHALLENGE_FAILED
+            extra[w4] = ~succeeded
+
+        self._advance(g, 1 + extra)
+
+    # ---------------------------------------------------------------- helpers
+
+    def _as_games(self, games) -> np.ndarray:
+        if games is None:
+            return np.arange(self.num_games)
+        games = np.asarray(games)
+        if games.dtype == bool:
+            return np.flatnonzero(games)
+        return games.astype(np.int64)
+
+    def _advance(self, g, steps):
+        self.current_player[g] = (self.current_player[g] + self.direction[g] * steps) % self.num_players
+
+    def _push_discard(self, g, kinds):
+        self.discard_pile[g, self.discard_size[g]] = kinds
+        self.discard_size[g] += 1
+
+    def _pop_draw(self, g) -> np.ndarray:
+        self.draw_size[g] -= 1
+        return self.draw_pile[g, self.draw_size[g]].astype(np.int64)
+
+    def _shuffle_prefix(self, piles, g, sizes):
+        """Randomly permute the first sizes[i] entries of piles[g[i]] for all i at once."""
+        keys = self.rng.random((len(g), DECK_SIZE))
+        keys[np.arange(DECK_SIZE)[None, :] >= sizes[:, None]] = 2.0
+        perm = np.argsort(keys, axis=1)
+        piles[g] = np.take_along_axis(piles[g], perm, axis=1)
+
+    def _reshuffle(self, g):
+        """Turn the discard pile (except its top card) into a new shuffled draw pile."""
+        sizes = self.discard_size[g] - 1
+        g, sizes = g[sizes > 0], sizes[sizes > 0]
+        if len(g) == 0:
+            return
+        top = self.discard_pile[g, sizes]
+        self.draw_pile[g] = self.discard_pile[g]
+        self.draw_size[g] = sizes
+        self._shuffle_prefix(self.draw_pile, g, sizes)
+        self.discard_pile[g, 0] = top
+        self.discard_size[g] = 1
+
+    def _draw(self, g, players, count) -> np.ndarray:
+        """
+        Each game in g (unique) draws `count` cards into the given player's hand,
+        reshuffling the discard pile when the draw pile runs out.
+        Returns the kind of the last card drawn per game, -1 if nothing could be drawn.
+        """
+        last = np.full(len(g), -1, dtype=np.int64)
+        if len(g) == 0:
+            return last
+        players = np.asarray(players, dtype=np.int64)
+        for _ in range(count):
+            empty = self.draw_size[g] == 0
+            if empty.any():
+                self._reshuffle(g[empty])
+            has = self.draw_size[g] > 0
+            hg = g[has]
+            kinds = self._pop_draw(hg)
+            self.hands[hg, players[has], kinds] += 1
+            last[has] = kinds
+        return last
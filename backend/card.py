@@ -2,26 +2,94 @@ from typing import Optional
 from config.enums import CardColor, CardType
 from backend.utils.colors import TermColors, get_colored_text
 
+# Color order of the 0-53 kind layout (same as rl_utils.COLOR_ORDER)
+KIND_COLORS = [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]
+ACTION_TYPES = [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]
+
+def _kind_index(color: CardColor, card_type: CardType, value: Optional[int]) -> int:
+    """
+    Unique index 0-53 for each card kind.
+    0-9: Red 0-9, 10-12: Red Skip, Rev, +2, 13-25: Blue, 26-38: Green, 39-51: Yellow,
+    52: Wild, 53: Wild Draw 4.
+    """
+    if card_type == CardType.WILD:
+        return 52
+    if card_type == CardType.WILD_DRAW_FOUR:
+        return 53
+    if color not in KIND_COLORS:
+        return 52 # Fallback
+    offset = KIND_COLORS.index(color) * 13
+    if card_type == CardType.NUMBER:
+        return offset + value
+    if card_type in ACTION_TYPES:
+        return offset + 10 + ACTION_TYPES.index(card_type)
+    return 0
+
+def _card_score(card_type: CardType, value: Optional[int]) -> int:
+    if card_type == CardType.NUMBER:
+        return value
+    if card_type in [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]:
+        return 20
+    if card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
+        return 50
+    return 0
+
+
 class Card:
-    """Card class for UNO game."""
+    """
+    Card class for UNO game.
+
+    Cards are interned flyweights: Card(color, type, value) always returns the
+    same immutable instance for the same kind, so equality is identity and
+    the kind index, score and match symbol are computed once at creation.
+    """
+
+    __slots__ = ("color", "card_type", "value", "index", "symbol", "_score")
+    _interned = {}
+
+    def __new__(cls, color: CardColor, card_type: CardType, value: Optional[int] = None):
+        key = (color, card_type, value)
+        card = cls._interned.get(key)
+        if card is None:
+            card = object.__new__(cls)
+            setter = object.__setattr__
+            setter(card, "color", color)
+            setter(card, "card_type", card_type)
+            setter(card, "value", value)
+            setter(card, "index", _kind_index(color, card_type, value))
+            # Match class: number value, or the action type itself
+            setter(card, "symbol", value if card_type == CardType.NUMBER else card_type)
+            setter(card, "_score", _card_score(card_type, value))
+            cls._interned[key] = card
+        return card
 
     def __init__(self, color: CardColor, card_type: CardType, value: Optional[int] = None):
         """
-        Initialize a card.
+        Initialize a card. State is set once in __new__ when the kind is interned.
 
         Args:
             color: The color of the card.
             card_type: The type of the card (Number, Skip, etc.).
             value: The numerical value for Number cards (0-9). None for special cards.
         """
-        self.color = color
-        self.card_type = card_type
-        self.value = value
-    
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are shared and immutable")
+
+    def __reduce__(self):
+        # Unpickling/copying goes back through the intern table
+        return (Card, (self.color, self.card_type, self.value))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __str__(self) -> str:
         color_name = self.color.value
         type_name = self.card_type.value
-        
+
         display_str = ""
         if self.card_type == CardType.NUMBER:
             display_str = f"{color_name} {self.value}"
@@ -36,45 +104,43 @@ class Card:
         return f"Card(color={self.color}, type={self.card_type}, value={self.value})"
 
     def __eq__(self, other):
-        if not isinstance(other, Card):
-            return False
-        return self.color == other.color and self.card_type == other.card_type and self.value == other.value
+        # Interned: equal kinds are the same object
+        return self is other
+
+    def __hash__(self):
+        return hash((self.color, self.card_type, self.value))
 
     def is_match(self, other_card: 'Card') -> bool:
 
         """
         Check if this card matches another card (e.g., top of the discard pile).
-        
+
         Args:
             other_card: The card to match against.
-            
+
         Returns:
             True if matching, False otherwise.
         """
         # Wild cards always match
-        if self.color == CardColor.WILD or other_card.color == CardColor.WILD:
+        if self.color is CardColor.WILD or other_card.color is CardColor.WILD:
             return True # Note: Logic might be more complex for playing logic vs matching logic
-        
-        # Color match
-        if self.color == other_card.color:
-            return True
-        
-        # Value match (for number cards)
-        if self.card_type == CardType.NUMBER and other_card.card_type == CardType.NUMBER:
-            return self.value == other_card.value
-            
-        # Type match (for action cards like Skip, Reverse, Draw Two)
-        if self.card_type == other_card.card_type:
-            return True
-        
-        return False
-        
+
+        # Color match, or value match (numbers) / type match (action cards)
+        return self.color is other_card.color or self.symbol == other_card.symbol
+
     def score(self) -> int:
         """Return the score value of the card."""
-        if self.card_type == CardType.NUMBER:
-            return self.value
-        if self.card_type in [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]:
-            return 20
-        if self.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            return 50
-        return 0
+        return self._score
+
+
+# The 54 card kinds, interned once at import; CARD_KINDS[i].index == i
+CARD_KINDS = [None] * 54
+for _color in KIND_COLORS:
+    for _value in range(10):
+        _card = Card(_color, CardType.NUMBER, _value)
+        CARD_KINDS[_card.index] = _card
+    for _type in ACTION_TYPES:
+        _card = Card(_color, _type)
+        CARD_KINDS[_card.index] = _card
+CARD_KINDS[52] = Card(CardColor.WILD, CardType.WILD)
+CARD_KINDS[53] = Card(CardColor.WILD, CardType.WILD_DRAW_FOUR)
@@ -1,76 +1,210 @@
 import random
 from typing import List, Optional
-from backend.card import Card
+from backend.card import Card, CARD_KINDS
 from config.enums import CardColor, CardType
 from backend.utils.logger import game_logger
+from backend.zobrist import DISCARD_DELTA
+
+def _build_standard_deck() -> List[Card]:
+    cards = []
+    colors = [CardColor.RED, CardColor.YELLOW, CardColor.BLUE, CardColor.GREEN]
+
+    for color in colors:
+        # 1 zero card per color
+        cards.append(Card(color, CardType.NUMBER, 0))
+
+        # 2 of each number 1-9
+        for i in range(1, 10):
+            cards.append(Card(color, CardType.NUMBER, i))
+            cards.append(Card(color, CardType.NUMBER, i))
+
+        # 2 of each action card
+        for action_type in [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]:
+            cards.append(Card(color, action_type))
+            cards.append(Card(color, action_type))
+
+    # Wild cards
+    for _ in range(4):
+        cards.append(Card(CardColor.WILD, CardType.WILD))
+        cards.append(Card(CardColor.WILD, CardType.WILD_DRAW_FOUR))
+    return cards
+
+STANDARD_DECK = _build_standard_deck()
 
 class Deck:
-    """Deck class for managing the draw pile and discard pile."""
+    """
+    Deck class for managing the draw pile and discard pile.
 
-    def __init__(self):
-        self.cards: List[Card] = []
-        self.discard_pile: List[Card] = []
+    The draw pile is shuffled lazily (Fisher-Yates one step at a time): the
+    bottom `_lazy` cards of `cards` are in no particular order, and drawing
+    from that region swaps a uniformly chosen card to the top and pops it.
+    A shuffle only marks the whole pile unordered, so shuffles and discard
+    pile reshuffles are O(1) and each draw costs one swap. Cards above the
+    lazy region (a pile assigned in explicit order) are drawn from the end.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Source of shuffles; GameManager passes its per-game RNG
+        self.rng = rng if rng is not None else random.Random()
+        self._cards: List[Card] = []
+        self._lazy = 0
+        # Discard pile with per-kind counts and its Zobrist hash (backend/zobrist.py),
+        # kept current by discard() / take_top()
+        self._discard_pile: List[Card] = []
+        self._discard_counts = [0] * len(CARD_KINDS)
+        self.discard_hash = 0
         self._initialize_deck()
         self.shuffle()
 
+    def clone(self, rng: Optional[random.Random] = None) -> 'Deck':
+        """Copy of both piles (and the unshuffled region) drawing from rng, for GameManager.clone."""
+        other = Deck.__new__(Deck)
+        other.rng = rng if rng is not None else random.Random()
+        other._cards = list(self._cards)
+        other._lazy = self._lazy
+        other._discard_pile = list(self._discard_pile)
+        other._discard_counts = list(self._discard_counts)
+        other.discard_hash = self.discard_hash
+        return other
+
+    @property
+    def cards(self) -> List[Card]:
+        """The draw pile; the next card is drawn from the end (at random from the unshuffled part)."""
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: List[Card]):
+        # An assigned pile is taken in the given order: cards[-1] is drawn first
+        self._cards = cards
+        self._lazy = 0
+
+    @property
+    def discard_pile(self) -> List[Card]:
+        """The discard pile, top card last. Change it through discard() / take_top() (or assign a new list)."""
+        return self._discard_pile
+
+    @discard_pile.setter
+    def discard_pile(self, cards: List[Card]):
+        self._discard_pile = cards
+        self._rehash_discard()
+
+    def _rehash_discard(self):
+        counts = self._discard_counts
+        for k in range(len(counts)):
+            counts[k] = 0
+        h = 0
+        for card in self._discard_pile:
+            k = card.index
+            h ^= DISCARD_DELTA[k][counts[k]]
+            counts[k] += 1
+        self.discard_hash = h
+
     def _initialize_deck(self):
         """Create the standard 108 UNO cards."""
         game_logger.info("Initializing deck...")
-        colors = [CardColor.RED, CardColor.YELLOW, CardColor.BLUE, CardColor.GREEN]
-        
-        for color in colors:
-            # 1 zero card per color
-            self.cards.append(Card(color, CardType.NUMBER, 0))
-            
-            # 2 of each number 1-9
-            for i in range(1, 10):
-                self.cards.append(Card(color, CardType.NUMBER, i))
-                self.cards.append(Card(color, CardType.NUMBER, i))
-            
-            # 2 of each action card
-            for action_type in [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]:
-                self.cards.append(Card(color, action_type))
-                self.cards.append(Card(color, action_type))
-        
-        # Wild cards
-        for _ in range(4):
-            self.cards.append(Card(CardColor.WILD, CardType.WILD))
-            self.cards.append(Card(CardColor.WILD, CardType.WILD_DRAW_FOUR))
-
-        game_logger.info(f"Deck initialized with {len(self.cards)} cards.")
+        # Cards are interned, so the deck is just 108 references to the 54 shared kinds
+        self._cards = list(STANDARD_DECK)
+        self._lazy = 0
+        game_logger.info("Deck initialized with %d cards.", len(self._cards))
+
+    def reset(self, seed: Optional[int] = None, shuffle: bool = True):
+        """
+        Refill to the standard 108 cards in place (same list objects, no new Cards),
+        empty the discard pile and reshuffle. seed reseeds the deck's RNG first.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self._cards.clear()
+        self._cards.extend(STANDARD_DECK)
+        self._lazy = 0
+        self._discard_pile.clear()
+        self._rehash_discard()
+        if shuffle:
+            self.shuffle()
 
     def shuffle(self):
-        """Shuffle the draw pile."""
-        random.shuffle(self.cards)
+        """Shuffle the draw pile (lazily: the order is drawn card by card)."""
+        self._lazy = len(self._cards)
         game_logger.info("Deck shuffled.")
 
+    def return_card(self, card: Card):
+        """Put a card back into the draw pile and shuffle it in."""
+        self._cards.append(card)
+        self.shuffle()
+
+    def _refill(self) -> bool:
+        """Turn the discard pile (except its top card) into the draw pile. Returns False if there is nothing to draw."""
+        if len(self._discard_pile) <= 1:
+            game_logger.warning("Deck and discard pile are both empty!")
+            return False
+        # Keep the top card; the rest becomes the new (unshuffled) draw pile. The two
+        # lists swap roles, so nothing is allocated.
+        top_card = self._discard_pile.pop()
+        self._cards, self._discard_pile = self._discard_pile, self._cards
+        self._discard_pile.append(top_card)
+        self._rehash_discard()
+        self.shuffle()
+        game_logger.info("Reshuffled discard pile into draw deck.")
+        return True
+
     def draw_card(self) -> Optional[Card]:
         """Draw a single card. If deck is empty, reshuffle discard pile (except top card)."""
-        if not self.cards:
-            if not self.discard_pile:
-                game_logger.warning("Deck and discard pile are both empty!")
+        cards = self._cards
+        n = len(cards)
+        if n > self._lazy:
+            return cards.pop()
+        if not n:
+            if not self._refill():
                 return None
-            
-            # Reshuffle discard pile to form new deck
-            # Keep the top card of the discard pile
-            top_card = self.discard_pile.pop()
-            self.cards = self.discard_pile
-            self.discard_pile = []
-            self.shuffle()
-            self.discard_pile.append(top_card)
-            
-            game_logger.info("Reshuffled discard pile into draw deck.")
+            cards = self._cards
+            n = len(cards)
+        # One Fisher-Yates step: a uniformly chosen unshuffled card swaps with the top
+        j = int(self.rng.random() * n)
+        card = cards[j]
+        cards[j] = cards[n - 1]
+        cards.pop()
+        self._lazy = n - 1
+        return card
 
-        if self.cards:
-             return self.cards.pop()
-        return None
+    def draw_many(self, k: int) -> List[Card]:
+        """Draw k cards (fewer if both piles run out), reshuffling as needed."""
+        drawn = []
+        for _ in range(k):
+            card = self.draw_card()
+            if card is None:
+                break
+            drawn.append(card)
+        return drawn
+
+    def deal(self, n_players: int, n_cards: int) -> List[List[Card]]:
+        """Deal n_cards to each of n_players, one card per player per round. Returns the hands."""
+        hands = [[] for _ in range(n_players)]
+        for _ in range(n_cards):
+            for hand in hands:
+                card = self.draw_card()
+                if card is not None:
+                    hand.append(card)
+        return hands
 
     def discard(self, card: Card):
         """Add a card to the discard pile."""
-        self.discard_pile.append(card)
+        self._discard_pile.append(card)
+        k = card.index
+        self.discard_hash ^= DISCARD_DELTA[k][self._discard_counts[k]]
+        self._discard_counts[k] += 1
+
+    def take_top(self) -> Optional[Card]:
+        """Take the top card back off the discard pile (a +4 returned after a successful challenge)."""
+        if not self._discard_pile:
+            return None
+        card = self._discard_pile.pop()
+        k = card.index
+        self._discard_counts[k] -= 1
+        self.discard_hash ^= DISCARD_DELTA[k][self._discard_counts[k]]
+        return card
 
     def peek_discard_pile(self) -> Optional[Card]:
         """Look at the top card of the discard pile."""
-        if self.discard_pile:
-            return self.discard_pile[-1]
+        if self._discard_pile:
+            return self._discard_pile[-1]
         return None
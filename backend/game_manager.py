@@ -2,76 +2,176 @@ import random
 from typing import List, Optional
 from backend.player import Player
 from backend.deck import Deck
-from backend.card import Card
-from config.enums import CardType, CardColor, Direction, PlayerType
+from backend.card import Card, KIND_COLORS
+from backend.legality import LEGAL_ROWS, color_slot, legal_row
+from backend.rng import SEED_BYTES, game_seed, make_rng
+from backend.zobrist import (TOP_KEYS, COLOR_KEYS, DIRECTION_KEYS, TURN_KEYS, SEAT_KEYS, OPP_SIZE_KEYS,
+                             DECISION_KEYS, DECISION_CARD_KEYS, GAME_OVER_KEY, mix64)
+from config.enums import CardType, CardColor, Direction, PlayerType, DecisionType
 from config.settings import INITIAL_HAND_SIZE, UNO_PENALTY_CARDS
 from backend.utils.logger import game_logger
 
+class Decision:
+    """A point where the game waits for one player's choice (see GameManager.step)."""
+
+    __slots__ = ("type", "player", "legal_cards", "card", "previous_color")
+
+    def __init__(self, decision_type: DecisionType, player: Player, legal_cards: Optional[List[Card]] = None,
+                 card: Optional[Card] = None, previous_color: Optional[CardColor] = None):
+        self.type = decision_type
+        self.player = player
+        self.legal_cards = legal_cards        # PLAY_CARD: playable cards in hand (empty -> must draw)
+        self.card = card                      # CHOOSE_COLOR / PLAY_DRAWN / CHALLENGE: the card concerned
+        self.previous_color = previous_color  # CHALLENGE: active color before the +4
+
+    def __repr__(self):
+        return f"Decision({self.type.name}, player={self.player.name}, card={self.card!r})"
+
+
 class GameManager:
     """Manages the flow of the UNO game."""
 
-    def __init__(self, players: List[Player]):
+    def __init__(self, players: List[Player], seed: Optional[bytes] = None):
         self.players = players
-        self.deck = Deck()
+        # Per-game RNG: every shuffle, color fallback and SimpleAI choice draws from it,
+        # so a game is reproducible from its 16-byte seed (see backend/rng.py)
+        self.seed = seed
+        self.rng = make_rng(seed)
+        self.deck = Deck(rng=self.rng)
+        self._reset_state()
+        # Optional callback for +4 challenge: fn(victim_player, previous_color) -> bool
+        self.challenge_decider = None
+        # Step mode (reset/step): +4 challenges become CHALLENGE decisions instead of decider calls
+        self.step_mode = False
+        
+        # Callbacks for animations (Blocking)
+        self.on_play_card_animation = None # fn(player_id, card)
+        self.on_draw_card_animation = None # fn(player_id, count=1)
+
+        # Optional event sink (backend.game_record.GameRecordWriter): every deal, play,
+        # draw and challenge result is reported to it
+        self.recorder = None
+
+    def _reset_state(self):
         self.current_player_index = 0
         self.direction = Direction.CLOCKWISE
         self.current_color = None # The active valid color (especially after Wild)
         self.game_over = False
         self.winner: Optional[Player] = None
         self.skipped_player: Optional[Player] = None
-        # Optional callback for +4 challenge: fn(victim_player, previous_color) -> bool
-        self.challenge_decider = None
         self.pending_wild_draw_four = None
         self.last_challenge_result = None
-        
-        # Callbacks for animations (Blocking)
-        self.on_play_card_animation = None # fn(player_id, card)
-        self.on_draw_card_animation = None # fn(player_id, count=1)
+        self._decision: Optional[Decision] = None
 
-    def start_game(self):
-        """Initialize game state, deal cards."""
+    def clone(self, rng: Optional[random.Random] = None) -> 'GameManager':
+        """
+        Independent copy of the game for search: hands, both piles, turn state and the
+        pending decision, without callbacks, recorder or hand listeners. The copy draws
+        from rng; by default it gets a copy of this game's RNG state and so replays the
+        same future draws. Clones can be pickled to other processes.
+        """
+        other = GameManager.__new__(GameManager)
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        players = [p.clone() for p in self.players]
+        seat = {id(p): i for i, p in enumerate(self.players)}
+        remap = lambda p: players[seat[id(p)]] if p is not None else None
+        other.players = players
+        other.seed = self.seed
+        other.rng = rng
+        other.deck = self.deck.clone(rng)
+        other.current_player_index = self.current_player_index
+        other.direction = self.direction
+        other.current_color = self.current_color
+        other.game_over = self.game_over
+        other.winner = remap(self.winner)
+        other.skipped_player = remap(self.skipped_player)
+        other.pending_wild_draw_four = dict(self.pending_wild_draw_four) if self.pending_wild_draw_four else None
+        other.last_challenge_result = self.last_challenge_result
+        decision = self._decision
+        if decision is not None:
+            decision = Decision(decision.type, remap(decision.player),
+                                list(decision.legal_cards) if decision.legal_cards is not None else None,
+                                decision.card, decision.previous_color)
+        other._decision = decision
+        other.challenge_decider = None
+        other.step_mode = self.step_mode
+        other.on_play_card_animation = None
+        other.on_draw_card_animation = None
+        other.recorder = None
+        return other
+
+    def start_game(self, step_mode=False):
+        """
+        Initialize game state, deal cards. step_mode is True when the game is driven
+        through reset()/step() and False for the play_card() API, so a pooled manager
+        switches cleanly between the two.
+        """
+        self.step_mode = step_mode
         game_logger.info("Starting new game.")
         self.deck.shuffle()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.begin_game(self.seed, len(self.players))
         
-        # Deal initial hands
-        for _ in range(INITIAL_HAND_SIZE):
-            for player in self.players:
-                card = self.deck.draw_card()
-                if card:
-                    player.add_card(card)
+        # Deal initial hands (one card per player per round, as at the table)
+        hands = self.deck.deal(len(self.players), INITIAL_HAND_SIZE)
+        for player, hand in zip(self.players, hands):
+            for card in hand:
+                player.add_card(card)
+        if recorder is not None:
+            for i in range(INITIAL_HAND_SIZE):
+                for player, hand in zip(self.players, hands):
+                    if i < len(hand):
+                        recorder.deal(player.player_id, hand[i])
         
         # Flip start card
         start_card = self.deck.draw_card()
         while start_card and start_card.card_type == CardType.WILD_DRAW_FOUR:
             # Cannot start with Wild Draw Four (House rule/Standard rule usually)
-            self.deck.discard(start_card) # Effectively bury it or reshuffle? 
-            # Standard rules says put it back in deck.
-            # Simplified: just draw another
-            self.deck.cards.insert(0, start_card) # Put back
-            self.deck.shuffle()
+            # Standard rules says put it back in deck (only there: discarding it
+            # as well would duplicate the card), then draw another
+            self.deck.return_card(start_card)
             start_card = self.deck.draw_card()
             
         self.deck.discard(start_card)
-        game_logger.info(f"Start card is: {start_card}")
+        game_logger.info("Start card is: %s", start_card)
 
         # Set initial current color
         if start_card.color == CardColor.WILD:
             # If start card is Wild, usually first player calls color.
             # For simplicity, let's randomly pick valid color or Default Red.
             # Or ask first player. Implementing random for now.
-             self.current_color = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+             self.current_color = self.rng.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
         else:
             self.current_color = start_card.color
+        if recorder is not None:
+            recorder.start(start_card, self.current_color)
 
         return start_card # Return start_card so main can display it
 
-    def _perform_single_draw(self, player: Player):
-        """Helper to draw one card, animate it, then add to hand."""
+    def _perform_single_draw(self, player: Player) -> Optional[Card]:
+        """Helper to draw one card, animate it, then add to hand. Returns the card (None if none left)."""
         c = self.deck.draw_card()
         if c:
             player.add_card(c)
+            if self.recorder is not None:
+                self.recorder.draw(player.player_id, c)
             if self.on_draw_card_animation:
                 self.on_draw_card_animation(player.player_id, 1)
+        return c
+
+    def _perform_draws(self, player: Player, count: int) -> List[Card]:
+        """Penalty draw: `count` cards taken from the deck in one call, then added and animated one by one."""
+        cards = self.deck.draw_many(count)
+        for c in cards:
+            player.add_card(c)
+            if self.recorder is not None:
+                self.recorder.draw(player.player_id, c)
+            if self.on_draw_card_animation:
+                self.on_draw_card_animation(player.player_id, 1)
+        return cards
 
     def _handle_initial_card_effect(self, card: Card):
         if card.card_type == CardType.SKIP:
@@ -92,9 +192,8 @@ class GameManager:
         elif card.card_type == CardType.DRAW_TWO:
             # First player draws 2 and turn skipped
             target = self.players[self.current_player_index]
-            game_logger.info(f"{target.name} must draw 2 cards due to start card!")
-            for _ in range(2):
-                self._perform_single_draw(target)
+            game_logger.info("%s must draw 2 cards due to start card!", target.name)
+            self._perform_draws(target, 2)
             self._advance_turn()
 
     def get_current_player(self) -> Player:
@@ -107,29 +206,22 @@ class GameManager:
 
     def check_legal_play(self, card: Card, top_card: Card) -> bool:
         """Check if a card can be played on top of another."""
-        # 1. Wild is always legal
-        if card.color == CardColor.WILD:
-            return True
-            
-        # 2. Match Current Active Color
-        if card.color == self.current_color:
-            return True
-        
-        # 3. Match Value/Type (if previous was not Wild forcing a color)
-        # If top card is Wild and we are here, it means card.color != current_color.
-        # But if Top is Wild, users MUST play current_color.
-        if top_card.color == CardColor.WILD:
-            # Strict rule: Must match announced color.
-            return False 
-            
-        # Standard matching logic (Color matched handled above)
-        if card.card_type == top_card.card_type:
-            # If Number, value must match? Actually Type match implies symbol match for Actions.
-            if card.card_type == CardType.NUMBER:
-                 return card.value == top_card.value
-            return True # Action on Action of same type is allowed (e.g. Red Skip on Blue Skip)
-            
-        return False
+        # Precomputed (top kind x active color x card kind) table, see backend/legality.py:
+        # Wild always legal, active color matches, and number/action symbol matches
+        # only when the top card is not Wild (a Wild top strictly requires the announced color).
+        if top_card is None:
+            return card.color == CardColor.WILD or card.color == self.current_color
+        return LEGAL_ROWS[top_card.index][color_slot(self.current_color)][card.index]
+
+    def legal_cards(self, player: Player) -> List[Card]:
+        """Cards in player's hand that may be played on the current top card."""
+        top_card = self.deck.peek_discard_pile()
+        if top_card is None:
+            return [c for c in player.hand if self.check_legal_play(c, None)]
+        if not player.has_playable_card(top_card, self.current_color):
+            return []
+        row = legal_row(top_card, color_slot(self.current_color))
+        return [c for c in player.hand if row[c.index]]
 
     def play_card(self, player: Player, card: Card, wild_color_choice: CardColor = None) -> bool:
         """
@@ -139,19 +231,19 @@ class GameManager:
         self.skipped_player = None # Reset skipped player state
         
         if player != self.get_current_player():
-            game_logger.warning(f"Not {player.name}'s turn!")
+            game_logger.warning("Not %s's turn!", player.name)
             return False
 
         top_card = self.deck.peek_discard_pile()
         
         if not self.check_legal_play(card, top_card):
-            game_logger.warning(f"Illegal move by {player.name}: {card} on {top_card} (active color: {self.current_color})")
+            game_logger.warning("Illegal move by %s: %s on %s (active color: %s)", player.name, card, top_card, self.current_color)
             return False
 
         # Execute Play
         player.remove_card(card)
         self.deck.discard(card)
-        game_logger.info(f"{player.name} played {card}.")
+        game_logger.info("%s played %s.", player.name, card)
         
         # Blocking Animation Call
         if self.on_play_card_animation:
@@ -162,12 +254,16 @@ class GameManager:
             if not player.has_said_uno:
                  # In a real game, this is where others can catch them.
                  # For auto-check:
-                 game_logger.info(f"{player.name} has 1 card left!")
+                 game_logger.info("%s has 1 card left!", player.name)
 
         if player.get_hand_size() == 0:
             self.game_over = True
             self.winner = player
-            game_logger.info(f"{player.name} wins!")
+            game_logger.info("%s wins!", player.name)
+            if self.recorder is not None:
+                color = card.color if card.color != CardColor.WILD else (wild_color_choice or self.current_color)
+                self.recorder.play(player.player_id, card, color)
+                self.recorder.win(player.player_id)
             return True
 
         # Update State based on Card
@@ -176,6 +272,9 @@ class GameManager:
 
         # Resolve +4 Challenge immediately if applicable
         if self.pending_wild_draw_four:
+            if self.step_mode:
+                # Answered by step() as a CHALLENGE decision, which then advances the turn
+                return True
             self.resolve_pending_wild_draw_four()
         
         # Next Turn
@@ -188,14 +287,16 @@ class GameManager:
         if card.color == CardColor.WILD:
             if wild_color_choice:
                 self.current_color = wild_color_choice
-                game_logger.info(f"Color changed to {self.current_color.value}")
+                game_logger.info("Color changed to %s", self.current_color.value)
             else:
                  # Fallback if no choice provided (AI should provide, Human should provide)
                  # Random for safety
-                 self.current_color = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
-                 game_logger.info(f"Color defaulted to {self.current_color.value}")
+                 self.current_color = self.rng.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+                 game_logger.info("Color defaulted to %s", self.current_color.value)
         else:
             self.current_color = card.color
+        if self.recorder is not None:
+            self.recorder.play(self.players[self.current_player_index].player_id, card, self.current_color)
 
         # Special Effects
         if card.card_type == CardType.SKIP:
@@ -217,9 +318,8 @@ class GameManager:
             next_player_idx = (self.current_player_index + (1 if self.direction == Direction.CLOCKWISE else -1)) % len(self.players)
             victim = self.players[next_player_idx]
             self.skipped_player = victim
-            game_logger.info(f"{victim.name} draws 2 cards and is skipped.")
-            for _ in range(2):
-                self._perform_single_draw(victim)
+            game_logger.info("%s draws 2 cards and is skipped.", victim.name)
+            self._perform_draws(victim, 2)
             # Skip the victim
             self._advance_turn()
 
@@ -233,8 +333,11 @@ class GameManager:
             }
             self.last_challenge_result = None
 
-    def resolve_pending_wild_draw_four(self):
-        """Resolve pending +4 challenge if exists. Returns 'Succeeded', 'Failed', or None."""
+    def resolve_pending_wild_draw_four(self, do_challenge: Optional[bool] = None):
+        """
+        Resolve pending +4 challenge if exists. Returns 'Succeeded', 'Failed', or None.
+        do_challenge is the victim's answer; if None, challenge_decider is asked.
+        """
         if not self.pending_wild_draw_four:
             return None
 
@@ -247,26 +350,35 @@ class GameManager:
         card = info["card"]
 
         # Decide if victim challenges
-        do_challenge = False
-        if self.challenge_decider:
+        if do_challenge is not None:
+            do_challenge = bool(do_challenge)
+        elif self.challenge_decider:
             try:
                 do_challenge = bool(self.challenge_decider(victim, previous_color))
             except Exception as e:
-                game_logger.warning(f"Challenge decider error: {e}")
+                game_logger.warning("Challenge decider error: %s", e)
+                do_challenge = False
+        else:
+            do_challenge = False
 
         # Bluff check: does actor have a card matching previous color?
         bluff = False
         if previous_color:
-            bluff = any(c.color == previous_color for c in actor.hand)
+            bluff = actor.has_color(previous_color)
+
+        # Recorded before the penalty draws it causes
+        if self.recorder is not None:
+            self.recorder.challenge(victim.player_id, ("Succeeded" if bluff else "Failed") if do_challenge else None)
 
         if do_challenge:
             if bluff:
                 # Successful challenge: actor takes back +4 and draws 4
-                if self.deck.discard_pile:
-                    self.deck.discard_pile.pop()
+                self.deck.take_top()
                 actor.add_card(card)
-                for _ in range(4):
-                    self._perform_single_draw(actor)
+                if self.recorder is not None:
+                    # Recorded as a DRAW like every other card added to a hand after the deal
+                    self.recorder.draw(actor.player_id, card)
+                self._perform_draws(actor, 4)
                 self.current_color = previous_color
                 self.skipped_player = None
                 self.last_challenge_result = "Succeeded"
@@ -274,8 +386,7 @@ class GameManager:
             else:
                 # Failed challenge: victim draws 6 and is skipped
                 self.skipped_player = victim
-                for _ in range(6):
-                    self._perform_single_draw(victim)
+                self._perform_draws(victim, 6)
                 self.last_challenge_result = "Failed"
                 game_logger.info("Challenge failed.")
                 self._advance_turn()
@@ -283,8 +394,7 @@ class GameManager:
             # No challenge: victim draws 4 and is skipped
             self.last_challenge_result = None
             self.skipped_player = victim
-            for _ in range(4):
-                self._perform_single_draw(victim)
+            self._perform_draws(victim, 4)
             game_logger.info("No challenge.")
             self._advance_turn()
 
@@ -300,7 +410,9 @@ class GameManager:
         card = self.deck.draw_card()
         if card:
             player.add_card(card)
-            game_logger.info(f"{player.name} drew a card.")
+            if self.recorder is not None:
+                self.recorder.draw(player.player_id, card)
+            game_logger.info("%s drew a card.", player.name)
             # Optional: Allow playing immediately if playable?
             # Standard rule: If drawn card is playable, can play it.
             # Implementation: Return the card, let UI/Controller decide to call play_card again.
@@ -309,3 +421,152 @@ class GameManager:
             # Here we just pass turn for simplicity unless we implement "playable check" logic return.
             self._advance_turn()
 
+    # ------------------------------------------------------------------
+    # Zobrist hashes (backend/zobrist.py). Hands and the discard pile keep their
+    # hashes current card by card; the rest is a handful of table lookups.
+
+    def observation_hash(self, player: Player) -> int:
+        """
+        64-bit hash of what player observes: exactly the inputs of encode_state (own hand,
+        top card, active color, opponent hand sizes in relative order, direction).
+        Equal encoded states give equal hashes, so it keys caches of per-state results.
+        """
+        top_card = self.deck.peek_discard_pile()
+        h = (player.hand_hash ^ TOP_KEYS[top_card.index if top_card is not None else -1]
+             ^ COLOR_KEYS[color_slot(self.current_color)] ^ DIRECTION_KEYS[self.direction])
+        players = self.players
+        n = len(players)
+        pid = player.player_id
+        for i in range(1, n):
+            h ^= OPP_SIZE_KEYS[i][len(players[(pid + i) % n].hand)]
+        return h
+
+    def state_hash(self) -> int:
+        """
+        64-bit hash of the full game state: every seat's hand, the discard pile, top card,
+        active color, direction, player to move and the pending decision. The draw pile is
+        the rest of the deck (its order is drawn lazily), so it adds nothing.
+        """
+        top_card = self.deck.peek_discard_pile()
+        h = (self.deck.discard_hash ^ TOP_KEYS[top_card.index if top_card is not None else -1]
+             ^ COLOR_KEYS[color_slot(self.current_color)] ^ DIRECTION_KEYS[self.direction]
+             ^ TURN_KEYS[self.current_player_index])
+        for seat, player in enumerate(self.players):
+            # Mixed per seat, so swapping two hands changes the hash
+            h ^= mix64(player.hand_hash ^ SEAT_KEYS[seat])
+        decision = self._decision
+        if decision is not None:
+            card = decision.card
+            h ^= mix64(DECISION_KEYS[decision.type] ^ SEAT_KEYS[decision.player.player_id]
+                       ^ DECISION_CARD_KEYS[card.index if card is not None else -1]
+                       ^ COLOR_KEYS[color_slot(decision.previous_color)])
+        if self.game_over:
+            h ^= GAME_OVER_KEY
+        return h
+
+    # ------------------------------------------------------------------
+    # Step-machine API: the game yields Decision objects instead of calling
+    # back, so one driver can keep many games in flight and answer their
+    # pending decisions together.
+
+    def reset(self, seed=None, game_id: Optional[int] = None) -> Optional[Decision]:
+        """
+        Start a new game in step mode and return its first decision.
+        Players and deck are reset in place, so one GameManager can be reused for
+        any number of games.
+
+        seed: a 16-byte game seed (replays that game exactly), or an int run seed
+        combined with game_id via rng.game_seed(). None derives the next seed from
+        this manager's RNG. The seed used is kept in self.seed.
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(8 * SEED_BYTES).to_bytes(SEED_BYTES, "little")
+        elif not isinstance(seed, bytes):
+            seed = game_seed(seed, game_id or 0)
+        self.seed = seed
+        self.rng.seed(int.from_bytes(seed, "little"))
+        for player in self.players:
+            player.reset()
+        # start_game shuffles, so the refill skips its own shuffle
+        self.deck.reset(shuffle=False)
+        self._reset_state()
+        self.start_game(step_mode=True)
+        return self._begin_turn()
+
+    def pending_decision(self) -> Optional[Decision]:
+        """The decision the game is waiting for, or None once the game is over."""
+        return self._decision
+
+    def step(self, action) -> Optional[Decision]:
+        """
+        Answer the pending decision and run the game up to the next one.
+
+        Actions per DecisionType:
+            PLAY_CARD:    a Card from decision.legal_cards, or None to draw
+            CHOOSE_COLOR: the CardColor announced for the Wild
+            PLAY_DRAWN:   bool, play the card just drawn
+            CHALLENGE:    bool, challenge the +4
+        Returns the next Decision, or None when the game is over.
+        """
+        decision = self._decision
+        if decision is None:
+            raise RuntimeError("No pending decision: the game is over or reset() was not called.")
+        player = decision.player
+
+        if decision.type == DecisionType.PLAY_CARD:
+            if action is None:
+                return self._step_draw(player)
+            if action not in decision.legal_cards:
+                raise ValueError(f"Illegal card for {player.name}: {action!r}")
+            return self._step_card(player, action)
+
+        if decision.type == DecisionType.CHOOSE_COLOR:
+            if action not in KIND_COLORS:
+                raise ValueError(f"Invalid Wild color: {action!r}")
+            return self._step_play(player, decision.card, action)
+
+        if decision.type == DecisionType.PLAY_DRAWN:
+            if action:
+                return self._step_card(player, decision.card)
+            self._advance_turn()
+            return self._begin_turn()
+
+        # CHALLENGE: resolve, then advance past the +4 player as play_card would have
+        self.resolve_pending_wild_draw_four(do_challenge=bool(action))
+        self._advance_turn()
+        return self._begin_turn()
+
+    def _begin_turn(self) -> Optional[Decision]:
+        if self.game_over:
+            self._decision = None
+        else:
+            player = self.get_current_player()
+            self._decision = Decision(DecisionType.PLAY_CARD, player, legal_cards=self.legal_cards(player))
+        return self._decision
+
+    def _step_card(self, player: Player, card: Card) -> Optional[Decision]:
+        if card.color == CardColor.WILD:
+            self._decision = Decision(DecisionType.CHOOSE_COLOR, player, card=card)
+            return self._decision
+        return self._step_play(player, card, None)
+
+    def _step_play(self, player: Player, card: Card, color: Optional[CardColor]) -> Optional[Decision]:
+        self.play_card(player, card, color)
+        info = self.pending_wild_draw_four
+        if info:
+            self._decision = Decision(DecisionType.CHALLENGE, self.players[info["victim_index"]],
+                                      card=info["card"], previous_color=info["previous_color"])
+            return self._decision
+        return self._begin_turn()
+
+    def _step_draw(self, player: Player) -> Optional[Decision]:
+        self.skipped_player = None
+        card = self._perform_single_draw(player)
+        if card:
+            game_logger.info("%s drew a card.", player.name)
+            # Standard rule: a playable drawn card may be played right away
+            if self.check_legal_play(card, self.deck.peek_discard_pile()):
+                self._decision = Decision(DecisionType.PLAY_DRAWN, player, card=card)
+                return self._decision
+        self._advance_turn()
+        return self._begin_turn()
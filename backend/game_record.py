@@ -0,0 +1,250 @@
+"""
+Compact event-sourced game records.
+
+A record is the game's 16-byte seed, its player count, and then one event per
+engine action. The first byte of every event holds the opcode in the high
+nibble and the acting player in the low nibble. Card events add one byte: the
+card kind (0-53) in the low 6 bits and the active color slot (KIND_COLORS
+order) in the high 2 bits for Wild plays and the start card.
+
+    DEAL    actor, card     2 bytes   card dealt at game start
+    START   card+color      2 bytes   start card and the color it set
+    PLAY    actor, card+color 2 bytes
+    DRAW    actor, card     2 bytes   any card added to a hand after the deal (including
+                                      the +4 a successful challenge returns to its player)
+    CHALLENGE_NONE / _SUCCEEDED / _FAILED   victim   1 byte
+    WIN     actor           1 byte
+
+Games are appended to shard files ("games-00000.ugr"); each shard has an
+index ("games-00000.idx") of little-endian uint64 byte offsets, one per game
+plus the end offset, so game N is found without scanning.
+"""
+
+import os
+import bisect
+import mmap
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+from backend.card import KIND_COLORS
+from backend.rng import SEED_BYTES
+
+OP_DEAL = 0
+OP_START = 1
+OP_PLAY = 2
+OP_DRAW = 3
+OP_CHALLENGE_NONE = 4
+OP_CHALLENGE_SUCCEEDED = 5
+OP_CHALLENGE_FAILED = 6
+OP_WIN = 7
+
+# Total event size in bytes, by opcode
+EVENT_SIZE = (2, 2, 2, 2, 1, 1, 1, 1)
+OP_NAMES = ("deal", "start", "play", "draw", "challenge_none", "challenge_succeeded", "challenge_failed", "win")
+
+_CHALLENGE_OPS = {None: OP_CHALLENGE_NONE, "Succeeded": OP_CHALLENGE_SUCCEEDED, "Failed": OP_CHALLENGE_FAILED}
+_COLOR_BITS = {color: i << 6 for i, color in enumerate(KIND_COLORS)}
+
+MAGIC = b"UGR1"
+HEADER_SIZE = SEED_BYTES + 1
+SHARD_PATTERN = "games-{:05d}"
+_NO_SEED = bytes(SEED_BYTES)
+
+
+class GameRecordWriter:
+    """
+    Streams games into sharded record files. Attach as `gm.recorder`; the
+    GameManager reports every event and the writer buffers them in memory,
+    flushing to disk in large writes.
+    """
+
+    def __init__(self, directory: str, games_per_shard: int = 100000, buffer_size: int = 1 << 20):
+        self.directory = directory
+        self.games_per_shard = games_per_shard
+        self.buffer_size = buffer_size
+        os.makedirs(directory, exist_ok=True)
+        self.shard = 0
+        self.games_written = 0
+        self._file = None
+        self._offsets: List[int] = []
+        self._pos = 0
+        self._buffer = bytearray()
+        self._game: Optional[bytearray] = None
+        self._existing_shards()
+
+    def _existing_shards(self):
+        # Continue after shards already present in the directory
+        while os.path.exists(self._path(self.shard, ".idx")):
+            self.shard += 1
+
+    def _path(self, shard, ext):
+        return os.path.join(self.directory, SHARD_PATTERN.format(shard) + ext)
+
+    def _open_shard(self):
+        self._file = open(self._path(self.shard, ".ugr"), "wb")
+        self._file.write(MAGIC)
+        self._pos = len(MAGIC)
+        self._offsets = []
+
+    def _close_shard(self):
+        self._flush()
+        self._offsets.append(self._pos)
+        self._file.close()
+        self._file = None
+        np.asarray(self._offsets, dtype="<u8").tofile(self._path(self.shard, ".idx"))
+        self.shard += 1
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def _finish_game(self):
+        if self._game is None:
+            return
+        if self._file is None:
+            self._open_shard()
+        self._offsets.append(self._pos)
+        self._buffer += self._game
+        self._pos += len(self._game)
+        self._game = None
+        self.games_written += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+        if len(self._offsets) >= self.games_per_shard:
+            self._close_shard()
+
+    # --- recorder hooks called by GameManager ---
+
+    def begin_game(self, seed: Optional[bytes], num_players: int):
+        self._finish_game()
+        self._game = bytearray(seed or _NO_SEED)
+        self._game.append(num_players)
+
+    def deal(self, player_id, card):
+        self._game += bytes((OP_DEAL << 4 | player_id, card.index))
+
+    def start(self, card, color):
+        self._game += bytes((OP_START << 4, card.index | _COLOR_BITS.get(color, 0)))
+
+    def play(self, player_id, card, color):
+        self._game += bytes((OP_PLAY << 4 | player_id, card.index | _COLOR_BITS.get(color, 0)))
+
+    def draw(self, player_id, card):
+        self._game += bytes((OP_DRAW << 4 | player_id, card.index))
+
+    def challenge(self, victim_id, result):
+        self._game.append(_CHALLENGE_OPS[result] << 4 | victim_id)
+
+    def win(self, player_id):
+        self._game.append(OP_WIN << 4 | player_id)
+        self._finish_game()
+
+    def close(self):
+        """Write the open game (if any) and the current shard with its index."""
+        self._finish_game()
+        if self._file is not None:
+            self._close_shard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameRecord:
+    """One game: seed, player count and its raw event bytes."""
+
+    __slots__ = ("seed", "num_players", "data")
+
+    def __init__(self, buf):
+        self.seed = bytes(buf[:SEED_BYTES])
+        self.num_players = buf[SEED_BYTES]
+        self.data = buf[HEADER_SIZE:]
+
+    def events(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield (opcode, actor, card kind or -1, color slot or -1) per event."""
+        data = self.data
+        i, n = 0, len(data)
+        while i < n:
+            head = data[i]
+            op = head >> 4
+            if EVENT_SIZE[op] == 2:
+                arg = data[i + 1]
+                color = arg >> 6 if op in (OP_START, OP_PLAY) else -1
+                yield op, head & 0xF, arg & 0x3F, color
+                i += 2
+            else:
+                yield op, head & 0xF, -1, -1
+                i += 1
+
+    def winner(self) -> Optional[int]:
+        data = self.data
+        if data and data[-1] >> 4 == OP_WIN:
+            return data[-1] & 0xF
+        return None
+
+    def __len__(self):
+        return len(self.data)
+
+
+class GameRecordReader:
+    """
+    Memory-mapped reader over every shard in a directory. Games are decoded
+    lazily, so millions of games can be iterated without loading them.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._maps = []
+        self._files = []
+        self._indexes = []
+        self._starts = [0]
+        shard = 0
+        while os.path.exists(os.path.join(directory, SHARD_PATTERN.format(shard) + ".idx")):
+            base = os.path.join(directory, SHARD_PATTERN.format(shard))
+            index = np.fromfile(base + ".idx", dtype="<u8")
+            f = open(base + ".ugr", "rb")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a game record shard: {base}.ugr")
+            self._files.append(f)
+            self._maps.append(mm)
+            self._indexes.append(index)
+            self._starts.append(self._starts[-1] + len(index) - 1)
+            shard += 1
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def __getitem__(self, n: int) -> GameRecord:
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(n)
+        shard = bisect.bisect_right(self._starts, n) - 1
+        local = n - self._starts[shard]
+        index = self._indexes[shard]
+        # Slicing the map copies just this game's bytes, so records outlive close()
+        return GameRecord(self._maps[shard][int(index[local]):int(index[local + 1])])
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for mm, index in zip(self._maps, self._indexes):
+            offsets = index.tolist()
+            for start, end in zip(offsets[:-1], offsets[1:]):
+                yield GameRecord(mm[start:end])
+
+    def close(self):
+        self._indexes = []
+        for mm in self._maps:
+            mm.close()
+        for f in self._files:
+            f.close()
+        self._maps = []
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
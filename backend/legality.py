@@ -0,0 +1,62 @@
+import numpy as np
+from config.enums import CardColor
+from backend.card import CARD_KINDS, KIND_COLORS
+
+# Active color slots: 0-3 follow KIND_COLORS (Red, Blue, Green, Yellow), 4 = no active color
+NO_COLOR = len(KIND_COLORS)
+_COLOR_SLOTS = {color: i for i, color in enumerate(KIND_COLORS)}
+
+def color_slot(color) -> int:
+    """Map a CardColor (or None / Wild) to its slot in LEGAL_TABLE."""
+    return _COLOR_SLOTS.get(color, NO_COLOR)
+
+def _is_legal(card, top_card, current_color) -> bool:
+    """Reference rule, identical to GameManager.check_legal_play."""
+    # 1. Wild is always legal
+    if card.color == CardColor.WILD:
+        return True
+    # 2. Match Current Active Color
+    if card.color == current_color:
+        return True
+    # 3. Top Wild forces the announced color
+    if top_card.color == CardColor.WILD:
+        return False
+    # 4. Match number value / action type
+    return card.symbol == top_card.symbol
+
+def _build_table() -> np.ndarray:
+    colors = KIND_COLORS + [None]
+    table = np.zeros((len(CARD_KINDS), len(colors), len(CARD_KINDS)), dtype=bool)
+    for t, top in enumerate(CARD_KINDS):
+        for c, color in enumerate(colors):
+            for k, card in enumerate(CARD_KINDS):
+                table[t, c, k] = _is_legal(card, top, color)
+    table.setflags(write=False)
+    return table
+
+# LEGAL_TABLE[top_kind, active_color_slot, hand_kind] -> may hand_kind be played
+LEGAL_TABLE = _build_table()
+# Same table as nested tuples: faster than NumPy scalar indexing for single lookups
+LEGAL_ROWS = tuple(tuple(tuple(bool(x) for x in row) for row in plane) for plane in LEGAL_TABLE)
+
+def legal_row(top, color):
+    """Tuple of 54 bools: which kinds may be played on `top` (Card or kind index) with active `color`."""
+    top_idx = top if isinstance(top, (int, np.integer)) else top.index
+    color_idx = color if isinstance(color, (int, np.integer)) else color_slot(color)
+    return LEGAL_ROWS[top_idx][color_idx]
+
+def legal_mask(hand_counts, top, color) -> np.ndarray:
+    """
+    Boolean mask over the 54 kinds: held (count > 0) and legal to play.
+
+    Args:
+        hand_counts: [54] or [N, 54] kind counts (e.g. the hand block of encode_state).
+        top: top card kind(s) - a Card, an int, or an int array [N].
+        color: active color(s) - a CardColor/None, a slot int, or an int array [N].
+    """
+    hand_counts = np.asarray(hand_counts)
+    if hand_counts.ndim == 1:
+        top_idx = top if isinstance(top, (int, np.integer)) else top.index
+        color_idx = color if isinstance(color, (int, np.integer)) else color_slot(color)
+        return LEGAL_TABLE[top_idx, color_idx] & (hand_counts > 0)
+    return LEGAL_TABLE[np.asarray(top), np.asarray(color)] & (hand_counts > 0)
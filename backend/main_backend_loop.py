@@ -195,7 +195,7 @@ def backend_main_loop(comm: Communicator, game_manager: GameManager, human_playe
             played = False
             for card in current_player.hand:
                 if gm.check_legal_play(card, top_card):
-                    choice = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+                    choice = gm.rng.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
                     if gm.play_card(current_player, card, choice):
                         # Played event sent in callback
                         played = True
@@ -209,7 +209,7 @@ def backend_main_loop(comm: Communicator, game_manager: GameManager, human_playe
                     top_card = gm.deck.peek_discard_pile() # refresh
                     
                     if gm.check_legal_play(card, top_card):
-                         choice = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+                         choice = gm.rng.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
                          gm.play_card(current_player, card, choice)
                          send_sync_state(comm, gm)
                     else:
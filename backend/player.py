@@ -1,7 +1,11 @@
-from typing import List, Optional
+import numpy as np
+from array import array
+from typing import Callable, List, Optional
 from backend.card import Card
 from config.enums import PlayerType, CardColor, CardType
 from backend.utils.logger import game_logger
+from backend.legality import color_slot, NO_COLOR
+from backend.zobrist import COUNT_DELTA
 
 class Player:
     """Player class."""
@@ -11,10 +15,71 @@ class Player:
         self.name = name
         self.player_type = player_type
         self.hand: List[Card] = []
+        # Tallies kept alongside the list so hand queries are O(1):
+        # counts[kind] is the encode_state hand block (float32, 54 kinds), color_counts is
+        # per KIND_COLORS slot and symbol_counts per symbol (kind % 13) of the colored cards
+        # (a NumPy view of a float array: item updates stay cheap Python operations)
+        self._counts = array("f", bytes(4 * 54))
+        self.counts = np.frombuffer(self._counts, dtype=np.float32)
+        self.color_counts = [0, 0, 0, 0]
+        self.symbol_counts = [0] * 13
+        self.wild_count = 0
+        # Zobrist hash of the hand as a multiset (backend/zobrist.py), independent of the seat
+        self.hand_hash = 0
         self.has_said_uno = False
+        # Observers of hand changes: fn(player, card, delta) with delta +1 (added) or -1 (removed)
+        self.hand_listeners: List[Callable[['Player', Card, int], None]] = []
+
+    def clone(self) -> 'Player':
+        """Copy of the hand and tallies for search (GameManager.clone); hand_listeners are not copied."""
+        other = Player.__new__(Player)
+        other.player_id = self.player_id
+        other.name = self.name
+        other.player_type = self.player_type
+        other.hand = list(self.hand)
+        other._counts = array("f", self._counts)
+        other.counts = np.frombuffer(other._counts, dtype=np.float32)
+        other.color_counts = list(self.color_counts)
+        other.symbol_counts = list(self.symbol_counts)
+        other.wild_count = self.wild_count
+        other.hand_hash = self.hand_hash
+        other.has_said_uno = self.has_said_uno
+        other.hand_listeners = []
+        return other
+
+    def __getstate__(self):
+        # counts is a view of _counts, rebuilt on unpickling; listeners stay in this process
+        state = self.__dict__.copy()
+        del state["counts"]
+        state["hand_listeners"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.counts = np.frombuffer(self._counts, dtype=np.float32)
+
+    def _untally(self, card: Card):
+        k = card.index
+        self._counts[k] -= 1
+        self.hand_hash ^= COUNT_DELTA[k][int(self._counts[k])]
+        if k < 52:
+            self.color_counts[k // 13] -= 1
+            self.symbol_counts[k % 13] -= 1
+        else:
+            self.wild_count -= 1
 
     def add_card(self, card: Card):
         self.hand.append(card)
+        k = card.index
+        self.hand_hash ^= COUNT_DELTA[k][int(self._counts[k])]
+        self._counts[k] += 1
+        if k < 52:
+            self.color_counts[k // 13] += 1
+            self.symbol_counts[k % 13] += 1
+        else:
+            self.wild_count += 1
+        for listener in self.hand_listeners:
+            listener(self, card, 1)
 
     def remove_card(self, card: Card) -> bool:
         """Remove a card from hand. Returns True if successful."""
@@ -29,14 +94,39 @@ class Player:
             # Let's check Card implementation... I didn't add __eq__. 
             # I should rely on the object instance being passed from the Hand list itself.
             self.hand.remove(card)
+            self._untally(card)
+            for listener in self.hand_listeners:
+                listener(self, card, -1)
             return True
         except ValueError:
-             game_logger.error(f"Card {card} not found in player {self.name}'s hand.")
+             game_logger.error("Card %s not found in player %s's hand.", card, self.name)
              return False
 
+    def clear_hand(self):
+        """Empty the hand, notifying hand_listeners of every removed card."""
+        while self.hand:
+            card = self.hand.pop()
+            self._untally(card)
+            for listener in self.hand_listeners:
+                listener(self, card, -1)
+
+    def reset(self):
+        """Prepare this player for a new game: empty hand, UNO status cleared."""
+        self.clear_hand()
+        self.reset_uno_status()
+
     def get_hand_size(self) -> int:
         return len(self.hand)
 
+    def count(self, card: Card) -> int:
+        """Copies of this card kind in hand."""
+        return int(self.counts[card.index])
+
+    def has_color(self, color: Optional[CardColor]) -> bool:
+        """Holds a (non-Wild) card of this color, e.g. the +4 bluff test."""
+        slot = color_slot(color)
+        return slot != NO_COLOR and self.color_counts[slot] > 0
+
     def sort_hand(self):
         """Sort hand by color and then by value/type for display."""
         # Custom sort key: Color (enum value) -> Type -> Value
@@ -48,7 +138,7 @@ class Player:
 
     def say_uno(self):
         self.has_said_uno = True
-        game_logger.info(f"Player {self.name} says UNO!")
+        game_logger.info("Player %s says UNO!", self.name)
 
     def has_playable_card(self, top_card: Card, current_color: CardColor = None) -> bool:
         """
@@ -59,38 +149,16 @@ class Player:
                            If None, use top_card.color.
         """
         effective_color = current_color if current_color else top_card.color
-        
-        for card in self.hand:
-            # 1. Wild cards are always playable
-            if card.color == CardColor.WILD:
-                return True
-            
-            # 2. Match color
-            if card.color == effective_color:
-                return True
-            
-            # 3. Match value/symbol (only if not checking wild color override logic strictly, 
-            # but standard UNO allows matching number/symbol even if color is different)
-            # EXCEPT if the top card was a Wild card that set a color, you usually have to match that COLOR.
-            # However, if top card is a Blue 7, and I have a Red 7, I can play it.
-            # If top card is a Wild (Blue), I must play Blue. I cannot play Red 7 just because Wild has no "7".
-            # So:
-            # If top is Wild/Wild4: Must match the *announced* color (effective_color).
-            # If top is colored card: Match color OR match symbol/value.
-            
-            if top_card.color != CardColor.WILD:
-                 if card.color == effective_color: return True
-                 if card.card_type == top_card.card_type:
-                     if card.card_type == CardType.NUMBER:
-                         if card.value == top_card.value: return True
-                     else:
-                         # Action cards match by type (e.g. Skip on Skip)
-                         return True
-            else:
-                # Top is Wild, strictly match defined color
-                if card.color == effective_color: return True
-                
-        return False
+
+        # Same rule as backend/legality.py, answered from the tallies: Wild cards are always
+        # playable; otherwise match the effective color, or the number/action symbol when
+        # the top card is colored (a Wild top strictly requires the announced color).
+        if self.wild_count:
+            return True
+        slot = color_slot(effective_color)
+        if slot != NO_COLOR and self.color_counts[slot]:
+            return True
+        return top_card.index < 52 and self.symbol_counts[top_card.index % 13] > 0
         
     def __str__(self):
         return f"{self.name} ({self.player_type.value}) - {len(self.hand)} cards"
@@ -0,0 +1,380 @@
+"""
+Columnar index over recorded games (see backend/game_record.py).
+
+build_index() replays every record's events once and writes two tables of
+NumPy columns, each split into memory-mapped .npy shards:
+
+    decisions  one row per turn action (a card play or a turn draw)
+        game         int64  global game number (GameRecordReader order)
+        turn         int32  action number within the game
+        seat         int8   acting player
+        action       int8   card kind played, or ACTION_DRAW
+        color        int8   color slot after the play (KIND_COLORS order), -1 for draws
+        top          int8   top card kind before the action
+        active_color int8   active color slot before the action
+        hand_size    int16  actor's hand size before the action
+        n_legal      int16  legal cards (with multiplicity) in the actor's hand
+        held_color   bool   actor held a card of the active color (the +4 bluff test)
+        challenge    int8   outcome of the challenge to this +4 (CHALLENGE_*), -1 otherwise
+        won          bool   actor went on to win the game
+
+    games      one row per game
+        game, num_players, start (start card kind), winner (seat, -1 if unfinished),
+        turns (decision rows), plays, draws, penalty_draws
+
+RecordIndex opens the shards lazily and answers filter/aggregate queries one
+shard at a time, so memory stays bounded by the shard size:
+
+    idx = RecordIndex("index/")
+    idx.query("decisions").where(action=53, held_color=True).count()
+    idx.query("games").group_mean(lambda c: c["winner"] == 0, by="start")
+    idx.query("decisions").group_count(by="seat")
+"""
+
+import os
+import array
+import argparse
+import numpy as np
+from typing import Callable, Dict, Optional, Union
+from backend.game_record import (GameRecordReader, OP_DEAL, OP_START, OP_PLAY, OP_DRAW, OP_CHALLENGE_NONE,
+                                 OP_CHALLENGE_SUCCEEDED, OP_CHALLENGE_FAILED, OP_WIN)
+from backend.legality import LEGAL_ROWS, NO_COLOR
+
+ACTION_DRAW = -1
+CHALLENGE_NONE, CHALLENGE_SUCCEEDED, CHALLENGE_FAILED = 0, 1, 2
+_CHALLENGE_CODES = {OP_CHALLENGE_NONE: CHALLENGE_NONE, OP_CHALLENGE_SUCCEEDED: CHALLENGE_SUCCEEDED,
+                    OP_CHALLENGE_FAILED: CHALLENGE_FAILED}
+# Penalty cards drawn after a challenge outcome (by the victim, or by the bluffer when it succeeds)
+_CHALLENGE_DRAWS = {OP_CHALLENGE_NONE: 4, OP_CHALLENGE_SUCCEEDED: 4, OP_CHALLENGE_FAILED: 6}
+_DRAW_TWO_KINDS = frozenset(c * 13 + 12 for c in range(4))
+
+# table -> [(column, array typecode, dtype)]
+SCHEMA = {
+    "decisions": [
+        ("game", "q", np.int64),
+        ("turn", "i", np.int32),
+        ("seat", "b", np.int8),
+        ("action", "b", np.int8),
+        ("color", "b", np.int8),
+        ("top", "b", np.int8),
+        ("active_color", "b", np.int8),
+        ("hand_size", "h", np.int16),
+        ("n_legal", "h", np.int16),
+        ("held_color", "b", np.bool_),
+        ("challenge", "b", np.int8),
+        ("won", "b", np.bool_),
+    ],
+    "games": [
+        ("game", "q", np.int64),
+        ("num_players", "b", np.int8),
+        ("start", "b", np.int8),
+        ("winner", "b", np.int8),
+        ("turns", "i", np.int32),
+        ("plays", "i", np.int32),
+        ("draws", "i", np.int32),
+        ("penalty_draws", "i", np.int32),
+    ],
+}
+
+def _shard_path(directory, table, column, shard):
+    return os.path.join(directory, table, f"{column}.{shard:05d}.npy")
+
+
+class _TableWriter:
+    """Buffers rows of one table in typed arrays and writes a shard every rows_per_shard rows."""
+
+    def __init__(self, directory, table, rows_per_shard):
+        self.directory = directory
+        self.table = table
+        self.rows_per_shard = rows_per_shard
+        self.shard = 0
+        os.makedirs(os.path.join(directory, table), exist_ok=True)
+        self._new_buffers()
+
+    def _new_buffers(self):
+        self.columns = {name: array.array(code) for name, code, _ in SCHEMA[self.table]}
+
+    def rows(self) -> int:
+        return len(self.columns["game"])
+
+    def flush(self):
+        if not self.rows():
+            return
+        for name, _, dtype in SCHEMA[self.table]:
+            np.save(_shard_path(self.directory, self.table, name, self.shard),
+                    np.asarray(self.columns[name]).astype(dtype))
+        self.shard += 1
+        self._new_buffers()
+
+
+def _index_game(n, record, d, g):
+    """Replay one record's events, appending its decision rows to d and its game row to g."""
+    num_players = record.num_players
+    hands = [[0] * 54 for _ in range(num_players)]
+    color_counts = [[0] * 4 for _ in range(num_players)]
+    sizes = [0] * num_players
+    top = start = active = -1
+    prev_top = prev_active = -1
+    penalty = 0
+    # A successful challenge is followed by the DRAW of the +4 taken back, then the penalty draws
+    take_back = False
+    first_row = len(d["game"])
+    play_row = -1
+    turns = plays = draws = penalty_draws = 0
+    winner = -1
+
+    for op, actor, card, color in record.events():
+        if op == OP_DRAW or op == OP_DEAL:
+            if op == OP_DRAW:
+                if take_back:
+                    take_back = False
+                elif penalty:
+                    penalty -= 1
+                    penalty_draws += 1
+                else:
+                    _decision_row(d, n, turns, actor, ACTION_DRAW, -1, top, active,
+                                  hands[actor], sizes[actor], color_counts[actor])
+                    turns += 1
+                    draws += 1
+            hands[actor][card] += 1
+            sizes[actor] += 1
+            if card < 52:
+                color_counts[actor][card // 13] += 1
+        elif op == OP_PLAY:
+            play_row = len(d["game"])
+            _decision_row(d, n, turns, actor, card, color, top, active,
+                          hands[actor], sizes[actor], color_counts[actor])
+            turns += 1
+            plays += 1
+            hands[actor][card] -= 1
+            sizes[actor] -= 1
+            if card < 52:
+                color_counts[actor][card // 13] -= 1
+            prev_top, prev_active = top, active
+            top, active = card, color
+            # Any play ends the previous penalty, even one drawn short because both piles ran out
+            penalty = 2 if card in _DRAW_TWO_KINDS else 0
+        elif op == OP_START:
+            # GameManager applies no start card effects, so a Draw Two start imposes no draws
+            top = start = card
+            active = color
+        elif op == OP_WIN:
+            winner = actor
+        else:
+            d["challenge"][play_row] = _CHALLENGE_CODES[op]
+            penalty = _CHALLENGE_DRAWS[op]
+            if op == OP_CHALLENGE_SUCCEEDED:
+                # The +4 leaves the discard pile; the previous top card and color return
+                take_back = True
+                top, active = prev_top, prev_active
+
+    if winner >= 0:
+        won = d["won"]
+        seats = d["seat"]
+        for i in range(first_row, len(seats)):
+            if seats[i] == winner:
+                won[i] = 1
+
+    g["game"].append(n)
+    g["num_players"].append(num_players)
+    g["start"].append(start)
+    g["winner"].append(winner)
+    g["turns"].append(turns)
+    g["plays"].append(plays)
+    g["draws"].append(draws)
+    g["penalty_draws"].append(penalty_draws)
+
+
+def _decision_row(d, n, turn, seat, action, color, top, active, hand, hand_size, colors):
+    """Append one decision row; hand, hand_size and colors describe the actor before the action."""
+    row = LEGAL_ROWS[top][active if active >= 0 else NO_COLOR]
+    d["game"].append(n)
+    d["turn"].append(turn)
+    d["seat"].append(seat)
+    d["action"].append(action)
+    d["color"].append(color)
+    d["top"].append(top)
+    d["active_color"].append(active)
+    d["hand_size"].append(hand_size)
+    d["n_legal"].append(sum(c for c, ok in zip(hand, row) if ok))
+    d["held_color"].append(0 <= active < NO_COLOR and colors[active] > 0)
+    d["challenge"].append(-1)
+    d["won"].append(0)
+
+
+def build_index(record_dir: str, index_dir: str, rows_per_shard: int = 1 << 22) -> Dict[str, int]:
+    """Index every game in record_dir into index_dir. Returns the row count of each table."""
+    decisions = _TableWriter(index_dir, "decisions", rows_per_shard)
+    games = _TableWriter(index_dir, "games", rows_per_shard)
+    totals = {"decisions": 0, "games": 0}
+    with GameRecordReader(record_dir) as reader:
+        for n, record in enumerate(reader):
+            _index_game(n, record, decisions.columns, games.columns)
+            # Shards end on game boundaries, so a game's rows never straddle two shards
+            for table, writer in (("decisions", decisions), ("games", games)):
+                if writer.rows() >= writer.rows_per_shard:
+                    totals[table] += writer.rows()
+                    writer.flush()
+    for table, writer in (("decisions", decisions), ("games", games)):
+        totals[table] += writer.rows()
+        writer.flush()
+    return totals
+
+
+class RecordIndex:
+    """Memory-mapped view of an index written by build_index()."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.shards = {}
+        for table in SCHEMA:
+            n = 0
+            while os.path.exists(_shard_path(directory, table, "game", n)):
+                n += 1
+            self.shards[table] = n
+
+    def load(self, table: str, column: str, shard: int) -> np.ndarray:
+        return np.load(_shard_path(self.directory, table, column, shard), mmap_mode="r")
+
+    def column(self, table: str, column: str) -> np.ndarray:
+        """The whole column, concatenated into memory."""
+        parts = [self.load(table, column, s) for s in range(self.shards[table])]
+        if not parts:
+            return np.empty(0, dtype=dict((c, t) for c, _, t in SCHEMA[table])[column])
+        return np.concatenate(parts)
+
+    def __len__(self):
+        return sum(len(self.load("games", "game", s)) for s in range(self.shards["games"]))
+
+    def query(self, table: str) -> "Query":
+        if table not in SCHEMA:
+            raise ValueError(f"Unknown table: {table}")
+        return Query(self, table)
+
+
+class _ShardColumns:
+    """Lazy column getter for one shard; columns are memory-mapped on first access."""
+
+    def __init__(self, index, table, shard):
+        self._index = index
+        self._table = table
+        self._shard = shard
+        self._cache = {}
+
+    def __getitem__(self, column):
+        if column not in self._cache:
+            self._cache[column] = self._index.load(self._table, column, self._shard)
+        return self._cache[column]
+
+
+Value = Union[str, Callable[[_ShardColumns], np.ndarray]]
+
+
+class Query:
+    """
+    Filters and aggregates over one table. where() adds conditions (ANDed);
+    aggregates stream over the shards.
+
+    A condition is a scalar (equality), a list/tuple/set (membership) or a
+    callable on the column array returning a boolean mask. A value passed to an
+    aggregate is a column name or a callable on the shard's columns (c["name"]).
+    """
+
+    def __init__(self, index: RecordIndex, table: str, conditions=None):
+        self.index = index
+        self.table = table
+        self.conditions = list(conditions or [])
+
+    def where(self, predicate: Optional[Callable[[_ShardColumns], np.ndarray]] = None, **conditions) -> "Query":
+        new = list(self.conditions)
+        if predicate is not None:
+            new.append((None, predicate))
+        new.extend(conditions.items())
+        return Query(self.index, self.table, new)
+
+    def _shards(self):
+        """Yield (columns, mask) per shard; mask is None when there are no conditions."""
+        for s in range(self.index.shards[self.table]):
+            cols = _ShardColumns(self.index, self.table, s)
+            mask = None
+            for column, cond in self.conditions:
+                if column is None:
+                    m = np.asarray(cond(cols), dtype=bool)
+                elif callable(cond):
+                    m = np.asarray(cond(cols[column]), dtype=bool)
+                elif isinstance(cond, (list, tuple, set, frozenset)):
+                    m = np.isin(cols[column], list(cond))
+                else:
+                    m = cols[column] == cond
+                mask = m if mask is None else mask & m
+            yield cols, mask
+
+    @staticmethod
+    def _value(cols, value: Value, mask):
+        v = cols[value] if isinstance(value, str) else np.asarray(value(cols))
+        return v if mask is None else v[mask]
+
+    def count(self) -> int:
+        total = 0
+        for cols, mask in self._shards():
+            total += len(cols["game"]) if mask is None else int(np.count_nonzero(mask))
+        return total
+
+    def values(self, value: Value) -> np.ndarray:
+        """Matching values, concatenated."""
+        return np.concatenate([self._value(cols, value, mask) for cols, mask in self._shards()] or [np.empty(0)])
+
+    def sum(self, value: Value) -> float:
+        return float(sum(np.sum(self._value(cols, value, mask), dtype=np.float64) for cols, mask in self._shards()))
+
+    def mean(self, value: Value) -> float:
+        total, n = 0.0, 0
+        for cols, mask in self._shards():
+            v = self._value(cols, value, mask)
+            total += np.sum(v, dtype=np.float64)
+            n += len(v)
+        return total / n if n else float("nan")
+
+    def _grouped(self, value: Optional[Value], by: Value):
+        sums: Dict[int, float] = {}
+        counts: Dict[int, int] = {}
+        for cols, mask in self._shards():
+            keys = np.asarray(self._value(cols, by, mask)).astype(np.int64)
+            if not len(keys):
+                continue
+            # Small integer keys: bincount on the keys shifted to start at 0
+            lo = int(keys.min())
+            keys -= lo
+            weights = None if value is None else self._value(cols, value, mask).astype(np.float64)
+            c = np.bincount(keys)
+            s = c if value is None else np.bincount(keys, weights=weights)
+            present = np.flatnonzero(c)
+            for k, kc, ks in zip((present + lo).tolist(), c[present].tolist(), s[present].tolist()):
+                counts[k] = counts.get(k, 0) + kc
+                sums[k] = sums.get(k, 0.0) + ks
+        return sums, counts
+
+    def group_count(self, by: Value) -> Dict[int, int]:
+        """Rows per integer key."""
+        return self._grouped(None, by)[1]
+
+    def group_sum(self, value: Value, by: Value) -> Dict[int, float]:
+        return self._grouped(value, by)[0]
+
+    def group_mean(self, value: Value, by: Value) -> Dict[int, float]:
+        sums, counts = self._grouped(value, by)
+        return {k: sums[k] / counts[k] for k in sums}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a columnar index over recorded games")
+    parser.add_argument("record_dir")
+    parser.add_argument("index_dir")
+    parser.add_argument("--rows-per-shard", type=int, default=1 << 22)
+    args = parser.parse_args()
+    totals = build_index(args.record_dir, args.index_dir, args.rows_per_shard)
+    print(f"Indexed {totals['games']} games, {totals['decisions']} decisions into {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
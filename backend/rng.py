@@ -0,0 +1,20 @@
+import os
+import random
+import hashlib
+from typing import Optional
+
+# Every game is fully determined by a 16-byte seed: the engine (shuffles, color
+# fallbacks) and the SimpleAI bots all draw from the GameManager's own RNG.
+SEED_BYTES = 16
+
+def game_seed(run_seed: int, game_id: int) -> bytes:
+    """16-byte seed of game `game_id` in run `run_seed` (independent of which worker plays it)."""
+    return hashlib.blake2b(f"{run_seed}:{game_id}".encode(), digest_size=SEED_BYTES).digest()
+
+def random_seed() -> bytes:
+    """Fresh 16-byte seed from OS entropy."""
+    return os.urandom(SEED_BYTES)
+
+def make_rng(seed: Optional[bytes] = None) -> random.Random:
+    """random.Random seeded from a 16-byte game seed (OS entropy if None)."""
+    return random.Random(int.from_bytes(seed if seed is not None else random_seed(), "little"))
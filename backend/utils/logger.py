@@ -29,6 +29,10 @@ class GameLogger:
         self.logger = None
         self.log_file_path = None
         self.is_test_mode = False
+        self.profile = "interactive"
+        # Fast gate checked before any formatting: True only when a handler is attached
+        # and the profile allows logging.
+        self._active = False
         self._setup_logger()
     
     def _setup_logger(self):
@@ -41,6 +45,29 @@ class GameLogger:
         # Optional: Add console handler for development visibility if needed, 
         # but user asked to NOT print to console.
         # So we leave it empty until start_game_session is called for file logging.
+        self._refresh_active()
+
+    # Logging profiles: "interactive" logs whenever a session handler is attached,
+    # "simulation" turns game logging off entirely (training / evaluation hot loops).
+    PROFILES = ("interactive", "simulation")
+
+    def set_profile(self, profile: str):
+        """Switch logging profile ("interactive" or "simulation")."""
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown logging profile: {profile}")
+        self.profile = profile
+        self._refresh_active()
+
+    def _refresh_active(self):
+        self._active = bool(
+            self.profile != "simulation"
+            and self.logger
+            and self.logger.handlers
+        )
+
+    def is_enabled(self, level: int = logging.INFO) -> bool:
+        """True if a message at `level` would be written. Use to guard expensive message construction."""
+        return self._active and self.logger.isEnabledFor(level)
     
     def start_game_session(self, is_test: bool = False) -> str:
         """Start a new logging session."""
@@ -74,6 +101,7 @@ class GameLogger:
         file_handler.setFormatter(formatter)
         
         self.logger.addHandler(file_handler)
+        self._refresh_active()
         
         self.log_game_start()
         return self.log_file_path
@@ -89,6 +117,7 @@ class GameLogger:
                     self.logger.removeHandler(handler)
                     handler.close()
             self.log_file_path = None
+            self._refresh_active()
 
     def log_game_start(self):
         if self.logger:
@@ -101,27 +130,29 @@ class GameLogger:
         """Remove ANSI color codes from string."""
         return self.ANSI_ESCAPE.sub('', message)
 
-    def log_info(self, message: str):
-        if self.logger:
-            self.logger.info(self.strip_ansi(message))
+    def _log(self, level: int, message: str, args):
+        # Lazy formatting: %-style args (and Card.__str__ colouring) are only
+        # rendered, and ANSI-stripped, once we know the message will be written.
+        if args:
+            message = message % args
+        self.logger.log(level, self.strip_ansi(message))
 
-    def log_warning(self, message: str):
-        if self.logger:
-            self.logger.warning(self.strip_ansi(message))
+    def log_info(self, message: str, *args):
+        if self._active and self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, message, args)
 
-    def log_error(self, message: str):
-        if self.logger:
-            self.logger.error(self.strip_ansi(message))
+    def log_warning(self, message: str, *args):
+        if self._active and self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, message, args)
 
-    # Aliases for compatibility with standard logging calls
-    def info(self, message: str):
-        self.log_info(message)
+    def log_error(self, message: str, *args):
+        if self._active and self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, message, args)
 
-    def warning(self, message: str):
-        self.log_warning(message)
-
-    def error(self, message: str):
-        self.log_error(message)
+    # Aliases for compatibility with standard logging calls
+    info = log_info
+    warning = log_warning
+    error = log_error
 
 # Global Instance
 game_logger = GameLogger()
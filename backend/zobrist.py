@@ -0,0 +1,64 @@
+"""
+Zobrist keys for 64-bit game state hashes (GameManager.state_hash / observation_hash).
+
+Card multisets (hands, discard pile) are hashed per kind and copy count:
+key(kind, c) stands for "exactly c copies of kind", with key(kind, 0) = 0.
+Going from c to c + 1 copies (or back) XORs in COUNT_DELTA[kind][c], so
+Player and Deck keep their hashes current in O(1) per card. Everything else
+(top card, active color, direction, turn, opponent hand sizes) is a single
+table lookup at query time.
+"""
+
+import random
+from backend.card import CARD_KINDS
+from config.enums import Direction, DecisionType
+
+MASK64 = (1 << 64) - 1
+MAX_PLAYERS = 16
+MAX_HAND = 108
+# Copies of one kind a pile can hold: a standard deck has at most 4, but hand-built
+# positions (tests, search) may pile up more, so the tables cover a whole deck
+MAX_COPIES = MAX_HAND
+
+_rng = random.Random(0x5EED_2B0B)
+
+def _key():
+    return _rng.getrandbits(64)
+
+def _count_deltas(max_copies):
+    keys = [[0] + [_key() for _ in range(max_copies)] for _ in CARD_KINDS]
+    return [[row[c] ^ row[c + 1] for c in range(max_copies)] for row in keys]
+
+# COUNT_DELTA[kind][c]: toggles "c copies" <-> "c + 1 copies" of kind in a hand
+COUNT_DELTA = _count_deltas(MAX_COPIES)
+# Same for the discard pile (separate keys, so a card moving between piles changes the hash)
+DISCARD_DELTA = _count_deltas(MAX_COPIES)
+
+# Top card kind; index 54 = empty discard pile
+TOP_KEYS = [_key() for _ in range(len(CARD_KINDS) + 1)]
+# Active color slot (backend.legality.color_slot); slot 4 = no active color
+COLOR_KEYS = [_key() for _ in range(5)]
+DIRECTION_KEYS = {Direction.CLOCKWISE: _key(), Direction.COUNTER_CLOCKWISE: _key()}
+TURN_KEYS = [_key() for _ in range(MAX_PLAYERS)]
+SEAT_KEYS = [_key() for _ in range(MAX_PLAYERS)]
+# OPP_SIZE_KEYS[i][n]: the i-th next opponent (encode_state order) holds n cards
+OPP_SIZE_KEYS = [[_key() for _ in range(MAX_HAND + 1)] for _ in range(MAX_PLAYERS)]
+# Pending step-API decision: its type and the card concerned (index 54 = none)
+DECISION_KEYS = {decision_type: _key() for decision_type in DecisionType}
+DECISION_CARD_KEYS = [_key() for _ in range(len(CARD_KINDS) + 1)]
+GAME_OVER_KEY = _key()
+
+def multiset_hash(kinds, deltas) -> int:
+    """From-scratch hash of a card multiset (kind indices); deltas is COUNT_DELTA or DISCARD_DELTA."""
+    h = 0
+    counts = [0] * len(CARD_KINDS)
+    for k in kinds:
+        h ^= deltas[k][counts[k]]
+        counts[k] += 1
+    return h
+
+def mix64(x: int) -> int:
+    """SplitMix64 finalizer: a bijective, non-linear 64-bit mix."""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK64
+    return x ^ (x >> 31)
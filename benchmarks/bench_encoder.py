@@ -0,0 +1,63 @@
+"""Per-decision cost of encode_state vs IncrementalStateEncoder.encode on mid-game states."""
+import sys
+import os
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from config.enums import PlayerType, CardColor
+from rl_utils import encode_state, IncrementalStateEncoder
+
+COLORS = [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]
+
+def play_turn(gm):
+    player = gm.get_current_player()
+    top = gm.deck.peek_discard_pile()
+    legal = [c for c in player.hand if gm.check_legal_play(c, top)]
+    if legal:
+        gm.play_card(player, random.choice(legal), random.choice(COLORS))
+    else:
+        card = gm.deck.draw_card()
+        if card:
+            player.add_card(card)
+        gm._advance_turn()
+
+def run(games=200, seed=0):
+    """Time both encoders at every turn of `games` random games. Returns microseconds per decision."""
+    random.seed(seed)
+    t_full = 0.0
+    t_inc = 0.0
+    decisions = 0
+    for _ in range(games):
+        players = [Player(i, f"P{i}", PlayerType.AI) for i in range(4)]
+        gm = GameManager(players)
+        gm.challenge_decider = lambda victim, prev: False
+        gm.start_game()
+        encoder = IncrementalStateEncoder(gm)
+        while not gm.game_over:
+            p = gm.get_current_player()
+            t0 = time.perf_counter()
+            encode_state(p, gm)
+            t1 = time.perf_counter()
+            encoder.encode(p)
+            t2 = time.perf_counter()
+            t_full += t1 - t0
+            t_inc += t2 - t1
+            decisions += 1
+            play_turn(gm)
+    return {
+        "decisions": decisions,
+        "encode_state_us": t_full / decisions * 1e6,
+        "incremental_us": t_inc / decisions * 1e6,
+        "speedup": t_full / t_inc,
+    }
+
+if __name__ == "__main__":
+    res = run()
+    print(f"Decisions: {res['decisions']}")
+    print(f"encode_state:            {res['encode_state_us']:.2f} us/decision")
+    print(f"IncrementalStateEncoder: {res['incremental_us']:.2f} us/decision")
+    print(f"Speedup: {res['speedup']:.2f}x")
@@ -0,0 +1,60 @@
+"""Games/sec of SimpleAI self-play with game logging enabled vs the "simulation" logging profile."""
+import sys
+import os
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.utils.logger import game_logger
+from config.enums import PlayerType, CardColor
+
+COLORS = [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]
+
+def play_game():
+    players = [Player(i, f"S{i}", PlayerType.AI) for i in range(4)]
+    gm = GameManager(players)
+    gm.challenge_decider = lambda victim, prev: random.random() < 0.3
+    gm.start_game()
+    while not gm.game_over:
+        player = gm.get_current_player()
+        top = gm.deck.peek_discard_pile()
+        legal = [c for c in player.hand if gm.check_legal_play(c, top)]
+        if legal:
+            gm.play_card(player, random.choice(legal), random.choice(COLORS))
+        else:
+            gm.draw_card_action(player)
+
+def games_per_sec(games, seed=0):
+    random.seed(seed)
+    t0 = time.perf_counter()
+    for _ in range(games):
+        play_game()
+    return games / (time.perf_counter() - t0)
+
+def run(games=2000):
+    """Returns games/sec for: no handler attached, simulation profile, and a file handler attached."""
+    results = {}
+    has_profiles = hasattr(game_logger, "set_profile")
+
+    results["no_handler"] = games_per_sec(games)
+    if has_profiles:
+        game_logger.set_profile("simulation")
+        results["simulation_profile"] = games_per_sec(games)
+        game_logger.set_profile("interactive")
+
+    # Worst case: every message formatted, ANSI-stripped and written to a file
+    game_logger.start_game_session(is_test=True)
+    results["file_handler"] = games_per_sec(max(games // 10, 1))
+    log_path = game_logger.log_file_path
+    game_logger.end_game_session()
+    if log_path and os.path.exists(log_path):
+        os.remove(log_path)
+    return results
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, gps in run(games).items():
+        print(f"{name:<20} {gps:8.1f} games/sec")
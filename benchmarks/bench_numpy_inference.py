@@ -0,0 +1,87 @@
+"""
+UNOAgent (torch) vs NumpyUNOAgent: batch-1 latency, batched throughput, and the
+startup time of a process that loads an RLAgentHandler with either backend.
+"""
+import sys
+import os
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import numpy as np
+import torch
+
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM
+from numpy_model import NumpyUNOAgent, export_npz
+
+STARTUP_SCRIPT = (
+    "import sys; sys.path.insert(0, {root!r})\n"
+    "from rl_agent import RLAgentHandler\n"
+    "RLAgentHandler({path!r}, backend={backend!r})\n"
+)
+
+def per_call_us(fn, x, repeats):
+    fn(x)
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn(x)
+    return (time.perf_counter() - t0) / repeats * 1e6
+
+def startup_ms(backend, path, runs=3):
+    """Best wall time of a fresh interpreter importing rl_agent and loading the weights."""
+    script = STARTUP_SCRIPT.format(root=ROOT, path=path, backend=backend)
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+def run(repeats=2000, batch_sizes=(64, 1024), seed=0):
+    torch.manual_seed(seed)
+    model = UNOAgent().eval()
+    np_model = NumpyUNOAgent.from_state_dict(model.state_dict())
+    rng = np.random.default_rng(seed)
+    res = {}
+
+    def torch_forward(x):
+        with torch.no_grad():
+            return {h: out.numpy() for h, out in model(torch.from_numpy(x)).items()}
+
+    x1 = rng.random((1, STATE_DIM), dtype=np.float32)
+    res["torch_batch1_us"] = per_call_us(torch_forward, x1, repeats)
+    res["numpy_batch1_us"] = per_call_us(np_model, x1[0], repeats)
+    for n in batch_sizes:
+        x = rng.random((n, STATE_DIM), dtype=np.float32)
+        calls = max(10, repeats * 8 // n)
+        res[f"torch_batch{n}_states_per_sec"] = n / per_call_us(torch_forward, x, calls) * 1e6
+        res[f"numpy_batch{n}_states_per_sec"] = n / per_call_us(np_model, x, calls) * 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pth = os.path.join(tmp, "model.pth")
+        npz = os.path.join(tmp, "model.npz")
+        torch.save(model.state_dict(), pth)
+        export_npz(model, npz)
+        res["npz_kib"] = os.path.getsize(npz) / 1024
+        half = os.path.join(tmp, "model_half.npz")
+        export_npz(model, half, np.float16)
+        res["npz_half_kib"] = os.path.getsize(half) / 1024
+        res["pth_kib"] = os.path.getsize(pth) / 1024
+        res["torch_startup_ms"] = startup_ms("torch", pth)
+        res["numpy_startup_ms"] = startup_ms("numpy", npz)
+    return res
+
+if __name__ == "__main__":
+    res = run()
+    print(f"Batch 1:    torch {res['torch_batch1_us']:.1f} us   numpy {res['numpy_batch1_us']:.1f} us   "
+          f"({res['torch_batch1_us'] / res['numpy_batch1_us']:.1f}x)")
+    for key in res:
+        if key.startswith("torch_batch") and key.endswith("_per_sec"):
+            n = key[len("torch_batch"):-len("_states_per_sec")]
+            print(f"Batch {n}: torch {res[key]:,.0f} states/s   numpy {res[f'numpy_batch{n}_states_per_sec']:,.0f} states/s")
+    print(f"Weights:    .pth {res['pth_kib']:.0f} KiB   .npz {res['npz_kib']:.0f} KiB   .npz float16 {res['npz_half_kib']:.0f} KiB")
+    print(f"Startup:    torch {res['torch_startup_ms']:.0f} ms   numpy {res['numpy_startup_ms']:.0f} ms")
@@ -0,0 +1,73 @@
+"""Games/sec and per-game object constructions: fresh GameManager/Deck/Players per game vs one pooled game reset in place."""
+import sys
+import os
+import time
+import random
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.game_manager import GameManager
+from backend.deck import Deck
+from backend.player import Player
+from backend.utils.logger import game_logger
+from config.enums import PlayerType
+from train_backend import simple_ai_action
+
+def new_game():
+    return GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(4)])
+
+def play(gm):
+    decision = gm.reset()
+    while decision is not None:
+        decision = gm.step(simple_ai_action(decision))
+
+def count_constructions(fn):
+    """Run fn() and count GameManager / Deck / Player constructions and Card list slots allocated by Deck."""
+    counts = Counter()
+    originals = {}
+    for cls in (GameManager, Deck, Player):
+        init = cls.__init__
+        originals[cls] = init
+        def counting_init(self, *args, _init=init, _name=cls.__name__, **kwargs):
+            counts[_name] += 1
+            _init(self, *args, **kwargs)
+            if _name == "Deck":
+                counts["card_slots"] += len(self.cards)
+        cls.__init__ = counting_init
+    try:
+        fn()
+    finally:
+        for cls, init in originals.items():
+            cls.__init__ = init
+    return counts
+
+def run(games=2000, seed=0):
+    game_logger.set_profile("simulation")
+    results = {}
+
+    def fresh():
+        for _ in range(games):
+            play(new_game())
+
+    def pooled():
+        gm = new_game()
+        for _ in range(games):
+            play(gm)
+
+    for name, fn in (("fresh", fresh), ("pooled", pooled)):
+        random.seed(seed)
+        t0 = time.perf_counter()
+        fn()
+        gps = games / (time.perf_counter() - t0)
+        random.seed(seed)
+        counts = count_constructions(fn)
+        results[name] = {"games_per_sec": gps}
+        results[name].update({k: v / games for k, v in counts.items()})
+    return results
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, res in run(games).items():
+        allocs = ", ".join(f"{k}={v:.3f}" for k, v in res.items() if k != "games_per_sec")
+        print(f"{name:<7} {res['games_per_sec']:8.1f} games/sec   per game: {allocs or 'no constructions'}")
@@ -0,0 +1,52 @@
+"""
+UNOAgent float (eager torch) vs the int8 TorchScript module of quantized_model.py:
+forward throughput at batch sizes 1, 64 and 1024, and decision agreement on a
+small recorded dataset.
+"""
+import sys
+import os
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM
+from dataset import generate
+from quantized_model import quantize, decision_agreement
+
+def states_per_sec(model, x, calls):
+    with torch.no_grad():
+        model(x)
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            model(x)
+    return x.shape[0] * calls / (time.perf_counter() - t0)
+
+def run(batch_sizes=(1, 64, 1024), states=8192, games=100, seed=0):
+    torch.manual_seed(seed)
+    model = UNOAgent().eval()
+    quantized = quantize(model)
+    res = {}
+    for n in batch_sizes:
+        x = torch.rand(n, STATE_DIM)
+        calls = max(20, states // n)
+        res[f"float_batch{n}_states_per_sec"] = states_per_sec(model, x, calls)
+        res[f"int8_batch{n}_states_per_sec"] = states_per_sec(quantized, x, calls)
+    with tempfile.TemporaryDirectory() as tmp:
+        generate(tmp, games, seed=seed, num_workers=1)
+        report = decision_agreement(model, quantized, tmp)
+    res["agreement"] = report["agreement"]
+    res["max_abs_diff"] = report["max_abs_diff"]
+    return res
+
+if __name__ == "__main__":
+    res = run()
+    for key in res:
+        if key.startswith("float_batch"):
+            n = key[len("float_batch"):-len("_states_per_sec")]
+            f, q = res[key], res[f"int8_batch{n}_states_per_sec"]
+            print(f"Batch {n:>4}: float {f:>10,.0f} states/s   int8 {q:>10,.0f} states/s   ({q / f:.1f}x)")
+    print(f"Decision agreement: {res['agreement']:.2%}   max |value diff|: {res['max_abs_diff']:.3g}")
@@ -0,0 +1,59 @@
+"""Game record size and throughput: record games, read them back, build the columnar index and time queries on it."""
+import sys
+import os
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.game_record import GameRecordWriter, GameRecordReader
+from backend.record_index import build_index, RecordIndex
+from backend.utils.logger import game_logger
+from config.enums import PlayerType
+from train_backend import simple_ai_action
+
+QUERIES = {
+    "+4 played holding the active color": lambda q: q.where(action=53, held_color=True).count(),
+    "win rate by seat": lambda q: q.group_mean("won", by="seat"),
+    "mean hand size when drawing": lambda q: q.where(action=-1).mean("hand_size"),
+}
+
+def run(games=5000, seed=0):
+    game_logger.set_profile("simulation")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        records, index = os.path.join(tmp, "records"), os.path.join(tmp, "index")
+        gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(4)])
+        t0 = time.perf_counter()
+        with GameRecordWriter(records) as writer:
+            gm.recorder = writer
+            for g in range(games):
+                decision = gm.reset(seed, game_id=g)
+                while decision is not None:
+                    decision = gm.step(simple_ai_action(decision, gm.rng))
+        results["record_games_per_sec"] = games / (time.perf_counter() - t0)
+        size = sum(os.path.getsize(os.path.join(records, f)) for f in os.listdir(records) if f.endswith(".ugr"))
+        results["bytes_per_game"] = size / games
+
+        t0 = time.perf_counter()
+        with GameRecordReader(records) as reader:
+            events = sum(1 for record in reader for _ in record.events())
+        results["read_events_per_sec"] = events / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        totals = build_index(records, index)
+        results["index_games_per_sec"] = games / (time.perf_counter() - t0)
+
+        q = RecordIndex(index).query("decisions")
+        for name, fn in QUERIES.items():
+            t0 = time.perf_counter()
+            fn(q)
+            results[f"query rows/sec: {name}"] = totals["decisions"] / (time.perf_counter() - t0)
+    return results
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for name, value in run(games).items():
+        print(f"{name:<55} {value:14.1f}")
@@ -0,0 +1,72 @@
+"""
+Wall time of one train.py update (zero_grad, loss, backward, Adam step) at
+BATCH_SIZE=4096: the fused replay_loss (one forward pass) vs the former
+per-head loss, which ran the model once per head present in the batch.
+"""
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from train import replay_loss
+
+BATCH_SIZE = 4096
+
+def per_head_loss(model, batch):
+    """The former replay_loss: one forward pass and one MSE per head."""
+    states, heads, actions, targets = batch
+    losses = []
+    for head_id, head in enumerate(HEADS):
+        mask = heads == head_id
+        if not mask.any():
+            continue
+        preds = model(states[mask])[head].gather(1, actions[mask].unsqueeze(1)).squeeze(1)
+        losses.append(torch.nn.functional.mse_loss(preds, targets[mask]))
+    return sum(losses)
+
+def make_batch(batch_size, seed=0):
+    """Random batch with roughly the head mix of self-play (mostly card decisions)."""
+    rng = np.random.default_rng(seed)
+    heads = rng.choice(len(HEADS), size=batch_size, p=[0.8, 0.02, 0.13, 0.05])
+    sizes = np.array([54, 2, 2, 4])
+    actions = rng.integers(0, sizes[heads])
+    states = rng.integers(0, 4, size=(batch_size, STATE_DIM))
+    return (torch.from_numpy(states).float(), torch.from_numpy(heads).long(),
+            torch.from_numpy(actions).long(), torch.from_numpy(rng.standard_normal(batch_size).astype(np.float32)))
+
+def time_updates(loss_fn, batch, steps, seed=0):
+    torch.manual_seed(seed)
+    model = UNOAgent().train()
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-4)
+    samples = []
+    for _ in range(steps + 1):
+        t0 = time.perf_counter()
+        optimizer.zero_grad()
+        loss = loss_fn(model, batch)
+        loss.backward()
+        optimizer.step()
+        samples.append(time.perf_counter() - t0)
+    # First step warms up the allocator and Adam state
+    return np.asarray(samples[1:]) * 1e3
+
+def run(batch_size=BATCH_SIZE, steps=20):
+    batch = make_batch(batch_size)
+    res = {"batch_size": batch_size}
+    for name, fn in (("per_head", per_head_loss), ("fused", replay_loss)):
+        ms = time_updates(fn, batch, steps)
+        res[f"{name}_p50_ms"] = float(np.percentile(ms, 50))
+        res[f"{name}_mean_ms"] = float(ms.mean())
+    return res
+
+if __name__ == "__main__":
+    res = run()
+    print(f"Update at batch {res['batch_size']}:")
+    print(f"  per-head passes: {res['per_head_p50_ms']:.1f} ms (p50), {res['per_head_mean_ms']:.1f} ms (mean)")
+    print(f"  fused pass:      {res['fused_p50_ms']:.1f} ms (p50), {res['fused_mean_ms']:.1f} ms (mean)")
+    print(f"  speedup: {res['per_head_p50_ms'] / res['fused_p50_ms']:.2f}x")
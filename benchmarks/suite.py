@@ -0,0 +1,299 @@
+"""
+Throughput / latency suite for the engine, encoder, agent and trainer.
+
+    python benchmarks/suite.py                          # print JSON results
+    python benchmarks/suite.py -o baseline.json         # store a baseline
+    python benchmarks/suite.py --compare baseline.json  # flag regressions, exit 1 if any
+
+Every benchmark runs with fixed seeds and returns a flat dict of metrics.
+Metric names encode their direction: "*_per_sec" is higher-is-better,
+"*_us" / "*_ms" is lower-is-better; anything else is informational.
+"""
+import sys
+import os
+import json
+import time
+import random
+import platform
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from backend.deck import Deck
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.utils.logger import game_logger
+from config.enums import PlayerType, CardColor
+from rl_agent import RLAgentHandler
+from rl_utils import encode_state, STATE_DIM, HEADS
+from train import ReplayBuffer, replay_loss
+from train_backend import run_game_epoch
+
+COLORS = [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]
+DECISION_METHODS = ["select_card", "select_color", "should_play_drawn", "should_challenge"]
+
+def seed_all(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+def latency_stats(samples_s, prefix=""):
+    """p50 / p99 / mean of a list of durations in seconds, reported in microseconds."""
+    arr = np.asarray(samples_s) * 1e6
+    if arr.size == 0:
+        return {}
+    return {
+        f"{prefix}p50_us": float(np.percentile(arr, 50)),
+        f"{prefix}p99_us": float(np.percentile(arr, 99)),
+        f"{prefix}mean_us": float(arr.mean()),
+    }
+
+def simple_ai_turn(gm):
+    """One SimpleAI turn: random legal card and color, otherwise draw."""
+    player = gm.get_current_player()
+    legal = gm.legal_cards(player)
+    if legal:
+        gm.play_card(player, random.choice(legal), random.choice(COLORS))
+    else:
+        gm.draw_card_action(player)
+
+def new_game(rl_seat=False):
+    players = [Player(i, f"P{i}", PlayerType.RL if rl_seat and i == 0 else PlayerType.AI) for i in range(4)]
+    # Game RNG seeded from the (fixed-seed) global stream so runs are reproducible
+    return GameManager(players, seed=random.randbytes(16))
+
+# ---------------------------------------------------------------- benchmarks
+
+def bench_deck(scale):
+    n = 2000 * scale
+    build, shuffle = [], []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        deck = Deck()
+        t1 = time.perf_counter()
+        # shuffle() is lazy (the order is drawn card by card), so the shuffling work is
+        # only done by drawing: time a shuffle plus a full draw-out of the 108 cards
+        deck.shuffle()
+        deck.draw_many(108)
+        t2 = time.perf_counter()
+        build.append(t1 - t0)
+        shuffle.append(t2 - t1)
+    res = {"decks": n, "deck_cycles_per_sec": n / (sum(build) + sum(shuffle))}
+    res.update(latency_stats(build, "build_"))
+    res.update(latency_stats(shuffle, "shuffle_draw_"))
+    return res
+
+def bench_simple_ai_games(scale):
+    n = 300 * scale
+    durations = []
+    decisions = 0
+    for _ in range(n):
+        gm = new_game()
+        gm.challenge_decider = lambda victim, prev: random.random() < 0.3
+        t0 = time.perf_counter()
+        gm.start_game()
+        while not gm.game_over:
+            simple_ai_turn(gm)
+            decisions += 1
+        durations.append(time.perf_counter() - t0)
+    total = sum(durations)
+    res = {"games": n, "games_per_sec": n / total, "decisions_per_sec": decisions / total}
+    res.update(latency_stats(durations, "game_"))
+    return res
+
+def bench_encode_state(scale):
+    n_games = 50 * scale
+    samples = []
+    for _ in range(n_games):
+        gm = new_game()
+        gm.challenge_decider = lambda victim, prev: False
+        gm.start_game()
+        while not gm.game_over:
+            player = gm.get_current_player()
+            t0 = time.perf_counter()
+            encode_state(player, gm)
+            samples.append(time.perf_counter() - t0)
+            simple_ai_turn(gm)
+    res = {"calls": len(samples), "calls_per_sec": len(samples) / sum(samples)}
+    res.update(latency_stats(samples))
+    return res
+
+def bench_rl_agent(scale):
+    """Per-decision latency of each RLAgentHandler method, timed inside real games."""
+    n = 50 * scale
+    agent = RLAgentHandler(None)
+    samples = {name: [] for name in DECISION_METHODS}
+    for name in DECISION_METHODS:
+        method = getattr(agent, name)
+        def timed(*args, _method=method, _bucket=samples[name], **kwargs):
+            t0 = time.perf_counter()
+            out = _method(*args, **kwargs)
+            _bucket.append(time.perf_counter() - t0)
+            return out
+        setattr(agent, name, timed)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        agent.clear_history()
+        run_game_epoch(new_game(rl_seat=True), agent)
+    total = time.perf_counter() - t0
+    decisions = sum(len(s) for s in samples.values())
+    res = {
+        "games": n,
+        "games_per_sec": n / total,
+        "decisions_per_sec": decisions / sum(sum(s) for s in samples.values()),
+    }
+    for name, s in samples.items():
+        res[f"{name}_calls"] = len(s)
+        res.update(latency_stats(s, f"{name}_"))
+    return res
+
+def _filled_buffer(capacity=100000):
+    buf = ReplayBuffer(capacity)
+    rng = np.random.default_rng(0)
+    states = rng.integers(0, 3, size=(capacity, STATE_DIM))
+    heads = rng.integers(0, len(HEADS), size=capacity)
+    actions = rng.integers(0, 2, size=capacity)
+    buf.push(torch.from_numpy(states), torch.from_numpy(heads), torch.from_numpy(actions),
+             torch.from_numpy(rng.standard_normal(capacity).astype(np.float32)))
+    return buf
+
+def bench_replay_sample(scale, batch_size=4096):
+    buf = _filled_buffer()
+    n = 50 * scale
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        buf.sample(batch_size)
+        samples.append(time.perf_counter() - t0)
+    res = {"batch_size": batch_size, "samples_per_sec": n / sum(samples)}
+    res.update(latency_stats(samples))
+    return res
+
+def bench_train_step(scale, batch_size=4096):
+    """One train.py update: sample, fused multi-head loss, backward, Adam step."""
+    buf = _filled_buffer()
+    agent = RLAgentHandler(None)
+    agent.model.train()
+    optimizer = torch.optim.Adam(agent.model.parameters(), lr=1e-4)
+    n = 5 * scale
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        optimizer.zero_grad()
+        loss = replay_loss(agent.model, buf.sample(batch_size))
+        loss.backward()
+        optimizer.step()
+        samples.append(time.perf_counter() - t0)
+    res = {"batch_size": batch_size, "steps_per_sec": n / sum(samples),
+           "transitions_per_sec": n * batch_size / sum(samples)}
+    res.update(latency_stats(samples))
+    return res
+
+BENCHMARKS = {
+    "deck": bench_deck,
+    "simple_ai_games": bench_simple_ai_games,
+    "encode_state": bench_encode_state,
+    "rl_agent": bench_rl_agent,
+    "replay_sample": bench_replay_sample,
+    "train_step": bench_train_step,
+}
+
+# ---------------------------------------------------------------- runner
+
+def run_suite(names=None, scale=1, seed=0):
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "torch_threads": torch.get_num_threads(),
+            "seed": seed,
+            "scale": scale,
+        },
+        "benchmarks": {},
+    }
+    previous_profile = game_logger.profile
+    game_logger.set_profile("simulation")
+    try:
+        for name in names or BENCHMARKS:
+            seed_all(seed)
+            results["benchmarks"][name] = BENCHMARKS[name](scale)
+    finally:
+        game_logger.set_profile(previous_profile)
+    return results
+
+def metric_direction(metric):
+    """+1 if higher is better, -1 if lower is better, 0 if informational."""
+    if metric.endswith("_per_sec"):
+        return 1
+    if metric.endswith("_us") or metric.endswith("_ms"):
+        return -1
+    return 0
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Relative change of every directional metric present in both runs.
+    Returns a list of dicts; "regression" is set when a metric got worse by more than threshold.
+    """
+    rows = []
+    for bench, metrics in current["benchmarks"].items():
+        base_metrics = baseline.get("benchmarks", {}).get(bench, {})
+        for metric, value in metrics.items():
+            direction = metric_direction(metric)
+            base = base_metrics.get(metric)
+            if direction == 0 or not base:
+                continue
+            change = (value - base) / base
+            rows.append({
+                "benchmark": bench,
+                "metric": metric,
+                "baseline": base,
+                "current": value,
+                "change": change,
+                "regression": change * direction < -threshold,
+            })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UNO-RL throughput and latency benchmarks")
+    parser.add_argument("--only", help="comma-separated benchmark names (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="multiply iteration counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads (pinned for comparable runs)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else None
+    unknown = [n for n in names or [] if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+
+    torch.set_num_threads(args.threads)
+    results = run_suite(names, scale=args.scale, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if not args.compare:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    results["comparison"] = rows
+    print(json.dumps(results, indent=2))
+    regressions = [r for r in rows if r["regression"]]
+    for r in regressions:
+        print(f"REGRESSION {r['benchmark']}.{r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+              f"({r['change']:+.1%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
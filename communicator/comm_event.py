@@ -13,8 +13,20 @@ class AckEvent(CommEvent):
         self.success = success
         self.message = message
 
+def card_to_dict(card: Card) -> dict:
+    return {"color": card.color.value, "card_type": card.card_type.value, "value": card.value, "_class_name": "Card"}
+
+def card_from_dict(data: dict) -> Card:
+    """Rebuild a (shared, interned) Card from its dict form, converting string Enums back."""
+    color_enum = next((c for c in CardColor if c.value == data.get("color")), CardColor.RED)
+    type_enum = next((t for t in CardType if t.value == data.get("card_type")), CardType.NUMBER)
+    return Card(color_enum, type_enum, data.get("value"))
+
 def to_dict_recursive(obj) -> dict:
-    if isinstance(obj, Enum):
+    if isinstance(obj, Card):
+        # Cards use __slots__, so they have no __dict__ to walk
+        return card_to_dict(obj)
+    elif isinstance(obj, Enum):
         return obj.value
     elif isinstance(obj, (list, tuple)):
         return [to_dict_recursive(item) for item in obj]
@@ -28,10 +40,6 @@ def to_dict_recursive(obj) -> dict:
         
         if issubclass(type(obj), CommEvent):
              result["my_event_name"] = type(obj).__name__
-        # Special handling for Card object to reconstruct it easily later if needed, 
-        # though standard vars() is usually enough if we know the type on the other side.
-        if isinstance(obj, Card):
-             result["_class_name"] = "Card"
              
         return result
     else:
@@ -45,37 +53,19 @@ def update_instance_from_dict_optimized(instance, data: dict):
         if hasattr(instance, key):
             current_attr = getattr(instance, key)
             
-            if hasattr(current_attr, '__dict__') and current_attr is not None and isinstance(value, dict):
+            if isinstance(value, dict) and value.get("_class_name") == "Card":
+                # Cards are shared immutable objects: replace, never update in place
+                try:
+                    setattr(instance, key, card_from_dict(value))
+                except Exception as e:
+                    print(f"Error reconstructing Card: {e}")
+                    setattr(instance, key, value)
+
+            elif hasattr(current_attr, '__dict__') and current_attr is not None and isinstance(value, dict):
                 update_instance_from_dict_optimized(current_attr, value)
             
             elif current_attr is None and isinstance(value, dict):
-                # Try to infer type from _class_name if present
-                if value.get("_class_name") == "Card":
-                    # Reconstruct Card
-                    # Card(color: CardColor, card_type: CardType, value: Optional[int] = None)
-                    # We need to convert string Enums back to Enum objects
-                    try:
-                        color_str = value.get("color")
-                        type_str = value.get("card_type")
-                        val = value.get("value")
-                        
-                        # Find matching Enum
-                        color_enum = next((c for c in CardColor if c.value == color_str), None)
-                        if not color_enum:
-                             # Default or error handling
-                             color_enum = CardColor.RED 
-
-                        type_enum = next((t for t in CardType if t.value == type_str), None)
-                        if not type_enum:
-                             type_enum = CardType.NUMBER
-                        
-                        new_card = Card(color_enum, type_enum, val)
-                        setattr(instance, key, new_card)
-                    except Exception as e:
-                        print(f"Error reconstructing Card: {e}")
-                        setattr(instance, key, value)
-                else:
-                    setattr(instance, key, value)
+                setattr(instance, key, value)
             
             elif (isinstance(current_attr, (list, tuple)) or current_attr is None) and isinstance(value, list):
                 # Handle lists of Cards
@@ -83,15 +73,7 @@ def update_instance_from_dict_optimized(instance, data: dict):
                 for item in value:
                     if isinstance(item, dict) and item.get("_class_name") == "Card":
                          try:
-                            color_str = item.get("color")
-                            type_str = item.get("card_type")
-                            val = item.get("value")
-                            
-                            color_enum = next((c for c in CardColor if c.value == color_str), CardColor.RED)
-                            type_enum = next((t for t in CardType if t.value == type_str), CardType.NUMBER)
-                            
-                            new_card = Card(color_enum, type_enum, val)
-                            new_list.append(new_card)
+                            new_list.append(card_from_dict(item))
                          except:
                             new_list.append(item)
                     else:
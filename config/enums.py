@@ -23,3 +23,10 @@ class PlayerType(Enum):
 class Direction(Enum):
     CLOCKWISE = 1
     COUNTER_CLOCKWISE = -1
+
+class DecisionType(Enum):
+    """Decision points exposed by GameManager.step()."""
+    PLAY_CARD = "Play Card"       # action: a legal Card from hand, or None to draw
+    CHOOSE_COLOR = "Choose Color" # action: CardColor for the Wild being played
+    PLAY_DRAWN = "Play Drawn"     # action: bool, play the card just drawn
+    CHALLENGE = "Challenge"       # action: bool, challenge the +4 just played
@@ -0,0 +1,279 @@
+"""
+Offline transition datasets: generate once, train on them many times.
+
+    python3 dataset.py OUT_DIR --games 100000 --workers 8 --seed 0
+
+plays all-SimpleAI games in worker processes and writes every decision of
+every seat as (state, legal mask, head, action, return) into shards of
+.npy files (OUT_DIR/shard-00000.states.npy, ...), described by meta.json.
+Game g always uses game_seed(seed, g), so a dataset does not depend on the
+worker count. With --endgame-budget N, decisions taken with at most N cards
+left in all hands are labeled by endgame_solver: their return is the solved
+value of the chosen action instead of the game's Monte Carlo outcome.
+DatasetLoader streams shuffled mini-batches from the shards with background
+prefetch threads.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import torch
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.legality import legal_mask
+from backend.utils.logger import game_logger
+from config.enums import PlayerType, DecisionType
+from rl_utils import STATE_DIM, HEADS, COLOR_ORDER, HAND_SLICE, IncrementalStateEncoder
+from train_backend import simple_ai_action, game_reward
+from endgame_solver import EndgameSolver
+from uno_env import HEAD_SLICES, MASK_DIM
+
+# name -> (dtype, per-row shape)
+FIELDS = {
+    "states": (np.int8, (STATE_DIM,)),   # encode_state; every feature is a small integer
+    "masks": (np.bool_, (MASK_DIM,)),    # legal actions, HEAD_SLICES layout
+    "heads": (np.int8, ()),              # index into HEADS
+    "actions": (np.int16, ()),           # head-local action (card kind, 0/1, COLOR_ORDER index)
+    "returns": (np.float32, ()),         # game_reward of the deciding seat (or its solved endgame value)
+}
+META_FILE = "meta.json"
+
+def _shard_path(directory, shard, field):
+    return os.path.join(directory, f"shard-{shard:05d}.{field}.npy")
+
+
+def _init_worker():
+    game_logger.set_profile("simulation")
+
+
+def _generate_shard(args):
+    """Worker: play games [first, first + n) and write them as one shard. Returns (shard, rows, labeled rows)."""
+    directory, shard, seed, first, n, num_players, endgame_budget = args
+    head_ids = {
+        DecisionType.PLAY_CARD: HEADS.index("card"),
+        DecisionType.CHALLENGE: HEADS.index("challenge"),
+        DecisionType.PLAY_DRAWN: HEADS.index("play_drawn"),
+        DecisionType.CHOOSE_COLOR: HEADS.index("color"),
+    }
+    head_masks = [np.zeros(MASK_DIM, dtype=bool) for _ in HEADS]
+    for head_id, head in enumerate(HEADS):
+        head_masks[head_id][HEAD_SLICES[head]] = True
+
+    gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(num_players)])
+    encoder = IncrementalStateEncoder(gm)
+    # Solves on clones, so labeling does not change the games themselves
+    solver = EndgameSolver(card_budget=endgame_budget, reward=game_reward) if endgame_budget else None
+    labeled = 0
+    states, masks, heads, actions, returns = [], [], [], [], []
+    for game_id in range(first, first + n):
+        seats = []
+        decision = gm.reset(seed, game_id=game_id)
+        while decision is not None:
+            action = simple_ai_action(decision, gm.rng)
+            # A PLAY_CARD with nothing legal is a forced draw, not a choice
+            if decision.type != DecisionType.PLAY_CARD or decision.legal_cards:
+                player = decision.player
+                state = encoder.encode(player)
+                head_id = head_ids[decision.type]
+                if decision.type == DecisionType.PLAY_CARD:
+                    mask = np.zeros(MASK_DIM, dtype=bool)
+                    mask[HEAD_SLICES["card"]] = legal_mask(state[HAND_SLICE], gm.deck.peek_discard_pile(),
+                                                           gm.current_color)
+                    local = action.index
+                else:
+                    mask = head_masks[head_id]
+                    local = COLOR_ORDER.index(action) if decision.type == DecisionType.CHOOSE_COLOR else int(action)
+                states.append(state.astype(np.int8))
+                masks.append(mask)
+                heads.append(head_id)
+                actions.append(local)
+                label = None
+                if solver is not None and solver.applies(gm):
+                    label = solver.action_values(gm)[action][player.player_id]
+                    labeled += 1
+                seats.append((player, label))
+            decision = gm.step(action)
+        for player, label in seats:
+            returns.append(label if label is not None else game_reward(gm.winner is player, len(player.hand)))
+
+    columns = {
+        "states": np.stack(states) if states else np.zeros((0, STATE_DIM)),
+        "masks": np.stack(masks) if masks else np.zeros((0, MASK_DIM)),
+        "heads": np.asarray(heads),
+        "actions": np.asarray(actions),
+        "returns": np.asarray(returns),
+    }
+    for field, (dtype, _) in FIELDS.items():
+        np.save(_shard_path(directory, shard, field), columns[field].astype(dtype))
+    return shard, len(heads), labeled
+
+
+def generate(directory, games, seed=0, num_workers=None, games_per_shard=2000, num_players=4,
+             endgame_budget=None):
+    """Generate a dataset of `games` games into directory. Returns its metadata."""
+    os.makedirs(directory, exist_ok=True)
+    num_workers = num_workers or max(1, os.cpu_count() or 1)
+    jobs = [(directory, shard, seed, first, min(games_per_shard, games - first), num_players, endgame_budget)
+            for shard, first in enumerate(range(0, games, games_per_shard))]
+    rows = [0] * len(jobs)
+    labeled = 0
+    start = time.time()
+    if num_workers == 1:
+        previous_profile = game_logger.profile
+        game_logger.set_profile("simulation")
+        try:
+            for shard, n, k in map(_generate_shard, jobs):
+                rows[shard] = n
+                labeled += k
+        finally:
+            game_logger.set_profile(previous_profile)
+    else:
+        with mp.get_context("spawn").Pool(num_workers, initializer=_init_worker) as pool:
+            for shard, n, k in pool.imap_unordered(_generate_shard, jobs):
+                rows[shard] = n
+                labeled += k
+    meta = {
+        "games": games,
+        "seed": seed,
+        "num_players": num_players,
+        "games_per_shard": games_per_shard,
+        "shard_rows": rows,
+        "rows": sum(rows),
+        "endgame_budget": endgame_budget,
+        "endgame_labels": labeled,
+        "seconds": time.time() - start,
+    }
+    # meta.json is written last: a directory without it is an incomplete dataset
+    with open(os.path.join(directory, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class DatasetLoader:
+    """
+    Iterable over shuffled mini-batches of a generated dataset, in the format
+    of train.ReplayBuffer.sample: (states float32, heads long, actions long,
+    returns float32), plus the legal masks when with_masks=True.
+
+    Each epoch visits the shards in a random order, `shuffle_shards` at a
+    time: the rows of those shards are permuted together and cut into batches
+    (leftover rows carry over into the next window). Batches are gathered
+    from the memory-mapped shards by a thread pool that keeps `prefetch`
+    batches in flight, so the next ones are ready while the learner trains.
+    The batch order depends only on `seed`, not on the thread count.
+    """
+
+    def __init__(self, directory, batch_size=4096, shuffle=True, seed=None, num_threads=2, prefetch=8,
+                 shuffle_shards=4, drop_last=True, with_masks=False):
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.num_threads = num_threads
+        self.prefetch = max(1, prefetch)
+        self.shuffle_shards = max(1, shuffle_shards)
+        self.drop_last = drop_last
+        self.with_masks = with_masks
+        rows = self.meta["shard_rows"]
+        # Global row id -> shard via the cumulative row counts
+        self._starts = np.concatenate([[0], np.cumsum(rows)]).astype(np.int64)
+        self._arrays = [self._load(s) if n else None for s, n in enumerate(rows)]
+
+    def __len__(self):
+        """Batches per epoch."""
+        rows = self.meta["rows"]
+        return rows // self.batch_size if self.drop_last else -(-rows // self.batch_size)
+
+    def _load(self, shard):
+        return {field: np.load(_shard_path(self.directory, shard, field), mmap_mode="r") for field in FIELDS}
+
+    def _plan(self):
+        """Yield the global row ids of each batch of one epoch."""
+        shards = [s for s, n in enumerate(self.meta["shard_rows"]) if n]
+        if self.shuffle:
+            shards = [shards[i] for i in self.rng.permutation(len(shards))]
+        carry = np.empty(0, dtype=np.int64)
+        for w in range(0, len(shards), self.shuffle_shards):
+            ids = np.concatenate([carry] + [np.arange(self._starts[s], self._starts[s + 1])
+                                            for s in shards[w:w + self.shuffle_shards]])
+            if self.shuffle:
+                ids = ids[self.rng.permutation(len(ids))]
+            full = len(ids) - len(ids) % self.batch_size
+            for lo in range(0, full, self.batch_size):
+                yield ids[lo:lo + self.batch_size]
+            carry = ids[full:]
+        if len(carry) and not self.drop_last:
+            yield carry
+
+    def _gather(self, ids):
+        # Sorted ids read each mapped shard front to back; rows inside a batch need no order
+        ids = np.sort(ids)
+        shard_of = np.searchsorted(self._starts, ids, side="right") - 1
+        parts = {field: [] for field in FIELDS}
+        for shard in np.unique(shard_of):
+            local = ids[shard_of == shard] - self._starts[shard]
+            arrays = self._arrays[shard]
+            for field in FIELDS:
+                parts[field].append(arrays[field][local])
+        cols = {field: np.concatenate(p) for field, p in parts.items()}
+        batch = (torch.from_numpy(cols["states"].astype(np.float32)),
+                 torch.from_numpy(cols["heads"].astype(np.int64)),
+                 torch.from_numpy(cols["actions"].astype(np.int64)),
+                 torch.from_numpy(cols["returns"]))
+        if self.with_masks:
+            batch += (torch.from_numpy(cols["masks"]),)
+        return batch
+
+    def __iter__(self):
+        if self.num_threads == 0:
+            for ids in self._plan():
+                yield self._gather(ids)
+            return
+        pending = deque()
+        with ThreadPoolExecutor(self.num_threads) as pool:
+            try:
+                for ids in self._plan():
+                    pending.append(pool.submit(self._gather, ids))
+                    if len(pending) >= self.prefetch:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Early exit (break / error): drop batches not started yet
+                for future in pending:
+                    future.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate an offline UNO transition dataset")
+    parser.add_argument("out_dir")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--games-per-shard", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--endgame-budget", type=int, default=None,
+                        help="label decisions with at most this many cards in hands by the endgame solver")
+    args = parser.parse_args()
+    meta = generate(args.out_dir, args.games, seed=args.seed, num_workers=args.workers,
+                    games_per_shard=args.games_per_shard, num_players=args.players,
+                    endgame_budget=args.endgame_budget)
+    print(f"Wrote {meta['rows']} transitions from {meta['games']} games in {len(meta['shard_rows'])} shards "
+          f"({meta['games'] / max(meta['seconds'], 1e-9):.0f} games/sec)")
+    if meta["endgame_labels"]:
+        print(f"{meta['endgame_labels']} transitions labeled by the endgame solver")
+
+
+if __name__ == "__main__":
+    main()
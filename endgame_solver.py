@@ -0,0 +1,260 @@
+"""
+Exact endgame solver: expectimax over the draws of positions with few cards in hand.
+
+Decision nodes take the action that is best for the deciding seat (max-n), and
+every step that draws is a chance node. The draw pile is shuffled lazily
+(backend/deck.py), so each draw is uniform over the cards left in it. The
+solver enumerates the outcomes by replaying the step on a clone whose deck
+RNG is scripted to pick each kind in turn. Cards drawn in one step all go to
+the same hand, so only their multiset is enumerated, weighted by its number
+of orderings. Values are expected rewards per seat (win = 1 by default),
+memoized in an LRU-bounded transposition table keyed by
+GameManager.state_hash().
+
+The search stays within budgets: a line that puts more than `card_budget`
+cards in hands, or draws in more than `max_draws` steps, is cut and scored by
+`leaf_value` (by default a hand-size heuristic). Positions whose lines all end
+within the budgets are solved exactly. The solver sees every hand;
+EndgameSolver.oracle_action can instead average the solutions of `samples`
+determinizations of the decider's information set, for play that does not peek.
+
+As an oracle for the RL seat, set RLAgentHandler.endgame_solver; as a labeler,
+`dataset.py --endgame-budget N` writes solved action values as the returns of
+the decisions it can solve.
+"""
+
+import math
+import random
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from backend.game_manager import GameManager
+from mcts_agent import determinize, legal_actions
+
+
+def win_reward(won: bool, cards_left: int) -> float:
+    return 1.0 if won else 0.0
+
+
+def cards_in_hands(game: GameManager) -> int:
+    return sum(len(p.hand) for p in game.players)
+
+
+class _NeedDraw(Exception):
+    """A scripted step drew past the end of its script."""
+
+
+class _ScriptedRandom:
+    """Deck RNG stand-in: returns the scripted draw positions, then defers to fallback or raises _NeedDraw."""
+
+    def __init__(self, script, fallback=None):
+        self.script = script
+        self.fallback = fallback
+        self.calls = 0
+
+    def random(self):
+        i = self.calls
+        self.calls += 1
+        if i < len(self.script):
+            return self.script[i]
+        if self.fallback is None:
+            raise _NeedDraw()
+        return self.fallback.random()
+
+
+def _orderings(script) -> int:
+    """Draw orders of the multisets in script, one multiset per run drawn from the same pile."""
+    total = 1
+    run = Counter()
+    prev_n = None
+    for _, kind, n in script:
+        if prev_n is not None and n != prev_n - 1:
+            # The pile was refilled from the discard pile: a new run starts
+            total *= _multinomial(run)
+            run = Counter()
+        run[kind] += 1
+        prev_n = n
+    return total * _multinomial(run)
+
+
+def _multinomial(counts: Counter) -> int:
+    result = math.factorial(sum(counts.values()))
+    for m in counts.values():
+        result //= math.factorial(m)
+    return result
+
+
+class EndgameSolver:
+    """
+    card_budget: most cards in all hands a line may reach before it is cut.
+    table_size: transposition table entries (least recently used evicted first).
+    reward: fn(won, cards_left) -> terminal value of one seat, e.g. train_backend.game_reward.
+    leaf_value: fn(game) -> per-seat values of a cut position (default: hand_size_leaf).
+    max_draws: drawing steps (chance nodes) per line before it is cut. Each one multiplies
+        the tree by up to ~50 outcomes (far more for penalty draws): 2 can take minutes.
+    max_depth: steps per line before it is cut (guards against draw/refill cycles).
+    samples, rng: oracle_action settings, see there.
+    """
+
+    def __init__(self, card_budget: int = 6, table_size: int = 1 << 18,
+                 reward: Callable[[bool, int], float] = win_reward,
+                 leaf_value: Optional[Callable[[GameManager], Tuple[float, ...]]] = None,
+                 max_draws: int = 1, max_depth: int = 60, samples: int = 0, rng: Optional[random.Random] = None):
+        self.card_budget = card_budget
+        self.table_size = table_size
+        self.reward = reward
+        self.leaf_value = leaf_value if leaf_value is not None else self.hand_size_leaf
+        self.max_draws = max_draws
+        self.max_depth = max_depth
+        # Stands in for the cards of steps that are cut instead of enumerated
+        self._probe_random = random.Random(0)
+        self.samples = samples
+        self.rng = rng if rng is not None else random.Random()
+        self._table = OrderedDict()
+        self._path = set()
+        self.nodes = 0
+        self.table_hits = 0
+        self.cuts = 0
+
+    def applies(self, gm: GameManager) -> bool:
+        """The position is within the card budget and waits for a decision."""
+        return gm.pending_decision() is not None and cards_in_hands(gm) <= self.card_budget
+
+    def hand_size_leaf(self, game: GameManager) -> Tuple[float, ...]:
+        """Heuristic for cut lines: win chances proportional to 1 / (1 + cards in hand)^2."""
+        sizes = [len(p.hand) for p in game.players]
+        weights = [1.0 / (1 + s) ** 2 for s in sizes]
+        total = sum(weights)
+        return tuple(w / total * self.reward(True, 0) + (1 - w / total) * self.reward(False, s)
+                     for w, s in zip(weights, sizes))
+
+    def value(self, gm: GameManager) -> Tuple[float, ...]:
+        """Expected reward of every seat under best play by all."""
+        return self._value(gm, 0, self.max_draws)
+
+    def action_values(self, gm: GameManager) -> Dict[object, Tuple[float, ...]]:
+        """{step() action: expected reward per seat} for the pending decision."""
+        key = gm.state_hash()
+        self._path.add(key)
+        try:
+            return self._action_values(gm, 0, self.max_draws)
+        finally:
+            self._path.discard(key)
+
+    def best_action(self, gm: GameManager):
+        """Best action of the pending decision, solved on the true state (all hands visible)."""
+        seat = gm.pending_decision().player.player_id
+        values = self.action_values(gm)
+        return max(values, key=lambda a: values[a][seat])
+
+    def oracle_action(self, gm: GameManager):
+        """
+        Action for the deciding seat. With samples == 0 the true state is solved; otherwise
+        action values are averaged over `samples` determinizations of the hidden cards.
+        """
+        decision = gm.pending_decision()
+        actions = legal_actions(decision)
+        if len(actions) == 1:
+            return actions[0]
+        if not self.samples:
+            return self.best_action(gm)
+        seat = decision.player.player_id
+        totals = dict.fromkeys(actions, 0.0)
+        for _ in range(self.samples):
+            values = self.action_values(determinize(gm, seat, self.rng))
+            for action in actions:
+                totals[action] += values[action][seat]
+        return max(actions, key=totals.__getitem__)
+
+    def stats(self):
+        return {"nodes": self.nodes, "table_hits": self.table_hits, "cuts": self.cuts,
+                "table_entries": len(self._table)}
+
+    def _leaf(self, game: GameManager) -> Tuple[float, ...]:
+        self.cuts += 1
+        if game.game_over:
+            return tuple(self.reward(p is game.winner, len(p.hand)) for p in game.players)
+        return self.leaf_value(game)
+
+    def _value(self, game: GameManager, depth: int, draws_left: int) -> Tuple[float, ...]:
+        if game.game_over:
+            return tuple(self.reward(p is game.winner, len(p.hand)) for p in game.players)
+        state = game.state_hash()
+        key = (state, draws_left)
+        table = self._table
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+            self.table_hits += 1
+            return value
+        if depth >= self.max_depth or state in self._path:
+            # Depends on the path, not only the state: not stored
+            return self._leaf(game)
+        self.nodes += 1
+        if cards_in_hands(game) > self.card_budget:
+            value = self._leaf(game)
+        else:
+            seat = game.pending_decision().player.player_id
+            self._path.add(state)
+            try:
+                values = self._action_values(game, depth, draws_left)
+            finally:
+                self._path.discard(state)
+            value = max(values.values(), key=lambda v: v[seat])
+        table[key] = value
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+        return value
+
+    def _action_values(self, game: GameManager, depth: int, draws_left: int):
+        values = {}
+        for action in legal_actions(game.pending_decision()):
+            # Probe with arbitrary draws: a step that draws nothing is deterministic, and one
+            # past the budgets is cut, so its exact cards are not needed
+            probe_rng = _ScriptedRandom((), fallback=self._probe_random)
+            probe = game.clone(probe_rng)
+            probe.step(action)
+            if probe_rng.calls == 0:
+                values[action] = self._value(probe, depth + 1, draws_left)
+            elif draws_left == 0 or cards_in_hands(probe) > self.card_budget:
+                values[action] = self._leaf(probe)
+            else:
+                expected = [0.0] * len(game.players)
+                for prob, child in self._outcomes(game, action):
+                    for i, x in enumerate(self._value(child, depth + 1, draws_left - 1)):
+                        expected[i] += prob * x
+                values[action] = tuple(expected)
+        return values
+
+    def _outcomes(self, game: GameManager, action):
+        """[(probability, resulting game)] of a step(action) that draws, one entry per distinct result."""
+        results = {}
+        # Script entries: (draw position as a random() value, kind drawn, pile size at the draw)
+        stack = [((), 1.0)]
+        while stack:
+            script, prob = stack.pop()
+            child = game.clone(_ScriptedRandom([x for x, _, _ in script]))
+            try:
+                child.step(action)
+            except _NeedDraw:
+                cards = child.deck.cards
+                n = len(cards)
+                # Within one pile, draw kinds in non-decreasing order: one script per multiset
+                low = script[-1][1] if script and script[-1][2] == n + 1 else 0
+                first, count = {}, Counter()
+                for j, card in enumerate(cards):
+                    k = card.index
+                    if k >= low:
+                        count[k] += 1
+                        first.setdefault(k, j)
+                for k, m in count.items():
+                    stack.append((script + (((first[k] + 0.5) / n, k, n),), prob * m / n))
+                continue
+            weight = prob * _orderings(script)
+            key = child.state_hash()
+            entry = results.get(key)
+            if entry is None:
+                results[key] = [weight, child]
+            else:
+                entry[0] += weight
+        return [(p, child) for p, child in results.values()]
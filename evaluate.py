@@ -10,17 +10,39 @@ from backend.player import Player
 from config.enums import PlayerType
 from rl_agent import RLAgentHandler
 from train_backend import run_game_epoch
+from backend.utils.logger import game_logger
+from backend.rng import game_seed
+from backend.game_record import GameRecordWriter
+
+# Run seed: game i is always game_seed(EVAL_SEED, i), so results do not depend on how games are split up
+EVAL_SEED = int(os.environ.get("UNO_EVAL_SEED", "0"))
+# Optional directory to record every evaluation game into (see backend/game_record.py)
+RECORD_DIR = os.environ.get("UNO_RECORD_DIR")
+# Inference backend of the RL seat: "numpy" (numpy_model.py) skips importing torch,
+# "torchscript" plays the int8 module written by quantized_model.py
+BACKEND = os.environ.get("UNO_BACKEND", "torch")
 
 def evaluate():
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     print("Starting Evaluation...")
     model_path = "uno_rl_model.pth"
+    if BACKEND == "numpy" and os.path.exists("uno_rl_model.npz"):
+        model_path = "uno_rl_model.npz"
+    elif BACKEND == "torchscript":
+        model_path = "uno_rl_model_int8.pt"
+        if not os.path.exists(model_path):
+            # An int8 module only comes from converting trained weights: there is no random one to fall back to
+            print(f"Model {model_path} not found! Convert the float model first: "
+                  f"python3 quantized_model.py uno_rl_model.pth {model_path}")
+            sys.exit(1)
     # Even if model doesn't exist, we might evaluate the initialized random model if user wants base check.
     # But usually eval implies trained model.
     if not os.path.exists(model_path):
         print(f"Model {model_path} not found! EVALUATING RANDOM MODEL.")
-        agent = RLAgentHandler(None)
+        agent = RLAgentHandler(None, backend=BACKEND)
     else:
-        agent = RLAgentHandler(model_path)
+        agent = RLAgentHandler(model_path, backend=BACKEND)
     
     agent.is_train = False # Evaluation mode
     
@@ -33,24 +55,31 @@ def evaluate():
     wins = 0
     
     start_t = time.time()
-    print(f"Running {total_games} games...")
+    print(f"Running {total_games} games (seed {EVAL_SEED})...")
+    # One pooled game, reset in place by run_game_epoch for every game
+    p1 = Player(0, "RL", PlayerType.RL)
+    p2 = Player(1, "S1", PlayerType.AI)
+    p3 = Player(2, "S2", PlayerType.AI)
+    p4 = Player(3, "S3", PlayerType.AI)
+    gm = GameManager([p1, p2, p3, p4])
+    if RECORD_DIR:
+        gm.recorder = GameRecordWriter(RECORD_DIR)
     for i in range(total_games):
-        p1 = Player(0, "RL", PlayerType.RL)
-        p2 = Player(1, "S1", PlayerType.AI)
-        p3 = Player(2, "S2", PlayerType.AI)
-        p4 = Player(3, "S3", PlayerType.AI)
-        gm = GameManager([p1, p2, p3, p4])
-        
-        won = run_game_epoch(gm, agent)
+        won = run_game_epoch(gm, agent, seed=game_seed(EVAL_SEED, i))
         if won: wins += 1
         
         if (i+1) % 1000 == 0:
             print(f"Game {i+1}/{total_games}. Current Rate: {wins/(i+1):.2%}")
+    if gm.recorder is not None:
+        gm.recorder.close()
+        print(f"Recorded {gm.recorder.games_written} games to {RECORD_DIR}")
             
     rate = wins / total_games
     t_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
     
     print(f"Evaluation Complete. Rate: {rate:.2%}")
+    cache = agent.cache_stats()
+    print(f"Decision cache: {cache['hits']} hits / {cache['misses']} misses ({cache['hits'] / total_games:.2f} forward passes saved per game)")
     with open(log_file, 'a', newline='') as f:
         csv.writer(f).writerow([t_str, rate, total_games])
 
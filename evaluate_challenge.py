@@ -9,8 +9,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from rl_agent import RLAgentHandler
 from train_challenge_backend import ChallengeBackend
+from backend.utils.logger import game_logger
 
 def main():
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     print("Starting Evaluation (10000 games)...")
     
     model_path = "challenge_model_latest.pth"
@@ -0,0 +1,165 @@
+import time
+import queue
+import threading
+import numpy as np
+import torch
+from concurrent.futures import Future
+
+from rl_utils import STATE_DIM, HEADS
+
+
+class Histogram:
+    """Fixed-bucket histogram. bucket i counts values in [edges[i-1], edges[i]); the last bucket is open-ended."""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def add(self, values):
+        idx = np.searchsorted(self.edges, np.atleast_1d(values), side="right")
+        with self._lock:
+            np.add.at(self.counts, idx, 1)
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (approximate)."""
+        total = self.counts.sum()
+        if total == 0:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.counts), total * q / 100.0))
+        return float(self.edges[min(i, len(self.edges) - 1)])
+
+    def to_dict(self):
+        return {
+            "edges": self.edges.tolist(),
+            "counts": self.counts.tolist(),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+        }
+
+
+class InferenceServer:
+    """
+    Batches UNOAgent forward passes across many concurrent callers.
+
+    Callers (game loops in different threads, usually through
+    RLAgentHandler) submit single encoded states. A background thread
+    gathers pending requests until max_batch is reached or the oldest one
+    has waited max_wait_ms, runs one batched forward pass and routes each
+    row of every head back to its caller's Future.
+    """
+
+    def __init__(self, model, max_batch=256, max_wait_ms=2.0):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._thread = None
+        self._running = False
+        # Set by stop(); submit() checks it under the lock, so no request is queued after the final drain
+        self._stopped = False
+        self._submit_lock = threading.Lock()
+        self._buffer = np.zeros((max_batch, STATE_DIM), dtype=np.float32)
+
+        # Latency in microseconds (log-spaced), batch occupancy as fraction of max_batch
+        self.latency_hist = Histogram(np.geomspace(10, 1e6, 31))
+        self.occupancy_hist = Histogram(np.linspace(0.1, 1.0, 10))
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        if self._thread is None:
+            with self._submit_lock:
+                self._stopped = False
+            self._running = True
+            self._thread = threading.Thread(target=self._serve, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._submit_lock:
+            self._stopped = True
+        self._running = False
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+        # Requests the serve loop did not reach (queued behind its last batch) fail instead of hanging
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("InferenceServer stopped"))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, state_vec) -> Future:
+        """Queue one encoded state. The Future resolves to {head: 1-D numpy array}."""
+        fut = Future()
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError("InferenceServer stopped")
+            self._requests.put((np.asarray(state_vec, dtype=np.float32), fut, time.perf_counter()))
+        return fut
+
+    def infer(self, state_vec):
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(state_vec).result()
+
+    def _collect(self):
+        first = self._requests.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _serve(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            n = len(batch)
+            for i, (state, _, _) in enumerate(batch):
+                self._buffer[i] = state
+            try:
+                with torch.no_grad():
+                    outputs = self.model(torch.from_numpy(self._buffer[:n]))
+                heads = {h: outputs[h].numpy() for h in HEADS}
+            except Exception as e:
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for i, (_, fut, t0) in enumerate(batch):
+                fut.set_result({h: heads[h][i].copy() for h in HEADS})
+            self.latency_hist.add([(done - t0) * 1e6 for _, _, t0 in batch])
+            self.occupancy_hist.add(n / self.max_batch)
+            self.batches += 1
+            self.requests += n
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "latency_us": self.latency_hist.to_dict(),
+            "batch_occupancy": self.occupancy_hist.to_dict(),
+        }
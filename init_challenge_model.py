@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from rl_model import UNOAgent
 from rl_agent import RLAgentHandler
 from train_challenge_backend import ChallengeBackend
+from backend.utils.logger import game_logger
 
 def init_weights(m):
     if isinstance(m, nn.Linear):
@@ -18,6 +19,8 @@ def init_weights(m):
              m.bias.data.fill_(0.01)
 
 def main():
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     print("Initializing Model for +4 Challenge Training...")
     model = UNOAgent()
     model.apply(init_weights)
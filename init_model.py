@@ -12,8 +12,11 @@ from backend.player import Player
 from config.enums import PlayerType
 from rl_agent import RLAgentHandler
 from train_backend import run_game_epoch
+from backend.utils.logger import game_logger
 
 def init_and_verify():
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     print("Initializing UNO RL Model Parameters...")
     model = UNOAgent()
     
@@ -49,13 +52,13 @@ def init_and_verify():
     # No, we want to measure average performance.
     
     print(f"Running {total} games against SimpleAI (First-Card Strategy)...")
+    # One pooled game, reset in place by run_game_epoch for every game
+    p1 = Player(0, "RL", PlayerType.RL)
+    p2 = Player(1, "S1", PlayerType.AI)
+    p3 = Player(2, "S2", PlayerType.AI)
+    p4 = Player(3, "S3", PlayerType.AI)
+    gm = GameManager([p1, p2, p3, p4])
     for i in range(total):
-        p1 = Player(0, "RL", PlayerType.RL)
-        p2 = Player(1, "S1", PlayerType.AI)
-        p3 = Player(2, "S2", PlayerType.AI)
-        p4 = Player(3, "S3", PlayerType.AI)
-        gm = GameManager([p1, p2, p3, p4])
-        
         if run_game_epoch(gm, agent):
             wins += 1
             
@@ -0,0 +1,360 @@
+"""
+Information-set Monte Carlo tree search (SO-ISMCTS) agent.
+
+Every search iteration samples a determinization of the root game: the
+observer's hand and all public information (discard pile, top card, active
+color, hand sizes, direction, turn) are kept, while the opponents' hands and
+the draw pile are redealt from the cards the observer has not seen. The
+iteration then walks one shared tree with that game (a clone, so the real
+game is never touched), expands one node and finishes the game with SimpleAI
+rollouts. Children also count how often they were available, since which
+moves are legal depends on the determinization. Optional UNOAgent priors
+switch node selection from UCB1 to PUCT.
+
+    python3 mcts_agent.py --games 100 --iterations 400 --workers 4
+
+plays one MCTS seat against SimpleAI bots and reports the win rate and
+nodes/sec. With num_workers > 1 the search is root-parallel: every worker
+process builds its own tree from its own determinizations and the root
+statistics are summed.
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import argparse
+import numpy as np
+import multiprocessing as mp
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.rng import game_seed
+from backend.utils.logger import game_logger
+from config.enums import PlayerType, DecisionType
+from rl_agent import RLAgentHandler
+from numpy_model import NumpyUNOAgent
+from rl_utils import COLOR_ORDER, STATE_DIM
+from train_backend import simple_ai_action
+
+# A rollout that has not finished after this many steps (both piles exhausted) counts as no win
+MAX_ROLLOUT_STEPS = 2000
+# encode_state has one opponent hand size per other seat, so the UNOAgent input fixes the player count
+PRIOR_PLAYERS = STATE_DIM - (54 + 54 + 4 + 1) + 1
+
+
+def determinize(gm: GameManager, observer: int, rng: random.Random) -> GameManager:
+    """
+    Clone gm, redealing the hidden cards as seen from seat `observer`: the cards of
+    every opponent hand and of the draw pile are shuffled together, each opponent gets
+    back as many as it held, and the rest becomes the draw pile. The clone draws from rng.
+    """
+    game = gm.clone(rng)
+    opponents = [p for p in game.players if p.player_id != observer]
+    unseen = list(game.deck.cards)
+    sizes = []
+    for p in opponents:
+        unseen.extend(p.hand)
+        sizes.append(len(p.hand))
+        p.clear_hand()
+    rng.shuffle(unseen)
+    pos = 0
+    for p, size in zip(opponents, sizes):
+        for card in unseen[pos:pos + size]:
+            p.add_card(card)
+        pos += size
+    game.deck.cards = unseen[pos:]
+    game.deck.shuffle()
+    return game
+
+
+def legal_actions(decision):
+    """Distinct step() actions of a decision; a PLAY_CARD with nothing playable can only draw (None)."""
+    if decision.type == DecisionType.PLAY_CARD:
+        return list(dict.fromkeys(decision.legal_cards)) or [None]
+    if decision.type == DecisionType.CHOOSE_COLOR:
+        return list(COLOR_ORDER)
+    return [False, True]
+
+
+def action_priors(handler, game, decision, actions):
+    """Softmax of the UNOAgent head values over `actions`, from the deciding player's view."""
+    outputs, _ = handler._get_vals(decision.player, game)
+    if decision.type == DecisionType.PLAY_CARD:
+        if actions == [None]:
+            return {None: 1.0}
+        vals = outputs["card"][[card.index for card in actions]]
+    elif decision.type == DecisionType.CHOOSE_COLOR:
+        vals = outputs["color"][[COLOR_ORDER.index(c) for c in actions]]
+    else:
+        head = "challenge" if decision.type == DecisionType.CHALLENGE else "play_drawn"
+        vals = outputs[head][[int(a) for a in actions]]
+    probs = np.exp(vals - np.max(vals))
+    probs /= probs.sum()
+    return dict(zip(actions, probs.tolist()))
+
+
+class _Node:
+    """Tree node reached by `action`; value sums the wins of `seat`, the player who chose it."""
+
+    __slots__ = ("seat", "action", "prior", "children", "visits", "avail", "value")
+
+    def __init__(self, seat=None, action=None, prior=1.0):
+        self.seat = seat
+        self.action = action
+        self.prior = prior
+        self.children = {}
+        self.visits = 0
+        self.avail = 0
+        self.value = 0.0
+
+
+class ISMCTS:
+    """
+    Single-process SO-ISMCTS. prior_handler is an RLAgentHandler (incremental_encoding
+    off, since every iteration plays a fresh clone) whose head values become PUCT priors.
+    """
+
+    def __init__(self, exploration=0.7, prior_handler=None, rng=None):
+        self.exploration = exploration
+        self.prior_handler = prior_handler
+        self.rng = rng if rng is not None else random.Random()
+
+    def search(self, gm: GameManager, iterations=None, time_limit=None):
+        """
+        Search the pending decision of gm within the budget (whichever runs out first).
+        Returns ({action: (visits, value)} of the root, iterations, nodes), where nodes
+        counts every game state stepped through, in the tree and in rollouts.
+        """
+        if iterations is None and time_limit is None:
+            raise ValueError("Give an iteration budget, a time limit or both.")
+        if self.prior_handler is not None and len(gm.players) != PRIOR_PLAYERS:
+            raise ValueError(f"UNOAgent priors need a {PRIOR_PLAYERS}-player game, got {len(gm.players)} players.")
+        observer = gm.pending_decision().player.player_id
+        root = _Node()
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        done = nodes = 0
+        while iterations is None or done < iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            nodes += self._iterate(root, determinize(gm, observer, self.rng))
+            done += 1
+        stats = {action: (child.visits, child.value) for action, child in root.children.items()}
+        return stats, done, nodes
+
+    def _iterate(self, root, game):
+        rng = self.rng
+        decision = game.pending_decision()
+        node = root
+        path = []
+        steps = 0
+        # Selection: descend while every available action has been tried, then expand one
+        while decision is not None:
+            actions = legal_actions(decision)
+            children = node.children
+            untried = []
+            for action in actions:
+                child = children.get(action)
+                if child is None:
+                    untried.append(action)
+                else:
+                    child.avail += 1
+            if untried:
+                seat = decision.player.player_id
+                if self.prior_handler is not None:
+                    priors = action_priors(self.prior_handler, game, decision, actions)
+                    action = max(untried, key=priors.__getitem__)
+                    child = _Node(seat, action, priors[action])
+                else:
+                    child = _Node(seat, rng.choice(untried))
+                child.avail = 1
+                children[child.action] = child
+                path.append(child)
+                decision = game.step(child.action)
+                steps += 1
+                break
+            node = self._select([children[a] for a in actions])
+            path.append(node)
+            decision = game.step(node.action)
+            steps += 1
+        # Rollout
+        while decision is not None and steps < MAX_ROLLOUT_STEPS:
+            decision = game.step(simple_ai_action(decision, rng))
+            steps += 1
+        winner = game.winner.player_id if game.winner is not None else None
+        root.visits += 1
+        for child in path:
+            child.visits += 1
+            if child.seat == winner:
+                child.value += 1.0
+        return steps
+
+    def _select(self, children):
+        c = self.exploration
+        if self.prior_handler is not None:
+            return max(children, key=lambda n: n.value / n.visits
+                       + c * n.prior * math.sqrt(n.avail) / (1 + n.visits))
+        return max(children, key=lambda n: n.value / n.visits
+                   + c * math.sqrt(math.log(n.avail) / n.visits))
+
+
+def _prior_handler(state_dict):
+    if state_dict is None:
+        return None
+    # Batch-1 forward passes at every expansion: NumPy is several times faster than torch here
+    handler = RLAgentHandler(None, incremental_encoding=False, backend="numpy")
+    handler.model = NumpyUNOAgent.from_state_dict(state_dict)
+    return handler
+
+
+_worker_search = None
+
+def _init_worker(exploration, prior_state):
+    global _worker_search
+    import torch
+    game_logger.set_profile("simulation")
+    torch.set_num_threads(1)
+    _worker_search = ISMCTS(exploration, _prior_handler(prior_state))
+
+def _search_job(args):
+    """Worker: one root-parallel share of a search. Returns ISMCTS.search's result."""
+    game, iterations, time_limit, seed = args
+    _worker_search.rng.seed(seed)
+    return _worker_search.search(game, iterations, time_limit)
+
+
+class MCTSAgent:
+    """
+    Search-based player for the step API: act(decision, gm) returns the action for
+    gm.step(). The budget is `iterations` visits and/or `time_limit` seconds per
+    decision; decisions with a single legal action are answered without searching.
+    prior_model (a UNOAgent) adds PUCT priors from its head values. num_workers > 1
+    runs root-parallel searches in a process pool (close() it when done).
+    """
+
+    def __init__(self, iterations=400, time_limit=None, exploration=0.7, prior_model=None,
+                 num_workers=0, seed=None):
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.num_workers = num_workers
+        self.rng = random.Random(seed)
+        prior_state = prior_model.state_dict() if prior_model is not None else None
+        self._search = ISMCTS(exploration, _prior_handler(prior_state), rng=self.rng)
+        self._pool = None
+        if num_workers > 1:
+            self._pool = mp.get_context("spawn").Pool(num_workers, initializer=_init_worker,
+                                                      initargs=(exploration, prior_state))
+        self.searches = 0
+        self.total_iterations = 0
+        self.total_nodes = 0
+        self.total_seconds = 0.0
+        self.last_search = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def act(self, decision, gm: GameManager):
+        actions = legal_actions(decision)
+        if len(actions) == 1:
+            return actions[0]
+        return self.search(gm)[0]
+
+    def search(self, gm: GameManager):
+        """Search gm's pending decision. Returns (most visited action, {action: (visits, value)})."""
+        start = time.perf_counter()
+        if self._pool is None:
+            stats, iterations, nodes = self._search.search(gm, self.iterations, self.time_limit)
+        else:
+            # Clones carry no callbacks or listeners, so they pickle cleanly
+            game = gm.clone()
+            share = None if self.iterations is None else -(-self.iterations // self.num_workers)
+            jobs = [(game, share, self.time_limit, self.rng.getrandbits(64)) for _ in range(self.num_workers)]
+            stats, iterations, nodes = {}, 0, 0
+            for part, n, k in self._pool.map(_search_job, jobs):
+                for action, (visits, value) in part.items():
+                    v, w = stats.get(action, (0, 0.0))
+                    stats[action] = (v + visits, w + value)
+                iterations += n
+                nodes += k
+        seconds = time.perf_counter() - start
+        self.searches += 1
+        self.total_iterations += iterations
+        self.total_nodes += nodes
+        self.total_seconds += seconds
+        self.last_search = {"iterations": iterations, "nodes": nodes, "seconds": seconds,
+                            "nodes_per_sec": nodes / max(seconds, 1e-9)}
+        action = max(stats, key=lambda a: stats[a][0])
+        return action, stats
+
+    def search_stats(self):
+        """Totals over all searches; nodes are game states stepped through (tree and rollouts)."""
+        seconds = max(self.total_seconds, 1e-9)
+        return {
+            "searches": self.searches,
+            "iterations": self.total_iterations,
+            "nodes": self.total_nodes,
+            "seconds": self.total_seconds,
+            "iterations_per_sec": self.total_iterations / seconds,
+            "nodes_per_sec": self.total_nodes / seconds,
+        }
+
+
+def play_game(gm: GameManager, agent: MCTSAgent, seat=0, seed=None):
+    """Play one game with `agent` in `seat` and SimpleAI elsewhere. Returns True if the agent won."""
+    decision = gm.reset(seed)
+    while decision is not None:
+        if decision.player.player_id == seat:
+            action = agent.act(decision, gm)
+        else:
+            action = simple_ai_action(decision, gm.rng)
+        decision = gm.step(action)
+    return gm.winner is not None and gm.winner.player_id == seat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the ISMCTS agent against SimpleAI")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=400)
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per decision")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--priors", default=None, help="UNOAgent weights (.pth) used as priors")
+    args = parser.parse_args()
+
+    game_logger.set_profile("simulation")
+    prior_model = None
+    if args.priors:
+        import torch
+        from rl_model import UNOAgent
+        prior_model = UNOAgent()
+        prior_model.load_state_dict(torch.load(args.priors))
+    gm = GameManager([Player(0, "MCTS", PlayerType.AI)] +
+                     [Player(i, f"S{i}", PlayerType.AI) for i in range(1, args.players)])
+    wins = 0
+    with MCTSAgent(args.iterations, args.time_limit, prior_model=prior_model,
+                   num_workers=args.workers, seed=args.seed) as agent:
+        for g in range(args.games):
+            wins += play_game(gm, agent, seed=game_seed(args.seed, g))
+        stats = agent.search_stats()
+    print(f"Win rate {wins / args.games:.2%} over {args.games} games "
+          f"(SimpleAI baseline {1 / args.players:.0%})")
+    print(f"{stats['searches']} searches, {stats['iterations_per_sec']:.0f} iterations/sec, "
+          f"{stats['nodes_per_sec']:.0f} nodes/sec")
+
+
+if __name__ == "__main__":
+    main()
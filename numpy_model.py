@@ -0,0 +1,135 @@
+"""
+NumPy-only inference for UNOAgent.
+
+export_npz writes the UNOAgent weights to a compact .npz: the trunk layers
+pre-transposed to (in, out) float32 matrices, and the four heads fused into one
+128 x 62 matrix, so a forward pass is five matmuls. NumpyUNOAgent runs that
+chain and returns the same {head: values} dict as UNOAgent.forward, without
+importing torch (only converting a .pth needs it).
+
+    python numpy_model.py uno_rl_model.pth uno_rl_model.npz [--half]
+
+RLAgentHandler(path, backend="numpy") plays with it.
+"""
+import os
+import argparse
+import numpy as np
+
+from rl_utils import STATE_DIM, HEADS
+
+TRUNK_LAYERS = ["fc1", "fc2", "fc3", "fc4"]
+TRUNK_SIZES = [STATE_DIM, 512, 512, 256, 128]
+HEAD_LAYERS = {"card": "card_head", "challenge": "challenge_head", "play_drawn": "play_drawn_head", "color": "color_head"}
+HEAD_SIZES = {"card": 54, "challenge": 2, "play_drawn": 2, "color": 4}
+
+
+def _to_numpy(value):
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    return np.asarray(value, dtype=np.float32)
+
+
+def _load_torch_state_dict(path):
+    import torch
+    return torch.load(path, map_location="cpu")
+
+
+def state_dict_to_arrays(state_dict):
+    """UNOAgent state dict (tensors or arrays) -> the arrays stored by export_npz."""
+    arrays = {}
+    for i, name in enumerate(TRUNK_LAYERS):
+        arrays[f"w{i}"] = np.ascontiguousarray(_to_numpy(state_dict[f"{name}.weight"]).T)
+        arrays[f"b{i}"] = _to_numpy(state_dict[f"{name}.bias"])
+    arrays["w_heads"] = np.ascontiguousarray(np.concatenate(
+        [_to_numpy(state_dict[f"{HEAD_LAYERS[h]}.weight"]).T for h in HEADS], axis=1))
+    arrays["b_heads"] = np.concatenate([_to_numpy(state_dict[f"{HEAD_LAYERS[h]}.bias"]) for h in HEADS])
+    arrays["head_sizes"] = np.array([HEAD_SIZES[h] for h in HEADS], dtype=np.int64)
+    return arrays
+
+
+def export_npz(model, path, dtype=np.float32):
+    """
+    Write UNOAgent weights to `path` (.npz). model is a UNOAgent, its state dict,
+    or the path of a saved state dict (.pth). dtype=np.float16 halves the file;
+    the weights are widened back to float32 on load.
+    """
+    if isinstance(model, (str, os.PathLike)):
+        model = _load_torch_state_dict(model)
+    state_dict = model.state_dict() if hasattr(model, "state_dict") else model
+    arrays = state_dict_to_arrays(state_dict)
+    np.savez(path, **{k: v if k == "head_sizes" else v.astype(dtype) for k, v in arrays.items()})
+
+
+class NumpyUNOAgent:
+    """UNOAgent forward pass in NumPy (float32). Inference only."""
+
+    def __init__(self, arrays):
+        self.layers = [(np.asarray(arrays[f"w{i}"], dtype=np.float32), np.asarray(arrays[f"b{i}"], dtype=np.float32))
+                       for i in range(len(TRUNK_LAYERS))]
+        self.w_heads = np.asarray(arrays["w_heads"], dtype=np.float32)
+        self.b_heads = np.asarray(arrays["b_heads"], dtype=np.float32)
+        bounds = np.cumsum([0] + [int(n) for n in arrays["head_sizes"]])
+        self.head_slices = {h: slice(bounds[i], bounds[i + 1]) for i, h in enumerate(HEADS)}
+
+    @classmethod
+    def load(cls, path):
+        """From an export_npz file, or from a torch state dict (.pth, needs torch)."""
+        if str(path).endswith(".npz"):
+            with np.load(path) as data:
+                return cls({k: data[k] for k in data.files})
+        return cls.from_state_dict(_load_torch_state_dict(path))
+
+    @classmethod
+    def from_state_dict(cls, state_dict):
+        return cls(state_dict_to_arrays(state_dict))
+
+    @classmethod
+    def random(cls, rng=None):
+        """Untrained weights, initialized like nn.Linear (uniform within 1/sqrt(fan_in))."""
+        rng = rng if rng is not None else np.random.default_rng()
+        arrays = {}
+
+        def linear(fan_in, fan_out):
+            bound = 1.0 / np.sqrt(fan_in)
+            return (rng.uniform(-bound, bound, (fan_in, fan_out)).astype(np.float32),
+                    rng.uniform(-bound, bound, fan_out).astype(np.float32))
+
+        for i in range(len(TRUNK_LAYERS)):
+            arrays[f"w{i}"], arrays[f"b{i}"] = linear(TRUNK_SIZES[i], TRUNK_SIZES[i + 1])
+        heads = [linear(TRUNK_SIZES[-1], HEAD_SIZES[h]) for h in HEADS]
+        arrays["w_heads"] = np.concatenate([w for w, _ in heads], axis=1)
+        arrays["b_heads"] = np.concatenate([b for _, b in heads])
+        arrays["head_sizes"] = np.array([HEAD_SIZES[h] for h in HEADS], dtype=np.int64)
+        return cls(arrays)
+
+    def trunk(self, x):
+        for w, b in self.layers:
+            x = x @ w
+            x += b
+            np.maximum(x, 0.0, out=x)
+        return x
+
+    def __call__(self, x):
+        """x: one state (STATE_DIM,) or a batch (N, STATE_DIM) -> {head: values}, batched like x."""
+        x = np.asarray(x, dtype=np.float32)
+        out = self.trunk(x)
+        out = out @ self.w_heads
+        out += self.b_heads
+        return {h: out[..., s] for h, s in self.head_slices.items()}
+
+    forward = __call__
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export UNOAgent weights (.pth) to a NumPy .npz")
+    parser.add_argument("model", help="saved UNOAgent state dict (.pth)")
+    parser.add_argument("output", nargs="?", default=None, help="output .npz (default: model path with .npz)")
+    parser.add_argument("--half", action="store_true", help="store float16 weights (half the size)")
+    args = parser.parse_args()
+    output = args.output or os.path.splitext(args.model)[0] + ".npz"
+    export_npz(args.model, output, np.float16 if args.half else np.float32)
+    print(f"Wrote {output} ({os.path.getsize(output) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
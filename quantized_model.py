@@ -0,0 +1,133 @@
+"""
+Int8 CPU inference for UNOAgent: dynamic quantization + frozen TorchScript.
+
+    python quantized_model.py uno_rl_model.pth uno_rl_model_int8.pt [--dataset DIR] [--min-agreement 0.99]
+
+quantize() swaps every nn.Linear (fc1-fc4 and the four heads) for a dynamically
+quantized one (int8 weights, activations quantized per batch), then scripts
+and freezes the model. The saved module returns the same {head: values} dict
+as UNOAgent and is loaded with RLAgentHandler(path, backend="torchscript").
+
+Conversion is gated on accuracy: decision_agreement replays a recorded state
+set (a dataset.py directory, or a small one generated on the fly) through both
+models and compares the best legal action of every decision. Nothing is
+written if the agreement is below --min-agreement.
+"""
+import os
+import sys
+import tempfile
+import argparse
+import warnings
+import torch
+import torch.nn as nn
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rl_model import UNOAgent
+from rl_utils import HEADS
+from uno_env import HEAD_SLICES, MASK_DIM
+from dataset import DatasetLoader, generate
+
+# Legal-action mask blocks of each head, rows in HEADS order
+_HEAD_BLOCKS = torch.zeros((len(HEADS), MASK_DIM), dtype=torch.bool)
+for _i, _head in enumerate(HEADS):
+    _HEAD_BLOCKS[_i, HEAD_SLICES[_head]] = True
+
+
+def quantize(model):
+    """Frozen TorchScript module of `model` with int8 dynamic quantization of every Linear layer."""
+    model = model.eval()
+    with warnings.catch_warnings():
+        # torch.ao.quantization and TorchScript are deprecated in favour of torchao / torch.export,
+        # neither of which produces a module loadable without the model code
+        warnings.simplefilter("ignore")
+        quantized = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        return torch.jit.freeze(torch.jit.script(quantized).eval())
+
+
+def head_values(model, states):
+    """Outputs of every head side by side, (N, MASK_DIM) in the legal-mask layout."""
+    with torch.no_grad():
+        outputs = model(states)
+    return torch.cat([outputs[head] for head in HEADS], dim=1)
+
+
+def decisions(values, heads, masks):
+    """Best legal action of each row as a flat MASK_DIM index (-1 where nothing is legal)."""
+    legal = masks & _HEAD_BLOCKS[heads]
+    best = values.masked_fill(~legal, float("-inf")).argmax(dim=1)
+    return torch.where(legal.any(dim=1), best, torch.full_like(best, -1))
+
+
+def decision_agreement(reference, candidate, dataset_dir, max_rows=None, batch_size=4096):
+    """
+    Compare two models over the decisions of a dataset.py directory. Returns {"rows",
+    "agreement" (share with the same best legal action), "max_abs_diff" (deciding head's values)}.
+    """
+    loader = DatasetLoader(dataset_dir, batch_size=batch_size, shuffle=False, num_threads=0,
+                           drop_last=False, with_masks=True)
+    rows = agree = 0
+    max_diff = 0.0
+    for states, heads, _, _, masks in loader:
+        if max_rows is not None:
+            if rows >= max_rows:
+                break
+            keep = max_rows - rows
+            states, heads, masks = states[:keep], heads[:keep], masks[:keep]
+        ref_values, cand_values = head_values(reference, states), head_values(candidate, states)
+        ref, cand = decisions(ref_values, heads, masks), decisions(cand_values, heads, masks)
+        decided = ref >= 0
+        rows += int(decided.sum())
+        agree += int((ref[decided] == cand[decided]).sum())
+        diff = (ref_values - cand_values).abs().masked_fill(~_HEAD_BLOCKS[heads], 0.0)
+        max_diff = max(max_diff, float(diff.max()))
+    return {"rows": rows, "agreement": agree / rows if rows else 1.0, "max_abs_diff": max_diff}
+
+
+def convert(model, output, dataset_dir=None, min_agreement=0.99, games=200, max_rows=None):
+    """
+    Quantize `model` (a UNOAgent or the path of its .pth), check it with decision_agreement and
+    save it to `output` if it passes. Without dataset_dir, `games` SimpleAI games are recorded
+    first. Returns the agreement report plus "passed".
+    """
+    if isinstance(model, (str, os.PathLike)):
+        state_dict = torch.load(model, map_location="cpu")
+        model = UNOAgent()
+        model.load_state_dict(state_dict)
+    model.eval()
+    quantized = quantize(model)
+    with tempfile.TemporaryDirectory() as tmp:
+        if dataset_dir is None:
+            dataset_dir = tmp
+            generate(tmp, games, seed=0, num_workers=1)
+        report = decision_agreement(model, quantized, dataset_dir, max_rows=max_rows)
+    report["passed"] = report["agreement"] >= min_agreement
+    if report["passed"]:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            torch.jit.save(quantized, output)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert UNOAgent weights to an int8 TorchScript module")
+    parser.add_argument("model", help="saved UNOAgent state dict (.pth)")
+    parser.add_argument("output", nargs="?", default=None, help="output module (default: <model>_int8.pt)")
+    parser.add_argument("--dataset", default=None, help="dataset.py directory of recorded states for the accuracy gate")
+    parser.add_argument("--games", type=int, default=200, help="games to record when --dataset is not given")
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--min-agreement", type=float, default=0.99,
+                        help="least fraction of decisions that must match the float model")
+    args = parser.parse_args()
+    output = args.output or os.path.splitext(args.model)[0] + "_int8.pt"
+    report = convert(args.model, output, args.dataset, args.min_agreement, args.games, args.max_rows)
+    print(f"Decisions compared: {report['rows']}  agreement: {report['agreement']:.4%}  "
+          f"max |value diff|: {report['max_abs_diff']:.4g}")
+    if not report["passed"]:
+        print(f"Agreement below {args.min_agreement:.2%}: {output} not written.")
+        sys.exit(1)
+    print(f"Wrote {output} ({os.path.getsize(output) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,137 @@
-import torch
 import numpy as np
 import random
+from collections import OrderedDict
 from config.enums import CardColor
-from rl_utils import encode_state, get_card_index, COLOR_ORDER
-from rl_model import UNOAgent
+from rl_utils import encode_state, get_card_index, COLOR_ORDER, IncrementalStateEncoder
+from backend.card import CARD_KINDS
+from backend.legality import legal_mask
 
 class RLAgentHandler:
-    def __init__(self, model_path=None):
-        self.model = UNOAgent()
-        if model_path:
-            self.model.load_state_dict(torch.load(model_path))
-        self.model.eval()
+    def __init__(self, model_path=None, inference_server=None, incremental_encoding=True, cache_size=1 << 14,
+                 backend="torch"):
+        # backend "torch": rl_model.UNOAgent (trainable). "numpy": numpy_model.NumpyUNOAgent,
+        # inference only and without importing torch; model_path may then be a .npz export or a .pth.
+        # "torchscript": an int8 module written by quantized_model.py, inference only.
+        if backend not in ("torch", "numpy", "torchscript"):
+            raise ValueError(f"Unknown backend {backend!r}")
+        self.backend = backend
+        if backend == "numpy":
+            from numpy_model import NumpyUNOAgent
+            self.model = NumpyUNOAgent.load(model_path) if model_path else NumpyUNOAgent.random()
+        elif backend == "torchscript":
+            if not model_path:
+                raise ValueError("The torchscript backend needs a module converted by quantized_model.py")
+            import torch
+            import warnings
+            with warnings.catch_warnings():
+                # TorchScript loading is deprecated (FutureWarning) but still supported
+                warnings.simplefilter("ignore", FutureWarning)
+                self.model = torch.jit.load(model_path, map_location="cpu")
+            self._torch = torch
+        else:
+            import torch
+            from rl_model import UNOAgent
+            self.model = UNOAgent()
+            if model_path:
+                self.model.load_state_dict(torch.load(model_path))
+            self.model.eval()
+            self._torch = torch
         self.is_train = False
         self.history = []
+        # Optional InferenceServer: decisions are batched with other games instead of batch-1 forwards
+        self.inference_server = inference_server
+        # Forward passes keyed by GameManager.observation_hash: select_card -> select_color (or
+        # should_play_drawn -> select_color) query the same state, and positions recur across
+        # games. A hit skips encoding as well. LRU-bounded; cleared when the weights change.
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_games = 0
+        # Maintain state vectors in place (IncrementalStateEncoder) instead of calling encode_state
+        self.incremental_encoding = incremental_encoding
+        self._encoder = None
+        # Optional endgame_solver.EndgameSolver: positions within its card budget are played
+        # by the solver instead of the network (see train_backend.rl_action; not added to history)
+        self.endgame_solver = None
         
     def clear_history(self):
         self.history = []
+        if self.is_train:
+            # Training updates the weights between games
+            self.invalidate_cache()
+        self.cache_games += 1
+
+    def invalidate_cache(self):
+        """Drop the cached forward passes (call after changing model weights)."""
+        self._cache.clear()
+
+    def cache_stats(self):
+        """Hit/miss counters of the forward-pass cache; hits are forward passes saved."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / total if total else 0.0,
+            "saved_per_game": self.cache_hits / self.cache_games if self.cache_games else 0.0,
+        }
+
+    def _encode(self, player, game_manager):
+        if not self.incremental_encoding:
+            return encode_state(player, game_manager)
+        if self._encoder is None or self._encoder.game_manager is not game_manager:
+            self._encoder = IncrementalStateEncoder(game_manager)
+        return self._encoder.encode(player)
 
     def _get_vals(self, player, game_manager):
-        state_vec = encode_state(player, game_manager)
-        state_tensor = torch.tensor(state_vec, dtype=torch.float32).unsqueeze(0)
-        with torch.no_grad():
-            outputs = self.model(state_tensor)
-        return outputs, state_tensor
+        """
+        Returns ({head: 1-D numpy values}, state of shape (1, STATE_DIM)): a tensor with the
+        torch backend, an array with the numpy one.
+        """
+        key = game_manager.observation_hash(player)
+        cache = self._cache
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+        self.cache_misses += 1
 
-    def select_card(self, player, game_manager, legal_cards):
+        # The encoder buffer is reused, so the stored state gets its own copy
+        state = self._encode(player, game_manager).copy()[None]
+        state_tensor = state if self.backend == "numpy" else self._torch.from_numpy(state)
+        if self.inference_server is not None:
+            outputs = self.inference_server.infer(state[0])
+        elif self.backend == "numpy":
+            outputs = self.model(state[0])
+        else:
+            with self._torch.no_grad():
+                outputs = {head: out.squeeze(0).numpy() for head, out in self.model(state_tensor).items()}
+
+        entry = cache[key] = (outputs, state_tensor)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return entry
+
+    def select_card(self, player, game_manager, legal_cards=None):
+        """
+        Pick a card to play. legal_cards restricts the choice; by default every
+        legal card in hand is a candidate, found with one legality-table lookup.
+        """
         outputs, state_tensor = self._get_vals(player, game_manager)
         # Use raw logits (Q-values), no Sigmoid
-        card_vals = outputs["card"].squeeze(0).numpy()
+        card_vals = outputs["card"]
         
-        candidates = {} 
-        for c in legal_cards:
-            idx = get_card_index(c)
-            if idx not in candidates: candidates[idx] = []
-            candidates[idx].append(c)
+        if legal_cards is None:
+            # Hand block of the encoded state is the count vector the mask needs
+            mask = legal_mask(np.asarray(state_tensor[0, :54]),
+                              game_manager.deck.peek_discard_pile(),
+                              game_manager.current_color)
+        else:
+            mask = np.zeros(54, dtype=bool)
+            mask[[get_card_index(c) for c in legal_cards]] = True
             
-        valid_indices = list(candidates.keys())
+        valid_indices = np.flatnonzero(mask)
         scores = card_vals[valid_indices] # These can be negative now
         
         if len(scores) == 0: return None 
@@ -66,12 +162,13 @@ class RLAgentHandler:
                  "action": int(chosen_type_idx)
              })
 
-        return candidates[chosen_type_idx][0]
+        # Cards are interned, so the kind is the card object held in hand
+        return CARD_KINDS[chosen_type_idx]
 
     def select_color(self, player, game_manager):
         outputs, state_tensor = self._get_vals(player, game_manager)
         # Use raw logits
-        color_vals = outputs["color"].squeeze(0).numpy()
+        color_vals = outputs["color"]
         
         scores = color_vals
         
@@ -104,7 +201,7 @@ class RLAgentHandler:
     def should_challenge(self, player, game_manager):
         outputs, state_tensor = self._get_vals(player, game_manager)
         # Use raw logits
-        chal_vals = outputs["challenge"].squeeze(0).numpy()
+        chal_vals = outputs["challenge"]
         
         scores = chal_vals
         if self.is_train:
@@ -142,7 +239,7 @@ class RLAgentHandler:
         Testing: Argmax (Challenge if prob >= 0.5).
         """
         outputs, state_tensor = self._get_vals(player, game_manager)
-        chal_vals = outputs["challenge"].squeeze(0).numpy()
+        chal_vals = outputs["challenge"]
         
         # Calculate probabilities via Softmax
         exp_scores = np.exp(chal_vals - np.max(chal_vals))
@@ -170,7 +267,7 @@ class RLAgentHandler:
     def should_play_drawn(self, player, game_manager, card):
         outputs, state_tensor = self._get_vals(player, game_manager)
         # Use raw logits
-        pd_vals = outputs["play_drawn"].squeeze(0).numpy()
+        pd_vals = outputs["play_drawn"]
         
         scores = pd_vals
         if self.is_train:
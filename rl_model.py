@@ -20,15 +20,21 @@ class UNOAgent(nn.Module):
         self.play_drawn_head = nn.Linear(128, 2) # [No, Yes] values
         self.color_head = nn.Linear(128, 4) # [R, B, G, Y] values
 
-    def forward(self, x):
+    def trunk(self, x):
+        """Shared 4-layer body; its output feeds every head."""
         x = torch.relu(self.fc1(x))
         x = torch.relu(self.fc2(x))
         x = torch.relu(self.fc3(x))
         x = torch.relu(self.fc4(x))
-        
+        return x
+
+    def heads(self, x):
         return {
             "card": self.card_head(x),
             "challenge": self.challenge_head(x),
             "play_drawn": self.play_drawn_head(x),
             "color": self.color_head(x)
         }
+
+    def forward(self, x):
+        return self.heads(self.trunk(x))
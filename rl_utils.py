@@ -1,4 +1,3 @@
-import torch
 import numpy as np
 from config.enums import CardColor, CardType, Direction
 
@@ -16,33 +15,9 @@ def get_card_index(card):
     ...
     52: Wild
     53: Wild Draw 4
+    The index is precomputed on the interned Card (see backend.card).
     """
-    if card.card_type == CardType.WILD:
-        return 52
-    if card.card_type == CardType.WILD_DRAW_FOUR:
-        return 53
-    
-    # Color base
-    c_idx = -1
-    if card.color == CardColor.RED: c_idx = 0
-    elif card.color == CardColor.BLUE: c_idx = 1
-    elif card.color == CardColor.GREEN: c_idx = 2
-    elif card.color == CardColor.YELLOW: c_idx = 3
-    
-    if c_idx == -1: return 52 # Fallback
-    
-    offset = c_idx * 13
-    
-    if card.card_type == CardType.NUMBER:
-        return offset + card.value
-    elif card.card_type == CardType.SKIP:
-        return offset + 10
-    elif card.card_type == CardType.REVERSE:
-        return offset + 11
-    elif card.card_type == CardType.DRAW_TWO:
-        return offset + 12
-        
-    return 0
+    return card.index
 
 def encode_state(player, game_manager):
     """
@@ -54,11 +29,8 @@ def encode_state(player, game_manager):
     - Opponent Hand Sizes (3): Relative to current player.
     - Direction (1): 1 or -1.
     """
-    # 1. Hand
-    hand_feats = np.zeros(54, dtype=np.float32)
-    for card in player.hand:
-        idx = get_card_index(card)
-        hand_feats[idx] += 1
+    # 1. Hand: the player's own count vector
+    hand_feats = player.counts
         
     # 2. Top Card
     top_feats = np.zeros(54, dtype=np.float32)
@@ -93,3 +65,67 @@ def encode_state(player, game_manager):
     return np.concatenate([hand_feats, top_feats, color_feats, opp_feats, dir_feat])
 
 STATE_DIM = 54 + 54 + 4 + 3 + 1
+
+# Offsets of the feature blocks inside the state vector
+HAND_SLICE = slice(0, 54)
+TOP_OFFSET = 54
+COLOR_OFFSET = 108
+OPP_OFFSET = 112
+DIR_OFFSET = 115
+
+# Output heads of UNOAgent; position is the head id used in packed trajectories
+HEADS = ["card", "challenge", "play_drawn", "color"]
+
+class IncrementalStateEncoder:
+    """
+    Maintains encode_state vectors in place instead of rebuilding them.
+
+    Each player owns a preallocated STATE_DIM float32 buffer. The hand block
+    is a copy of Player.counts, which the player already keeps per kind; top
+    card, color, opponent hand sizes and direction are O(1) reads refreshed
+    only when they changed. encode() returns the buffer itself (zero-copy),
+    so callers that keep the vector must copy it. Output is bit-identical to
+    encode_state.
+    """
+
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self._buffers = {}
+        self._top = {}
+        self._color = {}
+        for player in game_manager.players:
+            self._buffers[player.player_id] = np.zeros(STATE_DIM, dtype=np.float32)
+            self._top[player.player_id] = -1
+            self._color[player.player_id] = -1
+
+    def encode(self, player):
+        gm = self.game_manager
+        pid = player.player_id
+        buf = self._buffers[pid]
+        buf[HAND_SLICE] = player.counts
+
+        top_card = gm.deck.peek_discard_pile()
+        top_idx = get_card_index(top_card) if top_card else -1
+        if top_idx != self._top[pid]:
+            if self._top[pid] >= 0:
+                buf[TOP_OFFSET + self._top[pid]] = 0
+            if top_idx >= 0:
+                buf[TOP_OFFSET + top_idx] = 1
+            self._top[pid] = top_idx
+
+        cc = gm.current_color
+        color_idx = COLOR_ORDER.index(cc) if cc in COLOR_ORDER else -1
+        if color_idx != self._color[pid]:
+            if self._color[pid] >= 0:
+                buf[COLOR_OFFSET + self._color[pid]] = 0
+            if color_idx >= 0:
+                buf[COLOR_OFFSET + color_idx] = 1
+            self._color[pid] = color_idx
+
+        all_players = gm.players
+        num_p = len(all_players)
+        for i in range(1, num_p):
+            buf[OPP_OFFSET + i - 1] = len(all_players[(pid + i) % num_p].hand)
+
+        buf[DIR_OFFSET] = 1.0 if gm.direction == Direction.CLOCKWISE else -1.0
+        return buf
@@ -0,0 +1,217 @@
+import os
+import sys
+import time
+import queue
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rl_utils import STATE_DIM, HEADS
+
+# Per-slot capacity of RL decisions for one game. Longer games are truncated (counted in stats).
+MAX_STEPS_PER_GAME = 2048
+SLOTS_PER_WORKER = 4
+
+
+def _num_params(model):
+    return sum(p.numel() for p in model.parameters())
+
+def _slot_layout(num_slots, max_steps):
+    """Byte offsets of the arrays packed into one worker's trajectory block."""
+    states = num_slots * max_steps * STATE_DIM * 4
+    heads = num_slots * max_steps
+    actions = num_slots * max_steps * 2
+    return states, heads, actions
+
+def _attach_slots(buf, num_slots, max_steps):
+    s_bytes, h_bytes, a_bytes = _slot_layout(num_slots, max_steps)
+    states = np.ndarray((num_slots, max_steps, STATE_DIM), dtype=np.float32, buffer=buf, offset=0)
+    heads = np.ndarray((num_slots, max_steps), dtype=np.int8, buffer=buf, offset=s_bytes)
+    actions = np.ndarray((num_slots, max_steps), dtype=np.int16, buffer=buf, offset=s_bytes + h_bytes)
+    return states, heads, actions
+
+
+def _worker_main(worker_id, weights_name, n_params, version, traj_name, max_steps,
+                 free_slots, results, stop_event, seed):
+    """Rollout worker: plays games with a CPU copy of UNOAgent and writes trajectories to shared memory."""
+    import random
+    import torch
+    from backend.game_manager import GameManager
+    from backend.player import Player
+    from backend.rng import game_seed
+    from config.enums import PlayerType
+    from rl_agent import RLAgentHandler
+    from train_backend import run_game_epoch
+    from backend.utils.logger import game_logger
+
+    game_logger.set_profile("simulation")
+    torch.set_num_threads(1)
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    weights_shm = shared_memory.SharedMemory(name=weights_name)
+    traj_shm = shared_memory.SharedMemory(name=traj_name)
+    weights = np.ndarray((n_params,), dtype=np.float32, buffer=weights_shm.buf)
+    states, heads, actions = _attach_slots(traj_shm.buf, SLOTS_PER_WORKER, max_steps)
+
+    agent = RLAgentHandler(None)
+    agent.is_train = True
+    local_version = -1
+    # One pooled game per worker, reset in place by run_game_epoch
+    players = [
+        Player(0, "RL", PlayerType.RL),
+        Player(1, "S1", PlayerType.AI),
+        Player(2, "S2", PlayerType.AI),
+        Player(3, "S3", PlayerType.AI),
+    ]
+    # Engine and SimpleAI randomness: the game's own RNG stream, derived from the worker seed
+    gm = GameManager(players, seed=game_seed(seed, 0))
+
+    try:
+        while not stop_event.is_set():
+            if version.value != local_version:
+                with version.get_lock():
+                    local_version = version.value
+                    flat = torch.from_numpy(weights.copy())
+                torch.nn.utils.vector_to_parameters(flat, agent.model.parameters())
+
+            agent.clear_history()
+            won = bool(run_game_epoch(gm, agent))
+
+            slot = None
+            while slot is None and not stop_event.is_set():
+                try:
+                    slot = free_slots.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if slot is None:
+                break
+
+            steps = agent.history[:max_steps]
+            for i, step in enumerate(steps):
+                states[slot, i] = step["state"].numpy().reshape(-1)
+                heads[slot, i] = HEADS.index(step["head"])
+                actions[slot, i] = step["action"]
+            results.put((worker_id, slot, len(steps), won, len(players[0].hand),
+                         len(agent.history) - len(steps), local_version, gm.seed))
+    finally:
+        del weights, states, heads, actions
+        weights_shm.close()
+        traj_shm.close()
+
+
+class RolloutWorkerPool:
+    """
+    Pool of self-play worker processes feeding the learner.
+
+    Each worker owns its own GameManager and a CPU copy of UNOAgent and runs
+    run_game_epoch in a loop. Finished trajectories are written into a
+    per-worker shared-memory slot block and only (slot, length) crosses the
+    result queue. The learner publishes new weights through a shared flat
+    parameter buffer; workers reload when the version counter changes.
+    """
+
+    def __init__(self, model, num_workers=None, max_steps=MAX_STEPS_PER_GAME, seed=None):
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_steps = max_steps
+        self.seed = seed if seed is not None else int(time.time())
+        self.n_params = _num_params(model)
+
+        self._ctx = mp.get_context("spawn")
+        self._weights_shm = shared_memory.SharedMemory(create=True, size=self.n_params * 4)
+        self._weights = np.ndarray((self.n_params,), dtype=np.float32, buffer=self._weights_shm.buf)
+        self._version = self._ctx.Value("i", 0)
+        self._stop = self._ctx.Event()
+        self._results = self._ctx.Queue()
+
+        block = sum(_slot_layout(SLOTS_PER_WORKER, max_steps))
+        self._traj_shms = []
+        self._slots = []
+        self._free = []
+        self._procs = []
+        for _ in range(self.num_workers):
+            shm = shared_memory.SharedMemory(create=True, size=block)
+            self._traj_shms.append(shm)
+            self._slots.append(_attach_slots(shm.buf, SLOTS_PER_WORKER, max_steps))
+            free = self._ctx.Queue()
+            for s in range(SLOTS_PER_WORKER):
+                free.put(s)
+            self._free.append(free)
+
+        self.stats = {"games": 0, "steps": 0, "truncated_steps": 0, "weight_syncs": 0}
+        self._start_time = None
+        self.broadcast_weights(model)
+
+    def start(self):
+        for wid in range(self.num_workers):
+            p = self._ctx.Process(
+                target=_worker_main,
+                args=(wid, self._weights_shm.name, self.n_params, self._version,
+                      self._traj_shms[wid].name, self.max_steps, self._free[wid],
+                      self._results, self._stop, self.seed + wid),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+        self._start_time = time.time()
+
+    def broadcast_weights(self, model):
+        """Publish the learner's current parameters to all workers."""
+        import torch
+        flat = torch.nn.utils.parameters_to_vector(model.parameters()).detach().cpu().numpy()
+        with self._version.get_lock():
+            self._weights[:] = flat
+            self._version.value += 1
+        self.stats["weight_syncs"] += 1
+
+    def get_game(self, timeout=None):
+        """
+        Block until a worker finishes a game.
+        Returns dict with states [T,116], heads [T], actions [T], won, cards_left, version
+        and seed (the game's 16-byte seed, see GameManager.reset).
+        """
+        wid, slot, n, won, cards_left, truncated, ver, seed = self._results.get(timeout=timeout)
+        states, heads, actions = self._slots[wid]
+        game = {
+            "states": states[slot, :n].copy(),
+            "heads": heads[slot, :n].copy(),
+            "actions": actions[slot, :n].astype(np.int64),
+            "won": won,
+            "cards_left": cards_left,
+            "version": ver,
+            "seed": seed,
+        }
+        self._free[wid].put(slot)
+        self.stats["games"] += 1
+        self.stats["steps"] += n
+        self.stats["truncated_steps"] += truncated
+        return game
+
+    def games_per_sec(self) -> float:
+        if not self._start_time:
+            return 0.0
+        return self.stats["games"] / max(time.time() - self._start_time, 1e-9)
+
+    def close(self):
+        self._stop.set()
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._procs = []
+        # Drop array views before closing the blocks they point into
+        self._slots = []
+        self._weights = None
+        for shm in self._traj_shms + [self._weights_shm]:
+            shm.close()
+            shm.unlink()
+        self._traj_shms = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
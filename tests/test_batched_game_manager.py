@@ -0,0 +1,182 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import Card
+from backend.batched_game_manager import (
+    BatchedGameManager, DECK_SIZE, DECK_COUNTS, NUM_KINDS, DRAW, WILD_DRAW_FOUR,
+    CHALLENGE_NONE, CHALLENGE_SUCCEEDED, CHALLENGE_FAILED,
+)
+from config.enums import PlayerType, CardColor, CardType, Direction
+from rl_utils import get_card_index, COLOR_ORDER
+
+def kind_to_card(kind):
+    """Inverse of get_card_index."""
+    if kind == 52:
+        return Card(CardColor.WILD, CardType.WILD)
+    if kind == 53:
+        return Card(CardColor.WILD, CardType.WILD_DRAW_FOUR)
+    color = COLOR_ORDER[kind // 13]
+    sym = kind % 13
+    if sym < 10:
+        return Card(color, CardType.NUMBER, sym)
+    return Card(color, [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO][sym - 10])
+
+def snapshot_game(bgm, i):
+    """Build a GameManager holding exactly the state of batched game i."""
+    players = [Player(p, f"P{p}", PlayerType.AI) for p in range(bgm.num_players)]
+    gm = GameManager(players)
+    for p, player in enumerate(players):
+        for kind in np.flatnonzero(bgm.hands[i, p]):
+            for _ in range(bgm.hands[i, p, kind]):
+                player.add_card(kind_to_card(kind))
+    gm.deck.cards = [kind_to_card(k) for k in bgm.draw_pile[i, :bgm.draw_size[i]]]
+    gm.deck.discard_pile = [kind_to_card(k) for k in bgm.discard_pile[i, :bgm.discard_size[i]]]
+    gm.current_color = COLOR_ORDER[bgm.current_color[i]]
+    gm.direction = Direction.CLOCKWISE if bgm.direction[i] == 1 else Direction.COUNTER_CLOCKWISE
+    gm.current_player_index = int(bgm.current_player[i])
+    return gm
+
+def describe_gm(gm):
+    hands = np.zeros((len(gm.players), NUM_KINDS), dtype=np.int64)
+    for p, player in enumerate(gm.players):
+        for c in player.hand:
+            hands[p, get_card_index(c)] += 1
+    return {
+        "hands": hands,
+        "draw": [get_card_index(c) for c in gm.deck.cards],
+        "discard": [get_card_index(c) for c in gm.deck.discard_pile],
+        "color": COLOR_ORDER.index(gm.current_color),
+        "direction": gm.direction.value,
+        "turn": gm.current_player_index,
+        "over": gm.game_over,
+        "winner": gm.winner.player_id if gm.winner else -1,
+    }
+
+def describe_batched(bgm, i):
+    return {
+        "hands": bgm.hands[i].astype(np.int64),
+        "draw": list(bgm.draw_pile[i, :bgm.draw_size[i]]),
+        "discard": list(bgm.discard_pile[i, :bgm.discard_size[i]]),
+        "color": int(bgm.current_color[i]),
+        "direction": int(bgm.direction[i]),
+        "turn": int(bgm.current_player[i]),
+        "over": bool(bgm.game_over[i]),
+        "winner": int(bgm.winner[i]),
+    }
+
+def apply_to_gm(gm, kind, color, challenge, play_drawn):
+    """Play the same action through the GameManager API, the way train_backend drives it."""
+    gm.challenge_decider = lambda victim, prev: challenge
+    player = gm.get_current_player()
+    top = gm.deck.peek_discard_pile()
+    if kind == DRAW:
+        card = gm.deck.draw_card()
+        if card:
+            player.add_card(card)
+            if gm.check_legal_play(card, top) and play_drawn:
+                gm.play_card(player, card, COLOR_ORDER[color])
+                return
+        gm._advance_turn()
+        return
+    card = next(c for c in player.hand if get_card_index(c) == kind)
+    assert gm.play_card(player, card, COLOR_ORDER[color])
+
+
+class TestBatchedGameManager(unittest.TestCase):
+    def test_kind_layout_matches_rl_utils(self):
+        self.assertEqual(int(DECK_COUNTS.sum()), DECK_SIZE)
+        for kind in range(NUM_KINDS):
+            self.assertEqual(get_card_index(kind_to_card(kind)), kind)
+
+    def test_start_game_deals_full_deck(self):
+        bgm = BatchedGameManager(64, num_players=4, seed=1)
+        bgm.start_game()
+        self.assertTrue((bgm.hand_sizes() == 7).all())
+        self.assertTrue((bgm.discard_size == 1).all())
+        self.assertFalse((bgm.top_card() == WILD_DRAW_FOUR).any())
+        totals = bgm.hands.sum(axis=1) + np.stack([np.bincount(bgm.draw_pile[i, :bgm.draw_size[i]], minlength=NUM_KINDS) for i in range(64)])
+        totals += np.stack([np.bincount(bgm.discard_pile[i, :1], minlength=NUM_KINDS) for i in range(64)])
+        self.assertTrue((totals == DECK_COUNTS[None, :]).all())
+
+    def test_legal_mask_matches_check_legal_play(self):
+        bgm = BatchedGameManager(32, num_players=4, seed=2)
+        bgm.start_game()
+        rng = np.random.default_rng(3)
+        for _ in range(40):
+            mask = bgm.legal_mask()
+            for i in range(bgm.num_games):
+                if bgm.game_over[i]:
+                    continue
+                gm = snapshot_game(bgm, i)
+                top = gm.deck.peek_discard_pile()
+                expected = np.zeros(NUM_KINDS, dtype=bool)
+                for c in gm.get_current_player().hand:
+                    if gm.check_legal_play(c, top):
+                        expected[get_card_index(c)] = True
+                np.testing.assert_array_equal(mask[i], expected)
+                self.assertEqual(mask[i].any(), gm.get_current_player().has_playable_card(top, gm.current_color))
+            bgm.step(bgm.random_actions(mask), rng.integers(0, 4, bgm.num_games), rng.random(bgm.num_games) < 0.5)
+
+    def test_step_parity_with_game_manager(self):
+        n = 24
+        seen = set()
+        for num_players in (2, 3, 4):
+            bgm = BatchedGameManager(n, num_players=num_players, seed=10 + num_players)
+            bgm.start_game()
+            rng = np.random.default_rng(num_players)
+            for _ in range(300):
+                if bgm.game_over.all():
+                    break
+                cards = bgm.random_actions()
+                colors = rng.integers(0, 4, n)
+                challenges = rng.random(n) < 0.5
+                play_drawn = rng.random(n) < 0.7
+                before = {i: snapshot_game(bgm, i) for i in np.flatnonzero(~bgm.game_over)}
+                bgm.step(cards, colors, challenges, play_drawn)
+                for i, gm in before.items():
+                    if bgm.draw_size[i] > len(gm.deck.cards) or len(gm.deck.cards) < 7:
+                        # Reshuffles draw from different RNGs; covered by test_reshuffle_keeps_cards
+                        continue
+                    apply_to_gm(gm, cards[i], colors[i], challenges[i], play_drawn[i])
+                    expected = describe_gm(gm)
+                    actual = describe_batched(bgm, i)
+                    for key in expected:
+                        np.testing.assert_array_equal(actual[key], expected[key], err_msg=f"{key} (game {i})")
+                    result = {None: CHALLENGE_NONE, "Succeeded": CHALLENGE_SUCCEEDED, "Failed": CHALLENGE_FAILED}
+                    if cards[i] == WILD_DRAW_FOUR:
+                        self.assertEqual(bgm.last_challenge_result[i], result[gm.last_challenge_result])
+                        seen.add(int(bgm.last_challenge_result[i]))
+            self.assertTrue(bgm.game_over.any())
+        self.assertTrue({CHALLENGE_SUCCEEDED, CHALLENGE_FAILED, CHALLENGE_NONE} <= seen)
+
+    def test_reshuffle_keeps_cards(self):
+        bgm = BatchedGameManager(16, num_players=4, seed=5)
+        bgm.start_game()
+        for _ in range(400):
+            if bgm.game_over.all():
+                break
+            # Always drawing drains the pile and forces reshuffles
+            bgm.step(np.full(16, DRAW), play_drawn=np.zeros(16, dtype=bool))
+            for i in range(16):
+                counts = bgm.hands[i].sum(axis=0).astype(np.int64)
+                counts += np.bincount(bgm.draw_pile[i, :bgm.draw_size[i]], minlength=NUM_KINDS)
+                counts += np.bincount(bgm.discard_pile[i, :bgm.discard_size[i]], minlength=NUM_KINDS)
+                np.testing.assert_array_equal(counts, DECK_COUNTS)
+        self.assertTrue((bgm.discard_size == 1).all())
+
+    def test_illegal_move_raises(self):
+        bgm = BatchedGameManager(1, num_players=2, seed=0)
+        bgm.start_game()
+        illegal = np.flatnonzero(~bgm.legal_mask()[0])[0]
+        with self.assertRaises(ValueError):
+            bgm.step(np.array([illegal]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.suite import compare, run_suite
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_compare_flags_only_regressions(self):
+        baseline = {"benchmarks": {"b": {"games_per_sec": 100.0, "p99_us": 50.0, "games": 10}}}
+        current = {"benchmarks": {"b": {"games_per_sec": 80.0, "p99_us": 40.0, "games": 99}}}
+        rows = {r["metric"]: r for r in compare(current, baseline, threshold=0.1)}
+        self.assertEqual(set(rows), {"games_per_sec", "p99_us"})
+        self.assertTrue(rows["games_per_sec"]["regression"])
+        self.assertFalse(rows["p99_us"]["regression"])
+
+    def test_run_suite_emits_json_metrics(self):
+        results = run_suite(["deck"], scale=1)
+        deck = results["benchmarks"]["deck"]
+        self.assertGreater(deck["deck_cycles_per_sec"], 0)
+        self.assertIn("shuffle_draw_p99_us", deck)
+        self.assertEqual(results["meta"]["seed"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
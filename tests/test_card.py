@@ -0,0 +1,68 @@
+import sys
+import os
+import copy
+import pickle
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.card import Card, CARD_KINDS
+from backend.deck import Deck
+from config.enums import CardColor, CardType
+from communicator.comm_event import UpdateStateEvent, UpdateHandEvent, to_dict_recursive, update_instance_from_dict_optimized
+from rl_utils import get_card_index
+
+class TestCard(unittest.TestCase):
+    def test_cards_are_interned(self):
+        self.assertIs(Card(CardColor.RED, CardType.NUMBER, 7), Card(CardColor.RED, CardType.NUMBER, 7))
+        self.assertEqual(Card(CardColor.BLUE, CardType.SKIP), Card(CardColor.BLUE, CardType.SKIP))
+        self.assertNotEqual(Card(CardColor.BLUE, CardType.SKIP), Card(CardColor.GREEN, CardType.SKIP))
+        deck = Deck()
+        self.assertEqual(len(deck.cards), 108)
+        self.assertEqual(len({id(c) for c in deck.cards}), 54)
+        for i, card in enumerate(CARD_KINDS):
+            self.assertEqual(card.index, i)
+            self.assertEqual(get_card_index(card), i)
+
+    def test_cards_are_immutable_and_copy_to_self(self):
+        card = Card(CardColor.WILD, CardType.WILD)
+        with self.assertRaises(AttributeError):
+            card.color = CardColor.RED
+        self.assertIs(copy.deepcopy(card), card)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+    def test_is_match_and_score(self):
+        def reference_match(a, b):
+            if a.color == CardColor.WILD or b.color == CardColor.WILD:
+                return True
+            if a.color == b.color:
+                return True
+            if a.card_type == CardType.NUMBER and b.card_type == CardType.NUMBER:
+                return a.value == b.value
+            return a.card_type == b.card_type
+        for a in CARD_KINDS:
+            for b in CARD_KINDS:
+                self.assertEqual(a.is_match(b), reference_match(a, b))
+        self.assertEqual(Card(CardColor.RED, CardType.NUMBER, 7).score(), 7)
+        self.assertEqual(Card(CardColor.RED, CardType.DRAW_TWO).score(), 20)
+        self.assertEqual(Card(CardColor.WILD, CardType.WILD_DRAW_FOUR).score(), 50)
+
+    def test_comm_event_round_trip(self):
+        top = Card(CardColor.GREEN, CardType.REVERSE)
+        hand = [Card(CardColor.RED, CardType.NUMBER, 3), Card(CardColor.WILD, CardType.WILD)]
+        state = to_dict_recursive(UpdateStateEvent(top, 1, "msg", {0: 2}, CardColor.GREEN))
+        hand_event = to_dict_recursive(UpdateHandEvent(hand))
+
+        restored = UpdateStateEvent(Card(CardColor.RED, CardType.NUMBER, 0), 0)
+        update_instance_from_dict_optimized(restored, state)
+        self.assertIs(restored.top_card, top)
+        # The placeholder card instance must not have been mutated
+        self.assertEqual(Card(CardColor.RED, CardType.NUMBER, 0).value, 0)
+
+        restored_hand = UpdateHandEvent([])
+        update_instance_from_dict_optimized(restored_hand, hand_event)
+        self.assertEqual(restored_hand.hand, hand)
+
+if __name__ == "__main__":
+    unittest.main()
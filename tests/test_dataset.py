@@ -0,0 +1,95 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import torch
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from dataset import generate, DatasetLoader, FIELDS, _shard_path
+from rl_model import UNOAgent
+from rl_utils import HEADS, STATE_DIM
+from uno_env import HEAD_SLICES
+from train import replay_loss
+
+def load(directory, meta):
+    return {field: np.concatenate([np.load(_shard_path(directory, s, field)) for s in range(len(meta["shard_rows"]))])
+            for field in FIELDS}
+
+class TestDataset(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.dir = cls.tmp.name
+        cls.meta = generate(cls.dir, 30, seed=4, num_workers=1, games_per_shard=8)
+        cls.data = load(cls.dir, cls.meta)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_rows(self):
+        d = self.data
+        self.assertEqual(len(self.meta["shard_rows"]), 4)
+        self.assertEqual(len(d["heads"]), self.meta["rows"])
+        self.assertEqual(d["states"].shape, (self.meta["rows"], STATE_DIM))
+        # Every stored action is legal under its stored mask
+        for head_id, head in enumerate(HEADS):
+            rows = np.flatnonzero(d["heads"] == head_id)
+            self.assertTrue(len(rows) > 0 or head != "card")
+            cols = HEAD_SLICES[head].start + d["actions"][rows]
+            self.assertTrue(d["masks"][rows, cols].all())
+        r = d["returns"]
+        self.assertTrue(np.all((r == 1.0) | (r <= -0.33 + 1e-6)))
+
+    def test_independent_of_workers(self):
+        with tempfile.TemporaryDirectory() as other:
+            meta = generate(other, 30, seed=4, num_workers=2, games_per_shard=8)
+            self.assertEqual(meta["shard_rows"], self.meta["shard_rows"])
+            data = load(other, meta)
+            for field in FIELDS:
+                np.testing.assert_array_equal(data[field], self.data[field])
+
+    def test_endgame_labels(self):
+        with tempfile.TemporaryDirectory() as other:
+            meta = generate(other, 30, seed=4, num_workers=1, games_per_shard=8, endgame_budget=9)
+            data = load(other, meta)
+            self.assertGreater(meta["endgame_labels"], 0)
+            # Same games and decisions; only the returns of solved decisions change
+            for field in ("states", "heads", "actions"):
+                np.testing.assert_array_equal(data[field], self.data[field])
+            changed = np.flatnonzero(data["returns"] != self.data["returns"])
+            self.assertLessEqual(len(changed), meta["endgame_labels"])
+            self.assertTrue(np.all((data["returns"] >= -0.33 - 0.05 * 108) & (data["returns"] <= 1.0)))
+
+    def test_epoch_covers_every_row_once(self):
+        loader = DatasetLoader(self.dir, batch_size=64, seed=1, shuffle_shards=2, drop_last=False, with_masks=True)
+        batches = list(loader)
+        self.assertEqual(len(batches), len(loader))
+        self.assertTrue(all(len(b[0]) == 64 for b in batches[:-1]))
+        states = torch.cat([b[0] for b in batches]).numpy()
+        actions = torch.cat([b[2] for b in batches]).numpy()
+        masks = torch.cat([b[4] for b in batches]).numpy()
+        expected = np.concatenate([self.data["states"], self.data["actions"][:, None], self.data["masks"]], axis=1)
+        got = np.concatenate([states, actions[:, None], masks], axis=1)
+        np.testing.assert_array_equal(got[np.lexsort(got.T[::-1])], expected[np.lexsort(expected.T[::-1])])
+
+    def test_order_depends_only_on_seed(self):
+        runs = [[b[3] for b in DatasetLoader(self.dir, batch_size=50, seed=7, num_threads=t)] for t in (0, 3)]
+        self.assertEqual(len(runs[0]), self.meta["rows"] // 50)
+        for a, b in zip(*runs):
+            torch.testing.assert_close(a, b)
+
+    def test_early_break_and_training_step(self):
+        model = UNOAgent()
+        loader = DatasetLoader(self.dir, batch_size=32, prefetch=2)
+        for batch in loader:
+            loss = replay_loss(model, batch)
+            loss.backward()
+            break
+        self.assertTrue(torch.isfinite(loss))
+
+if __name__ == '__main__':
+    unittest.main()
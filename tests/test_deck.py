@@ -0,0 +1,69 @@
+import sys
+import os
+import random
+import unittest
+from collections import Counter
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.card import CARD_KINDS
+from backend.deck import Deck, STANDARD_DECK
+
+class TestLazyDeck(unittest.TestCase):
+    def test_draws_are_a_permutation(self):
+        deck = Deck(rng=random.Random(0))
+        drawn = deck.draw_many(108)
+        self.assertEqual(Counter(drawn), Counter(STANDARD_DECK))
+        self.assertEqual(deck.cards, [])
+        self.assertIsNone(deck.draw_card())
+
+    def test_draw_positions_are_uniform(self):
+        # Every one of the 108 slots is equally likely to hold a given card
+        rng = random.Random(1)
+        deck = Deck(rng=rng)
+        first_red_zero = Counter()
+        trials = 4000
+        for _ in range(trials):
+            deck.reset()
+            cards = deck.draw_many(108)
+            first_red_zero[cards.index(CARD_KINDS[0]) // 27] += 1
+        for quarter in range(4):
+            self.assertAlmostEqual(first_red_zero[quarter] / trials, 0.25, delta=0.04)
+
+    def test_deal_and_draw_many(self):
+        deck = Deck(rng=random.Random(2))
+        hands = deck.deal(4, 7)
+        self.assertEqual([len(h) for h in hands], [7] * 4)
+        self.assertEqual(len(deck.cards), 108 - 28)
+        self.assertEqual(len(deck.draw_many(5)), 5)
+        # Same RNG stream, same cards: deal is the round-robin of single draws
+        other = Deck(rng=random.Random(2))
+        singles = [other.draw_card() for _ in range(28)]
+        self.assertEqual([singles[r * 4 + p] for p in range(4) for r in range(7)], [c for h in hands for c in h])
+
+    def test_reshuffle_keeps_top_and_cards(self):
+        deck = Deck(rng=random.Random(3))
+        discarded = deck.draw_many(108)
+        for card in discarded:
+            deck.discard(card)
+        top = deck.peek_discard_pile()
+        card = deck.draw_card()
+        self.assertIs(deck.peek_discard_pile(), top)
+        self.assertEqual(deck.discard_pile, [top])
+        self.assertEqual(Counter(deck.cards + [card, top]), Counter(STANDARD_DECK))
+        # Only the top card left: nothing to draw
+        deck.draw_many(200)
+        self.assertIsNone(deck.draw_card())
+        self.assertEqual(deck.discard_pile, [top])
+
+    def test_assigned_pile_draws_in_order(self):
+        deck = Deck(rng=random.Random(4))
+        deck.cards = list(CARD_KINDS[:5])
+        self.assertEqual(deck.draw_many(5), list(reversed(CARD_KINDS[:5])))
+        deck.cards = list(CARD_KINDS[:5])
+        deck.return_card(CARD_KINDS[53])
+        self.assertEqual(Counter(deck.draw_many(6)), Counter(list(CARD_KINDS[:5]) + [CARD_KINDS[53]]))
+
+if __name__ == '__main__':
+    unittest.main()
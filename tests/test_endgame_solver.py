@@ -0,0 +1,112 @@
+import sys
+import os
+import math
+import random
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import Card
+from config.enums import PlayerType, CardColor, CardType
+from endgame_solver import EndgameSolver
+from mcts_agent import legal_actions
+from rl_agent import RLAgentHandler
+from train_backend import rl_action
+
+def position(hands, top, color=None, seed=1):
+    """Game after reset(seed), with the given hands and top card, seat 0 to play."""
+    gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(len(hands))])
+    gm.reset(seed)
+    for player, hand in zip(gm.players, hands):
+        player.clear_hand()
+        for card in hand:
+            player.add_card(card)
+    gm.deck.discard(top)
+    gm.current_color = color or top.color
+    gm.current_player_index = 0
+    gm._decision = gm._begin_turn()
+    return gm
+
+RED_DRAW_TWO = Card(CardColor.RED, CardType.DRAW_TWO)
+RED_5 = Card(CardColor.RED, CardType.NUMBER, 5)
+GREEN_5 = Card(CardColor.GREEN, CardType.NUMBER, 5)
+RED_3 = Card(CardColor.RED, CardType.NUMBER, 3)
+WILD_DRAW_FOUR = Card(CardColor.WILD, CardType.WILD_DRAW_FOUR)
+
+class TestEndgameSolver(unittest.TestCase):
+    def test_forced_win_through_chance_node(self):
+        # Draw Two: the opponent draws 2 (every multiset enumerated) and is skipped, then Red 5 wins.
+        # Red 5 first: Green 5 answers it and wins.
+        gm = position([[RED_DRAW_TWO, RED_5], [GREEN_5]], RED_3)
+        solver = EndgameSolver(card_budget=4)
+        values = solver.action_values(gm)
+        self.assertAlmostEqual(values[RED_DRAW_TWO][0], 1.0, places=9)
+        self.assertEqual(values[RED_5], (0.0, 1.0))
+        self.assertIs(solver.best_action(gm), RED_DRAW_TWO)
+        self.assertEqual(solver.stats()["cuts"], 0)
+
+    def test_draw_outcomes_are_hypergeometric(self):
+        gm = position([[RED_DRAW_TWO, RED_5], [GREEN_5]], RED_3)
+        outcomes = EndgameSolver()._outcomes(gm, RED_DRAW_TWO)
+        self.assertAlmostEqual(sum(p for p, _ in outcomes), 1.0, places=12)
+        pile = [c.index for c in gm.deck.cards]
+        n, w = len(pile), pile.count(WILD_DRAW_FOUR.index)
+        both = [p for p, child in outcomes if child.players[1].count(WILD_DRAW_FOUR) == 2]
+        self.assertEqual(len(both), 1)
+        self.assertAlmostEqual(both[0], math.comb(w, 2) / math.comb(n, 2), places=12)
+        # One outcome per multiset of two kinds
+        kinds = len(set(pile))
+        pairs = kinds * (kinds - 1) // 2 + sum(1 for k in set(pile) if pile.count(k) >= 2)
+        self.assertEqual(len(outcomes), pairs)
+
+    def test_solving_leaves_game_untouched(self):
+        gm = position([[RED_DRAW_TWO, RED_5], [GREEN_5]], RED_3)
+        before = gm.state_hash()
+        rng_state = gm.rng.getstate()
+        EndgameSolver(card_budget=4).value(gm)
+        self.assertEqual(gm.state_hash(), before)
+        self.assertEqual(gm.rng.getstate(), rng_state)
+
+    def test_bounded_table(self):
+        gm = position([[RED_DRAW_TWO, RED_5], [GREEN_5]], RED_3)
+        small = EndgameSolver(card_budget=4, table_size=50)
+        self.assertEqual(small.value(gm), EndgameSolver(card_budget=4).value(gm))
+        self.assertLessEqual(small.stats()["table_entries"], 50)
+
+    def test_budget_cuts(self):
+        gm = position([[RED_DRAW_TWO, RED_5], [GREEN_5]], RED_3)
+        solver = EndgameSolver(card_budget=3)
+        self.assertTrue(solver.applies(gm))
+        # The Draw Two line would hold 5 cards: cut and scored by the hand-size leaf
+        value = solver.action_values(gm)[RED_DRAW_TWO]
+        self.assertGreater(solver.stats()["cuts"], 0)
+        self.assertTrue(0.0 < value[0] < 1.0)
+        self.assertAlmostEqual(sum(value), 1.0)
+        self.assertFalse(EndgameSolver(card_budget=2).applies(gm))
+
+    def test_sampled_oracle_plays_for_rl_seat(self):
+        gm = GameManager([Player(0, "RL", PlayerType.RL)] + [Player(i, f"S{i}", PlayerType.AI) for i in range(1, 4)])
+        agent = RLAgentHandler(None)
+        agent.endgame_solver = EndgameSolver(card_budget=10, samples=2, rng=random.Random(0))
+        solved = 0
+        for seed in range(20):
+            decision = gm.reset(seed)
+            while decision is not None:
+                if decision.player.player_type == PlayerType.RL:
+                    applies = agent.endgame_solver.applies(gm)
+                    action = rl_action(decision, gm, agent)
+                    if applies and len(legal_actions(decision)) > 1:
+                        solved += 1
+                    self.assertIn(action, legal_actions(decision))
+                else:
+                    action = legal_actions(decision)[0]
+                decision = gm.step(action)
+            if solved:
+                break
+        self.assertGreater(solved, 0)
+
+if __name__ == "__main__":
+    unittest.main()
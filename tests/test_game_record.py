@@ -0,0 +1,107 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import CARD_KINDS, KIND_COLORS
+from backend.game_record import (GameRecordWriter, GameRecordReader, OP_DEAL, OP_START, OP_PLAY, OP_DRAW,
+                                 OP_CHALLENGE_SUCCEEDED, OP_WIN)
+from config.enums import PlayerType, DecisionType
+from train_backend import simple_ai_action, replay_game
+
+def play_games(directory, n, games_per_shard=100000):
+    """Record n SimpleAI games (challenging every other +4); returns (seed, winner, final hands) per game."""
+    gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(4)])
+    results = []
+    with GameRecordWriter(directory, games_per_shard=games_per_shard) as writer:
+        gm.recorder = writer
+        for g in range(n):
+            decision = gm.reset(7, game_id=g)
+            while decision is not None:
+                if decision.type == DecisionType.CHALLENGE:
+                    action = gm.rng.random() < 0.5
+                else:
+                    action = simple_ai_action(decision, gm.rng)
+                decision = gm.step(action)
+            results.append((gm.seed, gm.winner.player_id, [sorted(c.index for c in p.hand) for p in gm.players]))
+    return results
+
+def rebuild_hands(record):
+    """Replay the events of a record into each seat's final hand: DEAL and DRAW add a card, PLAY removes it."""
+    hands = [[] for _ in range(record.num_players)]
+    for op, actor, card, color in record.events():
+        if op in (OP_DEAL, OP_DRAW):
+            hands[actor].append(card)
+        elif op == OP_PLAY:
+            hands[actor].remove(card)
+    return [sorted(h) for h in hands]
+
+class TestGameRecord(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results = play_games(tmp, 20)
+            with GameRecordReader(tmp) as reader:
+                self.assertEqual(len(reader), 20)
+                # The hands rebuilt below include the +4s taken back by successful challenges
+                self.assertGreater(sum(e[0] == OP_CHALLENGE_SUCCEEDED for r in reader for e in r.events()), 0)
+                for record, (seed, winner, hands) in zip(reader, results):
+                    self.assertEqual(record.seed, seed)
+                    self.assertEqual(record.num_players, 4)
+                    self.assertEqual(record.winner(), winner)
+                    self.assertEqual(rebuild_hands(record), hands)
+                    ops = [e[0] for e in record.events()]
+                    self.assertEqual(ops[:28], [OP_DEAL] * 28)
+                    self.assertEqual(ops[28], OP_START)
+                    self.assertEqual(ops[-1], OP_WIN)
+
+    def test_play_colors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            play_games(tmp, 5)
+            with GameRecordReader(tmp) as reader:
+                for record in reader:
+                    for op, actor, card, color in record.events():
+                        if op == OP_PLAY and CARD_KINDS[card].color in KIND_COLORS:
+                            # Colored cards set their own color
+                            self.assertEqual(KIND_COLORS[color], CARD_KINDS[card].color)
+
+    def test_sharded_random_access(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results = play_games(tmp, 11, games_per_shard=4)
+            self.assertEqual(sorted(os.listdir(tmp))[:2], ["games-00000.idx", "games-00000.ugr"])
+            with GameRecordReader(tmp) as reader:
+                self.assertEqual(len(reader), 11)
+                for n in (10, 0, 5, 4, 3, -1):
+                    record = reader[n]
+                    self.assertEqual(record.seed, results[n][0])
+                    self.assertEqual(record.winner(), results[n][1])
+                with self.assertRaises(IndexError):
+                    reader[11]
+
+    def test_append_continues_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = play_games(tmp, 3)
+            second = play_games(tmp, 2)
+            with GameRecordReader(tmp) as reader:
+                self.assertEqual([r.seed for r in reader], [s for s, _, _ in first + second])
+
+    def test_seed_replays_recorded_game(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(4)])
+            with GameRecordWriter(tmp) as writer:
+                gm.recorder = writer
+                decision = gm.reset(3)
+                while decision is not None:
+                    decision = gm.step(simple_ai_action(decision, gm.rng))
+            with GameRecordReader(tmp) as reader:
+                record = reader[0]
+                replayed = replay_game(record.seed)
+                self.assertEqual(record.winner(), replayed.winner.player_id)
+                self.assertEqual(rebuild_hands(record), [sorted(c.index for c in p.hand) for p in replayed.players])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import unittest
+import threading
+import time
+import numpy as np
+import torch
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from config.enums import PlayerType
+from inference_server import InferenceServer
+from rl_agent import RLAgentHandler
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from train_backend import run_game_epoch
+
+class TestInferenceServer(unittest.TestCase):
+    def test_outputs_match_direct_forward(self):
+        model = UNOAgent().eval()
+        states = np.random.default_rng(0).random((32, STATE_DIM), dtype=np.float32)
+        with InferenceServer(model, max_batch=8, max_wait_ms=20) as server:
+            futures = [server.submit(s) for s in states]
+            results = [f.result(timeout=10) for f in futures]
+        with torch.no_grad():
+            expected = model(torch.from_numpy(states))
+        for i, res in enumerate(results):
+            for head in HEADS:
+                np.testing.assert_allclose(res[head], expected[head][i].numpy(), rtol=1e-5, atol=1e-6)
+        stats = server.stats()
+        self.assertEqual(stats["requests"], 32)
+        self.assertLess(stats["batches"], 32)
+        self.assertEqual(sum(stats["latency_us"]["counts"]), 32)
+
+    def test_concurrent_games_share_server(self):
+        model = UNOAgent().eval()
+        wins = []
+        with InferenceServer(model, max_batch=16, max_wait_ms=5) as server:
+            def play():
+                agent = RLAgentHandler(None, inference_server=server)
+                players = [Player(i, f"P{i}", PlayerType.RL if i == 0 else PlayerType.AI) for i in range(4)]
+                wins.append(run_game_epoch(GameManager(players), agent))
+            threads = [threading.Thread(target=play) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=60)
+        self.assertEqual(len(wins), 8)
+        self.assertGreater(server.stats()["requests"], 0)
+
+    def test_stop_fails_pending_and_later_requests(self):
+        model = UNOAgent().eval()
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_model(x):
+            entered.set()
+            release.wait(10)
+            return model(x)
+
+        server = InferenceServer(slow_model, max_batch=2, max_wait_ms=0).start()
+        first = server.submit(np.zeros(STATE_DIM, dtype=np.float32))
+        entered.wait(10)
+        # Queued behind the batch in flight: more than max_batch ahead of stop()'s sentinel
+        backlog = [server.submit(np.zeros(STATE_DIM, dtype=np.float32)) for _ in range(5)]
+        stopper = threading.Thread(target=server.stop)
+        stopper.start()
+        while server._running:
+            time.sleep(0.001)
+        release.set()
+        stopper.join(timeout=10)
+        self.assertFalse(stopper.is_alive())
+        self.assertEqual(set(first.result(timeout=10)), set(HEADS))
+        for fut in backlog:
+            self.assertIsInstance(fut.exception(timeout=10), RuntimeError)
+        with self.assertRaises(RuntimeError):
+            server.submit(np.zeros(STATE_DIM, dtype=np.float32))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.card import CARD_KINDS, KIND_COLORS
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.legality import LEGAL_TABLE, legal_mask, color_slot, NO_COLOR
+from config.enums import PlayerType, CardColor, CardType
+from rl_agent import RLAgentHandler
+
+def reference_legal(card, top_card, current_color):
+    """The original nested-Enum GameManager.check_legal_play."""
+    if card.color == CardColor.WILD:
+        return True
+    if card.color == current_color:
+        return True
+    if top_card.color == CardColor.WILD:
+        return False
+    if card.card_type == top_card.card_type:
+        if card.card_type == CardType.NUMBER:
+            return card.value == top_card.value
+        return True
+    return False
+
+class TestLegality(unittest.TestCase):
+    def test_table_matches_reference_rules(self):
+        gm = GameManager([Player(0, "A", PlayerType.AI), Player(1, "B", PlayerType.AI)])
+        for color in KIND_COLORS + [None]:
+            gm.current_color = color
+            for top in CARD_KINDS:
+                for card in CARD_KINDS:
+                    expected = reference_legal(card, top, color)
+                    self.assertEqual(bool(LEGAL_TABLE[top.index, color_slot(color), card.index]), expected)
+                    self.assertEqual(gm.check_legal_play(card, top), expected)
+
+    def test_wild_top_requires_announced_color(self):
+        wild = CARD_KINDS[52]
+        red_seven = CARD_KINDS[7]
+        self.assertFalse(LEGAL_TABLE[wild.index, color_slot(CardColor.BLUE), red_seven.index])
+        self.assertTrue(LEGAL_TABLE[wild.index, color_slot(CardColor.RED), red_seven.index])
+        self.assertEqual(color_slot(CardColor.WILD), NO_COLOR)
+
+    def test_legal_mask_batched_and_single(self):
+        rng = np.random.default_rng(0)
+        hands = rng.integers(0, 2, (16, 54))
+        tops = rng.integers(0, 54, 16)
+        colors = rng.integers(0, 4, 16)
+        batched = legal_mask(hands, tops, colors)
+        for i in range(16):
+            single = legal_mask(hands[i], CARD_KINDS[tops[i]], KIND_COLORS[colors[i]])
+            np.testing.assert_array_equal(batched[i], single)
+            expected = [hands[i, k] > 0 and reference_legal(CARD_KINDS[k], CARD_KINDS[tops[i]], KIND_COLORS[colors[i]]) for k in range(54)]
+            np.testing.assert_array_equal(single, expected)
+
+    def test_select_card_uses_mask(self):
+        players = [Player(i, f"P{i}", PlayerType.AI) for i in range(4)]
+        gm = GameManager(players)
+        gm.start_game()
+        agent = RLAgentHandler(None)
+        top = gm.deck.peek_discard_pile()
+        for _ in range(20):
+            p = gm.get_current_player()
+            legal = gm.legal_cards(p)
+            self.assertEqual(legal, [c for c in p.hand if reference_legal(c, top, gm.current_color)])
+            if legal:
+                self.assertIn(agent.select_card(p, gm), legal)
+            else:
+                self.assertIsNone(agent.select_card(p, gm))
+            gm._advance_turn()
+
+if __name__ == "__main__":
+    unittest.main()
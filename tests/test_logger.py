@@ -0,0 +1,57 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.utils.logger import game_logger
+
+class ExplodingStr:
+    """Fails the test if the logger ever formats it."""
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "\x1b[91mRed 5\x1b[0m"
+
+class TestGameLogger(unittest.TestCase):
+    def tearDown(self):
+        game_logger.set_profile("interactive")
+        if game_logger.log_file_path:
+            path = game_logger.log_file_path
+            game_logger.end_game_session()
+            os.remove(path)
+
+    def test_no_formatting_without_handler(self):
+        arg = ExplodingStr()
+        game_logger.info("played %s", arg)
+        self.assertFalse(game_logger.is_enabled())
+        self.assertEqual(arg.formatted, 0)
+
+    def test_simulation_profile_disables_session(self):
+        game_logger.start_game_session(is_test=True)
+        self.assertTrue(game_logger.is_enabled())
+        game_logger.set_profile("simulation")
+        arg = ExplodingStr()
+        game_logger.info("played %s", arg)
+        self.assertEqual(arg.formatted, 0)
+        self.assertFalse(game_logger.is_enabled())
+
+    def test_interactive_session_writes_stripped_message(self):
+        path = game_logger.start_game_session(is_test=True)
+        arg = ExplodingStr()
+        game_logger.info("played %s", arg)
+        self.assertEqual(arg.formatted, 1)
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("played Red 5", content)
+        self.assertNotIn("\x1b", content)
+
+    def test_unknown_profile_rejected(self):
+        with self.assertRaises(ValueError):
+            game_logger.set_profile("quiet")
+
+if __name__ == "__main__":
+    unittest.main()
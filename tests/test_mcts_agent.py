@@ -0,0 +1,138 @@
+import sys
+import os
+import pickle
+import random
+import unittest
+from collections import Counter
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import Card
+from backend.deck import STANDARD_DECK
+from config.enums import PlayerType, CardColor, CardType, DecisionType
+from rl_model import UNOAgent
+from train_backend import simple_ai_action
+from mcts_agent import MCTSAgent, determinize, legal_actions
+
+def make_game(n=4):
+    return GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(n)])
+
+def advance(gm, seed, steps):
+    decision = gm.reset(seed)
+    for _ in range(steps):
+        decision = gm.step(simple_ai_action(decision, gm.rng))
+    return decision
+
+def finish(gm):
+    decision = gm.pending_decision()
+    while decision is not None:
+        decision = gm.step(simple_ai_action(decision, gm.rng))
+    return gm.winner.player_id, [sorted(c.index for c in p.hand) for p in gm.players]
+
+def all_cards(gm):
+    cards = list(gm.deck.cards) + list(gm.deck.discard_pile)
+    for p in gm.players:
+        cards.extend(p.hand)
+    return Counter(c.index for c in cards)
+
+class TestClone(unittest.TestCase):
+    def test_clone_replays_and_leaves_original(self):
+        gm = make_game()
+        advance(gm, 4, 15)
+        before = gm.state_hash()
+        clone = gm.clone()
+        self.assertEqual(clone.state_hash(), before)
+        result = finish(clone)
+        # The clone plays on alone; the original continues identically from the same RNG state
+        self.assertEqual(gm.state_hash(), before)
+        self.assertEqual(finish(gm), result)
+
+    def test_clone_pickles(self):
+        gm = make_game()
+        advance(gm, 8, 9)
+        clone = pickle.loads(pickle.dumps(gm.clone()))
+        self.assertEqual(clone.state_hash(), gm.state_hash())
+        self.assertIs(clone.pending_decision().player, clone.players[gm.pending_decision().player.player_id])
+        self.assertEqual(finish(clone), finish(gm))
+
+    def test_determinize_keeps_public_information(self):
+        gm = make_game()
+        advance(gm, 2, 20)
+        observer = gm.pending_decision().player.player_id
+        rng = random.Random(0)
+        redealt = 0
+        for _ in range(20):
+            game = determinize(gm, observer, rng)
+            self.assertEqual(all_cards(game), Counter(c.index for c in STANDARD_DECK))
+            self.assertEqual(game.players[observer].hand, gm.players[observer].hand)
+            self.assertEqual(game.deck.discard_pile, gm.deck.discard_pile)
+            self.assertEqual([len(p.hand) for p in game.players], [len(p.hand) for p in gm.players])
+            self.assertEqual(game.observation_hash(game.players[observer]),
+                             gm.observation_hash(gm.players[observer]))
+            redealt += game.state_hash() != gm.state_hash()
+        self.assertGreater(redealt, 15)
+
+class TestMCTSAgent(unittest.TestCase):
+    def setUp(self):
+        # Two players; seat 0 to move on a Red 3 with Red Draw Two and Red 5, seat 1 holds one card.
+        # Draw Two skips the opponent and Red 5 then wins; Red 5 first gives seat 1 a chance to win.
+        self.gm = make_game(2)
+        self.gm.reset(1)
+        me, opp = self.gm.players
+        for p in (me, opp):
+            p.clear_hand()
+        self.draw_two = Card(CardColor.RED, CardType.DRAW_TWO)
+        for card in (self.draw_two, Card(CardColor.RED, CardType.NUMBER, 5)):
+            me.add_card(card)
+        opp.add_card(Card(CardColor.GREEN, CardType.NUMBER, 5))
+        self.gm.deck.discard(Card(CardColor.RED, CardType.NUMBER, 3))
+        self.gm.current_color = CardColor.RED
+        self.gm.current_player_index = 0
+        self.gm._decision = self.gm._begin_turn()
+
+    def test_finds_winning_line(self):
+        agent = MCTSAgent(iterations=300, seed=0)
+        before = self.gm.state_hash()
+        action, stats = agent.search(self.gm)
+        self.assertIs(action, self.draw_two)
+        self.assertEqual(stats[self.draw_two][0], stats[self.draw_two][1])  # every visit won
+        self.assertEqual(self.gm.state_hash(), before)
+        self.assertEqual(agent.last_search["iterations"], 300)
+        self.assertGreater(agent.search_stats()["nodes_per_sec"], 0)
+
+    def test_priors_and_time_budget(self):
+        agent = MCTSAgent(iterations=None, time_limit=0.2, prior_model=UNOAgent(), seed=0)
+        with self.assertRaises(ValueError):
+            agent.search(self.gm)  # the model input is sized for 4 players
+        gm = make_game()
+        decision = advance(gm, 3, 12)
+        action, stats = agent.search(gm)
+        self.assertIn(action, legal_actions(decision))
+        self.assertGreater(agent.last_search["iterations"], 0)
+        self.assertEqual(sum(v for v, _ in stats.values()), agent.last_search["iterations"])
+
+    def test_root_parallel_search(self):
+        with MCTSAgent(iterations=200, num_workers=2, seed=0) as agent:
+            action, stats = agent.search(self.gm)
+        self.assertIs(action, self.draw_two)
+        self.assertEqual(sum(v for v, _ in stats.values()), 200)
+
+    def test_plays_full_game(self):
+        gm = make_game()
+        agent = MCTSAgent(iterations=20, seed=0)
+        decision = gm.reset(6)
+        while decision is not None:
+            if decision.player.player_id == 0:
+                action = agent.act(decision, gm)
+                if decision.type == DecisionType.PLAY_CARD:
+                    self.assertTrue(action in decision.legal_cards or (action is None and not decision.legal_cards))
+            else:
+                action = simple_ai_action(decision, gm.rng)
+            decision = gm.step(action)
+        self.assertTrue(gm.game_over)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import os
+import tempfile
+import subprocess
+import unittest
+import numpy as np
+import torch
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from config.enums import PlayerType
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from rl_agent import RLAgentHandler
+from numpy_model import NumpyUNOAgent, export_npz
+from train_backend import run_game_epoch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def torch_outputs(model, x):
+    with torch.no_grad():
+        return {h: out.numpy() for h, out in model(torch.from_numpy(x)).items()}
+
+class TestNumpyUNOAgent(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = UNOAgent().eval()
+        self.states = np.random.default_rng(0).random((32, STATE_DIM), dtype=np.float32)
+
+    def assert_parity(self, np_model, atol=1e-5):
+        expected = torch_outputs(self.model, self.states)
+        batched = np_model(self.states)
+        single = np_model(self.states[3])
+        self.assertEqual(list(batched), HEADS)
+        for head in HEADS:
+            self.assertEqual(batched[head].shape, expected[head].shape)
+            np.testing.assert_allclose(batched[head], expected[head], atol=atol)
+            np.testing.assert_allclose(single[head], expected[head][3], atol=atol)
+
+    def test_parity_from_state_dict(self):
+        self.assert_parity(NumpyUNOAgent.from_state_dict(self.model.state_dict()))
+
+    def test_npz_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.npz")
+            export_npz(self.model, path)
+            self.assert_parity(NumpyUNOAgent.load(path))
+            pth = os.path.join(tmp, "model.pth")
+            torch.save(self.model.state_dict(), pth)
+            self.assert_parity(NumpyUNOAgent.load(pth))
+            half = os.path.join(tmp, "half.npz")
+            export_npz(pth, half, np.float16)
+            self.assertLess(os.path.getsize(half), os.path.getsize(path) * 0.6)
+            self.assert_parity(NumpyUNOAgent.load(half), atol=1e-2)
+
+    def test_agent_backends_agree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.pth")
+            torch.save(self.model.state_dict(), path)
+            agents = [RLAgentHandler(path), RLAgentHandler(path, backend="numpy")]
+        players = [Player(0, "RL", PlayerType.RL)] + [Player(i, f"S{i}", PlayerType.AI) for i in range(1, 4)]
+        gm = GameManager(players)
+        for seed in range(3):
+            gm.reset(seed)
+            player = gm.players[0]
+            outputs = [agent._get_vals(player, gm)[0] for agent in agents]
+            for head in HEADS:
+                np.testing.assert_allclose(outputs[1][head], outputs[0][head], atol=1e-5)
+        # Whole games on the numpy backend
+        for seed in range(3):
+            run_game_epoch(gm, agents[1], seed=seed)
+            self.assertTrue(gm.game_over)
+        with self.assertRaises(ValueError):
+            RLAgentHandler(None, backend="onnx")
+
+    def test_numpy_backend_does_not_import_torch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.npz")
+            export_npz(self.model, path)
+            script = (
+                f"import sys; sys.path.insert(0, {ROOT!r})\n"
+                "from backend.game_manager import GameManager\n"
+                "from backend.player import Player\n"
+                "from config.enums import PlayerType\n"
+                "from rl_agent import RLAgentHandler\n"
+                "from train_backend import run_game_epoch\n"
+                f"agent = RLAgentHandler({path!r}, backend='numpy')\n"
+                "gm = GameManager([Player(0, 'RL', PlayerType.RL)] + [Player(i, 'S', PlayerType.AI) for i in range(1, 4)])\n"
+                "run_game_epoch(gm, agent, seed=0)\n"
+                "assert 'torch' not in sys.modules\n"
+            )
+            subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import os
+import random
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.player import Player
+from backend.card import CARD_KINDS, KIND_COLORS
+from backend.legality import LEGAL_TABLE, color_slot
+from config.enums import PlayerType, CardColor
+
+def brute_counts(hand):
+    counts = np.zeros(54, dtype=np.float32)
+    for card in hand:
+        counts[card.index] += 1
+    return counts
+
+class TestPlayerTallies(unittest.TestCase):
+    def test_counts_follow_hand(self):
+        rng = random.Random(0)
+        p = Player(0, "P", PlayerType.AI)
+        for _ in range(500):
+            if p.hand and rng.random() < 0.45:
+                p.remove_card(rng.choice(p.hand))
+            else:
+                p.add_card(rng.choice(CARD_KINDS))
+            np.testing.assert_array_equal(p.counts, brute_counts(p.hand))
+            for slot, color in enumerate(KIND_COLORS):
+                self.assertEqual(p.color_counts[slot], sum(c.color == color for c in p.hand))
+                self.assertEqual(p.has_color(color), any(c.color == color for c in p.hand))
+            self.assertEqual(p.wild_count, sum(c.color == CardColor.WILD for c in p.hand))
+        self.assertFalse(p.has_color(None))
+        p.reset()
+        self.assertFalse(p.counts.any())
+        self.assertEqual(p.color_counts, [0, 0, 0, 0])
+        self.assertEqual(sum(p.symbol_counts) + p.wild_count, 0)
+
+    def test_has_playable_card_matches_table(self):
+        rng = random.Random(1)
+        p = Player(0, "P", PlayerType.AI)
+        for _ in range(2000):
+            p.reset()
+            for _ in range(rng.randint(0, 6)):
+                p.add_card(rng.choice(CARD_KINDS))
+            top = rng.choice(CARD_KINDS)
+            color = rng.choice(KIND_COLORS + [None])
+            effective = color if color else top.color
+            expected = any(LEGAL_TABLE[top.index, color_slot(effective), c.index] for c in p.hand)
+            self.assertEqual(p.has_playable_card(top, color), expected, (top, color, p.hand))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+import torch
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from config.enums import PlayerType
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from rl_agent import RLAgentHandler
+from dataset import generate
+from quantized_model import quantize, convert, decision_agreement
+from train_backend import run_game_epoch
+
+class TestQuantizedModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        torch.manual_seed(0)
+        cls.model = UNOAgent().eval()
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.dataset = os.path.join(cls.tmp.name, "data")
+        generate(cls.dataset, 20, seed=0, num_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_close_to_float_model(self):
+        quantized = quantize(self.model)
+        x = torch.rand(64, STATE_DIM)
+        with torch.no_grad():
+            expected, got = self.model(x), quantized(x)
+        self.assertEqual(list(got), HEADS)
+        for head in HEADS:
+            self.assertEqual(got[head].shape, expected[head].shape)
+            np.testing.assert_allclose(got[head].numpy(), expected[head].numpy(), atol=0.02)
+
+    def test_agreement_gate(self):
+        report = decision_agreement(self.model, quantize(self.model), self.dataset)
+        self.assertGreater(report["rows"], 0)
+        self.assertGreaterEqual(report["agreement"], 0.95)
+        # Unrelated weights disagree on most decisions
+        torch.manual_seed(1)
+        other = quantize(UNOAgent())
+        self.assertLess(decision_agreement(self.model, other, self.dataset)["agreement"], 0.9)
+        limited = decision_agreement(self.model, other, self.dataset, max_rows=100)
+        self.assertLessEqual(limited["rows"], 100)
+
+    def test_convert_and_play(self):
+        pth = os.path.join(self.tmp.name, "model.pth")
+        out = os.path.join(self.tmp.name, "model_int8.pt")
+        torch.save(self.model.state_dict(), pth)
+        report = convert(pth, out, self.dataset, min_agreement=0.95)
+        self.assertTrue(report["passed"])
+        agents = [RLAgentHandler(pth), RLAgentHandler(out, backend="torchscript")]
+        players = [Player(0, "RL", PlayerType.RL)] + [Player(i, f"S{i}", PlayerType.AI) for i in range(1, 4)]
+        gm = GameManager(players)
+        gm.reset(0)
+        outputs = [agent._get_vals(gm.players[0], gm)[0] for agent in agents]
+        for head in HEADS:
+            np.testing.assert_allclose(outputs[1][head], outputs[0][head], atol=0.02)
+        run_game_epoch(gm, agents[1], seed=1)
+        self.assertTrue(gm.game_over)
+        # A failed gate writes nothing
+        failed = os.path.join(self.tmp.name, "failed.pt")
+        self.assertFalse(convert(pth, failed, self.dataset, min_agreement=1.01)["passed"])
+        self.assertFalse(os.path.exists(failed))
+        with self.assertRaises(ValueError):
+            RLAgentHandler(None, backend="torchscript")
+
+if __name__ == "__main__":
+    unittest.main()
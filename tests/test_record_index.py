@@ -0,0 +1,134 @@
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.game_record import GameRecordWriter
+from backend.card import Card
+from backend.record_index import (build_index, RecordIndex, ACTION_DRAW, CHALLENGE_SUCCEEDED,
+                                  CHALLENGE_FAILED)
+from config.enums import PlayerType, CardColor, CardType
+from train_backend import simple_ai_action
+
+def record_games(directory, n):
+    """Record n SimpleAI games; returns (winner, plays, turn draws) per game."""
+    gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(4)])
+    stats = []
+    with GameRecordWriter(directory) as writer:
+        gm.recorder = writer
+        for g in range(n):
+            plays = draws = 0
+            decision = gm.reset(11, game_id=g)
+            while decision is not None:
+                action = simple_ai_action(decision, gm.rng)
+                if decision.type.name == "PLAY_CARD":
+                    if action is None:
+                        draws += 1
+                    elif action.color.name != "WILD":
+                        plays += 1
+                elif decision.type.name == "CHOOSE_COLOR":
+                    plays += 1
+                elif decision.type.name == "PLAY_DRAWN" and action and decision.card.color.name != "WILD":
+                    plays += 1
+                decision = gm.step(action)
+            stats.append((gm.winner.player_id, plays, draws))
+    return stats
+
+class TestRecordIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        records = os.path.join(cls.tmp.name, "records")
+        cls.stats = record_games(records, 40)
+        cls.totals = build_index(records, os.path.join(cls.tmp.name, "index"))
+        # Same games with tiny shards: every query must give the same answers
+        build_index(records, os.path.join(cls.tmp.name, "sharded"), rows_per_shard=500)
+        cls.idx = RecordIndex(os.path.join(cls.tmp.name, "index"))
+        cls.sharded = RecordIndex(os.path.join(cls.tmp.name, "sharded"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_games_table(self):
+        self.assertEqual(len(self.idx), 40)
+        self.assertGreater(self.sharded.shards["decisions"], 1)
+        games = self.idx.query("games")
+        self.assertEqual(list(games.values("winner")), [w for w, _, _ in self.stats])
+        self.assertEqual(list(games.values("plays")), [p for _, p, _ in self.stats])
+        self.assertEqual(list(games.values("draws")), [d for _, _, d in self.stats])
+        self.assertEqual(games.sum("turns"), self.totals["decisions"])
+
+    def test_decision_fields(self):
+        d = self.idx.query("decisions")
+        plays = d.where(action=lambda a: a >= 0)
+        # SimpleAI only draws when nothing is playable
+        self.assertEqual(d.where(action=ACTION_DRAW).values("n_legal").max(), 0)
+        self.assertGreaterEqual(plays.values("n_legal").min(), 1)
+        # Colored cards set their own color
+        colored = plays.where(action=lambda a: a < 52)
+        np.testing.assert_array_equal(colored.values("color"), colored.values("action") // 13)
+        # One winning row per game: the last play of the winner
+        self.assertEqual(d.where(won=True).values("game").tolist().count(0),
+                         d.where(game=0, seat=self.stats[0][0]).count())
+
+    def test_challenge_matches_bluff(self):
+        d = self.idx.query("decisions").where(action=53)
+        self.assertEqual(d.where(held_color=True, challenge=CHALLENGE_FAILED).count(), 0)
+        self.assertEqual(d.where(held_color=False, challenge=CHALLENGE_SUCCEEDED).count(), 0)
+        self.assertEqual(d.where(challenge=-1).count(), 0)
+
+    def test_queries_match_across_shards(self):
+        for idx in (self.idx, self.sharded):
+            d = idx.query("decisions")
+            self.assertEqual(d.count(), self.totals["decisions"])
+            self.assertEqual(sum(d.group_count(by="seat").values()), d.count())
+        a, b = self.idx.query("decisions"), self.sharded.query("decisions")
+        self.assertEqual(a.group_mean("won", by="seat"), b.group_mean("won", by="seat"))
+        self.assertEqual(a.where(action=[52, 53]).count(), b.where(action=[52, 53]).count())
+        self.assertEqual(a.where(lambda c: c["hand_size"] > c["n_legal"]).count(),
+                         b.where(lambda c: c["hand_size"] > c["n_legal"]).count())
+        win_by_start = self.idx.query("games").group_mean(lambda c: c["winner"] == 0, by="start")
+        self.assertAlmostEqual(sum(self.idx.query("games").group_count(by="start")[k] * v
+                                   for k, v in win_by_start.items()),
+                               sum(1 for w, _, _ in self.stats if w == 0))
+
+class TestShortPenalty(unittest.TestCase):
+    def test_penalty_drawn_short_does_not_swallow_next_draw(self):
+        red = lambda value: Card(CardColor.RED, CardType.NUMBER, value)
+        draw_two = Card(CardColor.RED, CardType.DRAW_TWO)
+        with tempfile.TemporaryDirectory() as tmp:
+            records = os.path.join(tmp, "records")
+            with GameRecordWriter(records) as writer:
+                writer.begin_game(None, 2)
+                for card in (draw_two, red(5), red(6)):
+                    writer.deal(0, card)
+                for card in (Card(CardColor.GREEN, CardType.NUMBER, 7), Card(CardColor.BLUE, CardType.NUMBER, 3)):
+                    writer.deal(1, card)
+                writer.start(red(3), CardColor.RED)
+                writer.play(0, draw_two, CardColor.RED)
+                # Both piles ran out: the Draw Two penalty yields a single card
+                writer.draw(1, Card(CardColor.YELLOW, CardType.NUMBER, 1))
+                writer.play(0, red(5), CardColor.RED)
+                # A voluntary draw: a decision of seat 1, not a penalty card
+                writer.draw(1, Card(CardColor.YELLOW, CardType.NUMBER, 2))
+                writer.play(0, red(6), CardColor.RED)
+                writer.win(0)
+            build_index(records, os.path.join(tmp, "index"))
+            idx = RecordIndex(os.path.join(tmp, "index"))
+            games = idx.query("games")
+            self.assertEqual(games.values("penalty_draws").tolist(), [1])
+            self.assertEqual(games.values("draws").tolist(), [1])
+            self.assertEqual(games.values("turns").tolist(), [4])
+            draws = idx.query("decisions").where(action=ACTION_DRAW)
+            self.assertEqual(draws.values("seat").tolist(), [1])
+            self.assertEqual(draws.values("hand_size").tolist(), [3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import unittest
+import numpy as np
+import torch
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from train import ReplayBuffer, replay_loss
+
+def random_transitions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    states = rng.integers(-1, 20, size=(n, STATE_DIM)).astype(np.float32)
+    heads = rng.integers(0, len(HEADS), size=n)
+    actions = rng.integers(0, 2, size=n)
+    targets = rng.standard_normal(n).astype(np.float32)
+    return states, heads, actions, targets
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_ring_wraps_and_keeps_newest(self):
+        buf = ReplayBuffer(capacity=10)
+        states, heads, actions, targets = random_transitions(25)
+        buf.push(states[:7], heads[:7], actions[:7], targets[:7])
+        buf.push(states[7:], heads[7:], actions[7:], targets[7:])
+        self.assertEqual(len(buf), 10)
+        stored = {tuple(row) for row in buf.states.float().numpy()}
+        self.assertEqual(stored, {tuple(row) for row in states[15:]})
+
+    def test_scalar_target_and_exact_states(self):
+        buf = ReplayBuffer(capacity=100)
+        states, heads, actions, _ = random_transitions(50)
+        buf.push(states, heads, actions, 2.5)
+        s, h, a, t = buf.sample(50)
+        self.assertEqual(s.dtype, torch.float32)
+        self.assertTrue(torch.all(t == 2.5))
+        order = np.lexsort(s.numpy().T)
+        np.testing.assert_array_equal(s.numpy()[order], states[np.lexsort(states.T)])
+
+    def test_loss_matches_per_item_grouping(self):
+        torch.manual_seed(0)
+        model = UNOAgent()
+        states, heads, actions, targets = random_transitions(64, seed=1)
+        buf = ReplayBuffer(capacity=64)
+        buf.push(states, heads, actions, targets)
+        batch = buf.sample(64)
+        loss_fn = torch.nn.MSELoss()
+        got = replay_loss(model, batch)
+
+        s, h, a, t = batch
+        expected = 0
+        for head_id, head in enumerate(HEADS):
+            rows = [i for i in range(64) if h[i] == head_id]
+            out = model(torch.stack([s[i] for i in rows]))[head]
+            preds = torch.stack([out[j, a[i]] for j, i in enumerate(rows)])
+            expected = expected + loss_fn(preds, torch.stack([t[i] for i in rows]))
+        self.assertAlmostEqual(got.item(), expected.item(), places=5)
+
+    def test_fused_gradients_match_per_head_passes(self):
+        torch.manual_seed(0)
+        model = UNOAgent()
+        states, heads, actions, targets = random_transitions(128, seed=2)
+        # A head missing from the batch contributes nothing
+        keep = heads != HEADS.index("play_drawn")
+        batch = (torch.as_tensor(states[keep]).float(), torch.as_tensor(heads[keep]).long(),
+                 torch.as_tensor(actions[keep]).long(), torch.as_tensor(targets[keep]).float())
+        replay_loss(model, batch).backward()
+        fused = [p.grad.clone() for p in model.parameters()]
+
+        model.zero_grad()
+        s, h, a, t = batch
+        loss = 0
+        for head_id, head in enumerate(HEADS):
+            mask = h == head_id
+            if mask.any():
+                preds = model(s[mask])[head].gather(1, a[mask].unsqueeze(1)).squeeze(1)
+                loss = loss + torch.nn.functional.mse_loss(preds, t[mask])
+        loss.backward()
+        for g, p in zip(fused, model.parameters()):
+            # Parameters of the missing head get zero gradients instead of none
+            expected = p.grad if p.grad is not None else torch.zeros_like(p)
+            torch.testing.assert_close(g, expected, rtol=1e-4, atol=1e-6)
+        self.assertIsNone(replay_loss(model, tuple(x[:0] for x in batch)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import Card
+from config.enums import PlayerType, CardColor, CardType
+from rl_agent import RLAgentHandler
+from train_backend import run_game_epoch
+
+def make_game():
+    players = [Player(0, "RL", PlayerType.RL)] + [Player(i, f"S{i}", PlayerType.AI) for i in range(1, 4)]
+    gm = GameManager(players)
+    gm.start_game()
+    return gm
+
+class TestRLAgentHandler(unittest.TestCase):
+    def test_color_after_card_reuses_forward_pass(self):
+        agent = RLAgentHandler(None)
+        gm = make_game()
+        player = gm.players[0]
+        wild = Card(CardColor.WILD, CardType.WILD)
+        player.add_card(wild)
+
+        agent.select_card(player, gm, [wild])
+        self.assertEqual((agent.cache_hits, agent.cache_misses), (0, 1))
+        color = agent.select_color(player, gm)
+        self.assertEqual((agent.cache_hits, agent.cache_misses), (1, 1))
+
+        # Same answer as a fresh handler without a cached context
+        fresh = RLAgentHandler(None)
+        fresh.model.load_state_dict(agent.model.state_dict())
+        fresh_outputs, _ = fresh._get_vals(player, gm)
+        cached_outputs, _ = agent._get_vals(player, gm)
+        for head in fresh_outputs:
+            np.testing.assert_allclose(cached_outputs[head], fresh_outputs[head], rtol=1e-6)
+        self.assertIn(color, [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+
+    def test_state_change_misses(self):
+        agent = RLAgentHandler(None)
+        gm = make_game()
+        player = gm.players[0]
+        agent._get_vals(player, gm)
+        player.add_card(Card(CardColor.RED, CardType.NUMBER, 5))
+        agent._get_vals(player, gm)
+        self.assertEqual((agent.cache_hits, agent.cache_misses), (0, 2))
+
+    def test_games_record_cache_stats(self):
+        agent = RLAgentHandler(None)
+        agent.is_train = True
+        for _ in range(5):
+            agent.clear_history()
+            players = [Player(0, "RL", PlayerType.RL)] + [Player(i, f"S{i}", PlayerType.AI) for i in range(1, 4)]
+            run_game_epoch(GameManager(players), agent)
+        stats = agent.cache_stats()
+        self.assertGreater(stats["misses"], 0)
+        self.assertEqual(stats["saved_per_game"], stats["hits"] / 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import os
+import random
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from config.enums import PlayerType, CardColor
+from rl_utils import encode_state, IncrementalStateEncoder
+from train_backend import simple_ai_action
+
+def play_random_turn(gm):
+    player = gm.get_current_player()
+    top = gm.deck.peek_discard_pile()
+    legal = [c for c in player.hand if gm.check_legal_play(c, top)]
+    if legal:
+        gm.play_card(player, random.choice(legal), random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]))
+    else:
+        card = gm.deck.draw_card()
+        if card:
+            player.add_card(card)
+        gm._advance_turn()
+
+class TestIncrementalStateEncoder(unittest.TestCase):
+    def test_bit_identical_to_encode_state(self):
+        random.seed(0)
+        for _ in range(20):
+            players = [Player(i, f"P{i}", PlayerType.AI) for i in range(4)]
+            gm = GameManager(players)
+            gm.challenge_decider = lambda victim, prev: random.random() < 0.5
+            gm.start_game()
+            encoder = IncrementalStateEncoder(gm)
+            turns = 0
+            while not gm.game_over and turns < 500:
+                for p in players:
+                    expected = encode_state(p, gm)
+                    actual = encoder.encode(p)
+                    self.assertEqual(actual.dtype, expected.dtype)
+                    self.assertEqual(actual.tobytes(), expected.tobytes())
+                play_random_turn(gm)
+                turns += 1
+
+    def test_stays_exact_across_pooled_resets(self):
+        random.seed(1)
+        players = [Player(i, f"P{i}", PlayerType.AI) for i in range(4)]
+        gm = GameManager(players)
+        encoder = IncrementalStateEncoder(gm)
+        for game in range(5):
+            decision = gm.reset(seed=game)
+            while decision is not None:
+                np.testing.assert_array_equal(encoder.encode(decision.player), encode_state(decision.player, gm))
+                decision = gm.step(simple_ai_action(decision))
+
+    def test_hand_block_reads_player_counts(self):
+        players = [Player(i, f"P{i}", PlayerType.AI) for i in range(4)]
+        gm = GameManager(players)
+        gm.start_game()
+        encoder = IncrementalStateEncoder(gm)
+        self.assertEqual(players[0].hand_listeners, [])
+        card = gm.deck.draw_card()
+        players[0].add_card(card)
+        np.testing.assert_array_equal(encoder.encode(players[0])[:54], players[0].counts)
+        players[0].remove_card(card)
+        np.testing.assert_array_equal(encoder.encode(players[0])[:54], players[0].counts)
+
+if __name__ == "__main__":
+    unittest.main()
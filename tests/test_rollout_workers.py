@@ -0,0 +1,62 @@
+import sys
+import os
+import unittest
+import numpy as np
+import torch
+from multiprocessing import shared_memory
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from rl_model import UNOAgent
+from rl_utils import STATE_DIM, HEADS
+from rollout_workers import RolloutWorkerPool, SLOTS_PER_WORKER
+
+# Generous: spawned workers import torch before their first game
+TIMEOUT = 120
+
+class TestRolloutWorkerPool(unittest.TestCase):
+    def test_games_slots_versions_and_cleanup(self):
+        torch.manual_seed(0)
+        model = UNOAgent()
+        pool = RolloutWorkerPool(model, num_workers=1, max_steps=256, seed=0)
+        names = [shm.name for shm in pool._traj_shms] + [pool._weights_shm.name]
+        try:
+            pool.start()
+            games = []
+            # One worker with SLOTS_PER_WORKER slots: more games than slots only arrive if
+            # get_game puts every slot back on the free queue
+            for _ in range(SLOTS_PER_WORKER + 2):
+                games.append(pool.get_game(timeout=TIMEOUT))
+            for game in games:
+                n = len(game["heads"])
+                self.assertGreater(n, 0)
+                self.assertEqual(game["states"].shape, (n, STATE_DIM))
+                self.assertEqual(game["actions"].shape, (n,))
+                self.assertTrue(np.all((game["heads"] >= 0) & (game["heads"] < len(HEADS))))
+                self.assertTrue(np.all(game["actions"] >= 0))
+                self.assertEqual(game["version"], 1)
+            self.assertEqual(pool.stats["games"], SLOTS_PER_WORKER + 2)
+            self.assertEqual(pool.stats["steps"], sum(len(g["heads"]) for g in games))
+
+            with torch.no_grad():
+                for p in model.parameters():
+                    p.add_(1.0)
+            pool.broadcast_weights(model)
+            versions = [game["version"]]
+            # Games already in flight may still carry the old version
+            for _ in range(SLOTS_PER_WORKER + 4):
+                versions.append(pool.get_game(timeout=TIMEOUT)["version"])
+                if versions[-1] == 2:
+                    break
+            self.assertEqual(versions, sorted(versions))
+            self.assertEqual(versions[-1], 2)
+            self.assertEqual(pool.stats["weight_syncs"], 2)
+        finally:
+            pool.close()
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import sys
+import os
+import random
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import Card
+from config.enums import PlayerType, CardColor, CardType, DecisionType, Direction
+from train_backend import simple_ai_action
+
+def new_game(num_players=4):
+    return GameManager([Player(i, f"P{i}", PlayerType.AI) for i in range(num_players)])
+
+def total_cards(gm):
+    return len(gm.deck.cards) + len(gm.deck.discard_pile) + sum(len(p.hand) for p in gm.players)
+
+class TestStepAPI(unittest.TestCase):
+    def test_random_games_finish_and_conserve_cards(self):
+        random.seed(0)
+        seen = set()
+        for _ in range(30):
+            gm = new_game()
+            decision = gm.reset()
+            while decision is not None:
+                self.assertIs(gm.pending_decision(), decision)
+                seen.add(decision.type)
+                if decision.type == DecisionType.PLAY_CARD:
+                    self.assertIs(decision.player, gm.get_current_player())
+                self.assertEqual(total_cards(gm), 108)
+                decision = gm.step(simple_ai_action(decision))
+            self.assertTrue(gm.game_over)
+            self.assertEqual(len(gm.winner.hand), 0)
+        self.assertEqual(seen, set(DecisionType))
+
+    def test_reset_reuses_manager(self):
+        gm = new_game()
+        gm.reset()
+        gm.step(None)
+        decision = gm.reset()
+        self.assertEqual([len(p.hand) for p in gm.players], [7, 7, 7, 7])
+        self.assertEqual(decision.type, DecisionType.PLAY_CARD)
+        self.assertEqual(total_cards(gm), 108)
+
+    def test_reset_in_place_reuses_storage(self):
+        gm = new_game()
+        deck = gm.deck
+        hands = [p.hand for p in gm.players]
+        gm.reset(seed=7)
+        first = [list(p.hand) for p in gm.players]
+        gm.step(None)
+        gm.reset(seed=7)
+        self.assertIs(gm.deck, deck)
+        self.assertEqual([p.hand for p in gm.players], first)
+        self.assertTrue(all(p.hand is h for p, h in zip(gm.players, hands)))
+        self.assertEqual(total_cards(gm), 108)
+
+    def test_interleaved_games(self):
+        random.seed(1)
+        games = [new_game() for _ in range(64)]
+        pending = {i: gm.reset() for i, gm in enumerate(games)}
+        rounds = 0
+        while pending:
+            # Collect every pending decision, then answer them all in one sweep
+            answers = {i: simple_ai_action(d) for i, d in pending.items()}
+            pending = {i: d for i, d in ((i, games[i].step(a)) for i, a in answers.items()) if d is not None}
+            rounds += 1
+        self.assertTrue(all(gm.game_over for gm in games))
+        self.assertGreater(rounds, 1)
+
+    def test_illegal_actions_rejected(self):
+        gm = new_game()
+        decision = gm.reset()
+        illegal = [c for c in decision.player.hand if c not in decision.legal_cards]
+        if illegal:
+            with self.assertRaises(ValueError):
+                gm.step(illegal[0])
+        gm.game_over = True
+        gm._decision = None
+        with self.assertRaises(RuntimeError):
+            gm.step(None)
+
+    def _wild_draw_four_setup(self, bluff):
+        gm = new_game(num_players=3)
+        gm.reset()
+        actor, victim = gm.players[0], gm.players[1]
+        for p in gm.players:
+            p.clear_hand()
+            p.add_card(Card(CardColor.GREEN, CardType.NUMBER, 9))
+        wd4 = Card(CardColor.WILD, CardType.WILD_DRAW_FOUR)
+        actor.add_card(wd4)
+        actor.add_card(Card(CardColor.RED if bluff else CardColor.YELLOW, CardType.NUMBER, 5))
+        gm.deck.discard(Card(CardColor.RED, CardType.NUMBER, 3))
+        gm.current_color = CardColor.RED
+        gm.current_player_index = 0
+        decision = gm._begin_turn()
+        decision = gm.step(wd4)
+        self.assertEqual(decision.type, DecisionType.CHOOSE_COLOR)
+        decision = gm.step(CardColor.BLUE)
+        self.assertEqual(decision.type, DecisionType.CHALLENGE)
+        self.assertIs(decision.player, victim)
+        self.assertEqual(decision.previous_color, CardColor.RED)
+        return gm, actor, victim
+
+    def test_successful_challenge(self):
+        gm, actor, victim = self._wild_draw_four_setup(bluff=True)
+        decision = gm.step(True)
+        self.assertEqual(gm.last_challenge_result, "Succeeded")
+        self.assertEqual(len(actor.hand), 3 + 4)
+        self.assertEqual(gm.current_color, CardColor.RED)
+        self.assertIs(decision.player, victim)
+
+    def test_failed_challenge_skips_victim(self):
+        gm, actor, victim = self._wild_draw_four_setup(bluff=False)
+        decision = gm.step(True)
+        self.assertEqual(gm.last_challenge_result, "Failed")
+        self.assertEqual(len(victim.hand), 1 + 6)
+        self.assertIs(decision.player, gm.players[2])
+        self.assertEqual(gm.current_color, CardColor.BLUE)
+
+    def test_start_game_after_reset_leaves_step_mode(self):
+        gm = new_game(num_players=3)
+        gm.reset(0)
+        self.assertTrue(gm.step_mode)
+        # The same pooled manager, now driven through the play_card() API
+        for p in gm.players:
+            p.reset()
+        gm.deck.reset()
+        gm._reset_state()
+        gm.challenge_decider = lambda victim, previous_color: False
+        gm.start_game()
+        self.assertFalse(gm.step_mode)
+        step = 1 if gm.direction == Direction.CLOCKWISE else -1
+        actor = gm.players[gm.current_player_index]
+        victim = gm.players[(gm.current_player_index + step) % 3]
+        wd4 = Card(CardColor.WILD, CardType.WILD_DRAW_FOUR)
+        actor.add_card(wd4)
+        before = len(victim.hand)
+        gm.play_card(actor, wd4, CardColor.BLUE)
+        # Resolved at once: the next seat drew four and no +4 is left pending
+        self.assertIsNone(gm.pending_wild_draw_four)
+        self.assertEqual(len(victim.hand), before + 4)
+
+if __name__ == "__main__":
+    unittest.main()
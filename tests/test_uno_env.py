@@ -0,0 +1,103 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from rl_utils import STATE_DIM, HEADS, encode_state
+from uno_env import UnoVectorEnv, HEAD_SLICES, MASK_DIM
+
+def rollout(env, steps, seed=0):
+    rng = np.random.default_rng(seed)
+    obs, info = env.reset(seed=seed)
+    trace = [obs.copy()]
+    finished = 0
+    for _ in range(steps):
+        obs, reward, done, info = env.step(env.sample_actions(rng))
+        trace.append(obs.copy())
+        trace.append(reward.copy())
+        finished += int(done.sum())
+    return trace, finished
+
+class TestUnoVectorEnv(unittest.TestCase):
+    def test_sync_observations_masks_and_rewards(self):
+        with UnoVectorEnv(8) as env:
+            obs, info = env.reset(seed=3)
+            self.assertEqual(obs.shape, (8, STATE_DIM))
+            self.assertEqual(info["mask"].shape, (8, MASK_DIM))
+            rng = np.random.default_rng(0)
+            finished = 0
+            for _ in range(200):
+                for i, gm in enumerate(env._slots.games):
+                    # Observation is encode_state of seat 0 at its pending decision
+                    np.testing.assert_array_equal(obs[i], encode_state(gm.players[0], gm))
+                    head = HEADS[info["head"][i]]
+                    mask = info["mask"][i]
+                    self.assertTrue(mask[HEAD_SLICES[head]].any())
+                    self.assertEqual(mask.sum(), mask[HEAD_SLICES[head]].sum())
+                obs, reward, done, info = env.step(env.sample_actions(rng))
+                for i in np.flatnonzero(done):
+                    self.assertEqual(reward[i] == 1.0, bool(info["won"][i]))
+                self.assertTrue(np.all(reward[~done] == 0))
+                finished += int(done.sum())
+            self.assertGreater(finished, 0)
+
+    def test_game_ending_before_a_choice_is_dealt_again(self):
+        with UnoVectorEnv(2) as env:
+            gm = env._slots.games[0]
+            original_reset = gm.reset
+            skipped = [2]
+
+            def reset(*args, **kwargs):
+                decision = original_reset(*args, **kwargs)
+                # Stand-in for a game that ends before seat 0 ever has a choice
+                if skipped[0]:
+                    skipped[0] -= 1
+                    return None
+                return decision
+
+            gm.reset = reset
+            obs, info = env.reset(seed=0)
+            self.assertEqual(skipped[0], 0)
+            self.assertTrue(info["mask"][0].any())
+
+            skipped[0] = 2
+            rng = np.random.default_rng(0)
+            for _ in range(2000):
+                obs, reward, done, info = env.step(env.sample_actions(rng))
+                if done[0]:
+                    break
+            self.assertTrue(done[0])
+            self.assertNotEqual(reward[0], 0.0)
+            self.assertEqual(skipped[0], 0)
+            self.assertTrue(info["mask"][0].any())
+            env.step(env.sample_actions(rng))
+
+    def test_illegal_card_rejected(self):
+        with UnoVectorEnv(1) as env:
+            _, info = env.reset(seed=0)
+            while HEADS[info["head"][0]] != "card" or info["mask"][0, :54].all():
+                _, _, _, info = env.step(env.sample_actions())
+            illegal = np.flatnonzero(~info["mask"][0, :54])[0]
+            with self.assertRaises(ValueError):
+                env.step([illegal])
+
+    def test_async_backend_matches_sync(self):
+        # Per-game seeds make results independent of the number of workers
+        with UnoVectorEnv(6) as env:
+            sync_trace, sync_done = rollout(env, 60)
+        with UnoVectorEnv(6, backend="async", num_workers=2) as env:
+            async_trace, async_done = rollout(env, 60)
+        self.assertEqual(sync_done, async_done)
+        for a, b in zip(sync_trace, async_trace):
+            np.testing.assert_array_equal(a, b)
+
+    def test_async_multiple_workers(self):
+        with UnoVectorEnv(8, backend="async", num_workers=2) as env:
+            _, finished = rollout(env, 80)
+        self.assertGreater(finished, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import os
+import random
+import unittest
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import CARD_KINDS
+from backend.zobrist import COUNT_DELTA, DISCARD_DELTA, multiset_hash
+from config.enums import PlayerType, DecisionType
+from rl_utils import encode_state
+from train_backend import simple_ai_action
+
+def make_game(n=4):
+    return GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(n)])
+
+def play(gm, seed, on_step):
+    """Play one SimpleAI game (challenging every other +4), calling on_step() at every decision."""
+    decision = gm.reset(seed)
+    while decision is not None:
+        on_step()
+        if decision.type == DecisionType.CHALLENGE:
+            action = gm.rng.random() < 0.5
+        else:
+            action = simple_ai_action(decision, gm.rng)
+        decision = gm.step(action)
+    on_step()
+
+class TestZobrist(unittest.TestCase):
+    def test_incremental_matches_recompute(self):
+        gm = make_game()
+
+        def check():
+            for p in gm.players:
+                self.assertEqual(p.hand_hash, multiset_hash([c.index for c in p.hand], COUNT_DELTA))
+            self.assertEqual(gm.deck.discard_hash,
+                             multiset_hash([c.index for c in gm.deck.discard_pile], DISCARD_DELTA))
+
+        for seed in range(20):
+            play(gm, seed, check)
+
+    def test_hand_hash_ignores_order(self):
+        rng = random.Random(1)
+        cards = [rng.choice(CARD_KINDS) for _ in range(12)]
+        a, b = Player(0, "A", PlayerType.AI), Player(1, "B", PlayerType.AI)
+        for card in cards:
+            a.add_card(card)
+        for card in reversed(cards):
+            b.add_card(card)
+        self.assertEqual(a.hand_hash, b.hand_hash)
+        b.remove_card(cards[0])
+        self.assertNotEqual(a.hand_hash, b.hand_hash)
+        a.clear_hand()
+        self.assertEqual(a.hand_hash, 0)
+
+    def test_observation_hash_tracks_encoded_state(self):
+        gm = make_game()
+        seen = {}
+
+        def check():
+            for p in gm.players:
+                state = encode_state(p, gm).tobytes()
+                # Equal observations hash equally; distinct ones (almost surely) differ
+                self.assertEqual(seen.setdefault(gm.observation_hash(p), state), state)
+
+        for seed in range(10):
+            play(gm, seed, check)
+        self.assertGreater(len(seen), 1000)
+
+    def test_state_hash_distinguishes_seats(self):
+        gm = make_game()
+        gm.reset(5)
+        before = gm.state_hash()
+        self.assertEqual(gm.state_hash(), before)
+        a, b = gm.players[1], gm.players[2]
+        hand_a, hand_b = list(a.hand), list(b.hand)
+        a.clear_hand()
+        b.clear_hand()
+        for card in hand_b:
+            a.add_card(card)
+        for card in hand_a:
+            b.add_card(card)
+        # Same multisets of hands, held by different seats
+        self.assertNotEqual(gm.state_hash(), before)
+
+    def test_discard_pile_assignment_rehashes(self):
+        gm = make_game()
+        gm.reset(2)
+        pile = [CARD_KINDS[k] for k in (3, 3, 52, 17)]
+        gm.deck.discard_pile = list(pile)
+        self.assertEqual(gm.deck.discard_hash, multiset_hash([c.index for c in pile], DISCARD_DELTA))
+        self.assertIs(gm.deck.take_top(), pile[-1])
+        self.assertEqual(gm.deck.discard_hash, multiset_hash([c.index for c in pile[:-1]], DISCARD_DELTA))
+
+    def test_state_hashes_spread(self):
+        gm = make_game()
+        hashes = []
+        play(gm, 9, lambda: hashes.append(gm.state_hash()))
+        self.assertEqual(len(set(hashes)), len(hashes))
+        bits = np.array([[(h >> i) & 1 for i in range(64)] for h in hashes])
+        # Every bit is used
+        self.assertTrue(np.all(bits.mean(axis=0) > 0.1))
+
+if __name__ == "__main__":
+    unittest.main()
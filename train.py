@@ -4,7 +4,6 @@ import torch
 import csv
 import time
 import random
-from collections import defaultdict
 
 # Add current dir to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -13,28 +12,131 @@ from backend.game_manager import GameManager
 from backend.player import Player
 from config.enums import PlayerType
 from rl_agent import RLAgentHandler
-from train_backend import run_game_epoch
+from rl_utils import HEADS, STATE_DIM
+from train_backend import run_game_epoch, game_reward
+from rollout_workers import RolloutWorkerPool
+from dataset import DatasetLoader
+from uno_env import HEAD_SLICES
+from backend.utils.logger import game_logger
+
+# Rollout workers: 0 simulates games in the learner process itself
+NUM_WORKERS = int(os.environ.get("UNO_NUM_WORKERS", "0"))
+# Broadcast learner weights to the workers every K updates
+SYNC_EVERY = int(os.environ.get("UNO_SYNC_EVERY", "1"))
+# Offline mode: train on a dataset written by dataset.py instead of simulating games
+DATASET_DIR = os.environ.get("UNO_DATASET")
+EPOCHS = int(os.environ.get("UNO_EPOCHS", "1"))
+
+HEAD_IDS = {head: i for i, head in enumerate(HEADS)}
+# Column of each head's first action in the concatenated head outputs
+HEAD_OFFSETS = torch.tensor([HEAD_SLICES[head].start for head in HEADS])
 
 class ReplayBuffer:
+    """
+    Ring buffer of transitions in preallocated, contiguous tensors.
+
+    Every state feature is a small integer (card counts, one-hots, hand
+    sizes, +/-1 direction), so states are stored exactly as int8 and only
+    widened to float32 for the sampled batch.
+    """
     def __init__(self, capacity=100000):
         self.capacity = capacity
-        self.buffer = []
+        self.states = torch.zeros((capacity, STATE_DIM), dtype=torch.int8)
+        self.heads = torch.zeros(capacity, dtype=torch.int8)     # index into HEADS
+        self.actions = torch.zeros(capacity, dtype=torch.int16)
+        self.targets = torch.zeros(capacity, dtype=torch.float32)
         self.position = 0
+        self.size = 0
+
+    def push(self, states, heads, actions, targets):
+        """Append n transitions: states [n, STATE_DIM], heads/actions/targets [n] (targets may be a scalar)."""
+        states = torch.as_tensor(states)
+        n = states.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` transitions would survive anyway
+            states, heads, actions = states[-self.capacity:], heads[-self.capacity:], actions[-self.capacity:]
+            if torch.as_tensor(targets).dim() > 0:
+                targets = targets[-self.capacity:]
+            n = self.capacity
+        idx = (self.position + torch.arange(n)) % self.capacity
+        self.states[idx] = states.to(torch.int8)
+        self.heads[idx] = torch.as_tensor(heads).to(torch.int8)
+        self.actions[idx] = torch.as_tensor(actions).to(torch.int16)
+        self.targets[idx] = torch.as_tensor(targets, dtype=torch.float32)
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
 
-    def push(self, transitions):
-        for t in transitions:
-            if len(self.buffer) < self.capacity:
-                self.buffer.append(None)
-            self.buffer[self.position] = t
-            self.position = (self.position + 1) % self.capacity
+    def push_history(self, history, target):
+        """Append RLAgentHandler.history steps, all sharing one target."""
+        if not history:
+            return
+        states = torch.cat([torch.as_tensor(step["state"]).reshape(1, -1) for step in history])
+        heads = torch.tensor([HEAD_IDS[step["head"]] for step in history])
+        actions = torch.tensor([step["action"] for step in history])
+        self.push(states, heads, actions, target)
 
     def sample(self, batch_size):
-        return random.sample(self.buffer, batch_size)
+        """Uniform sample without replacement: (states float32, heads long, actions long, targets)."""
+        idx = torch.tensor(random.sample(range(self.size), batch_size))
+        return (self.states[idx].float(), self.heads[idx].long(),
+                self.actions[idx].long(), self.targets[idx])
 
     def __len__(self):
-        return len(self.buffer)
+        return self.size
+
+def replay_loss(model, batch):
+    """
+    Sum over the heads in the batch of the MSE between the value of each row's
+    (head, action) and its target.
+
+    One forward pass over the whole batch: the head outputs are laid side by side
+    in HEADS order, so a row's prediction is a single gather at HEAD_OFFSETS[head]
+    + action. Weighting each squared error by 1 / (rows of its head) makes one sum
+    equal to the per-head means added up.
+    """
+    states, heads, actions, targets = batch
+    if heads.numel() == 0:
+        return None
+    outputs = model(states)
+    # No sigmoid, pure linear output to predict Q-value (unbounded reward sum)
+    values = torch.cat([outputs[head] for head in HEADS], dim=1)
+    preds = values.gather(1, (HEAD_OFFSETS[heads] + actions).unsqueeze(1)).squeeze(1)
+    weights = 1.0 / torch.bincount(heads, minlength=len(HEADS)).to(preds.dtype)[heads]
+    return (weights * (preds - targets) ** 2).sum()
+
+def train_offline(dataset_dir, epochs=1, batch_size=4096):
+    """Fit the agent to a pre-generated dataset, streamed batch by batch from disk."""
+    model_path = "uno_rl_model.pth"
+    agent = RLAgentHandler(model_path if os.path.exists(model_path) else None)
+    agent.model.train()
+    optimizer = torch.optim.Adam(agent.model.parameters(), lr=1e-4)
+    loader = DatasetLoader(dataset_dir, batch_size=batch_size)
+    print(f"Offline training on {loader.meta['rows']} transitions ({len(loader)} batches per epoch)...")
+    try:
+        for epoch in range(epochs):
+            start_t = time.time()
+            total, n = 0.0, 0
+            for batch in loader:
+                optimizer.zero_grad()
+                loss = replay_loss(agent.model, batch)
+                loss.backward()
+                optimizer.step()
+                total += loss.item()
+                n += 1
+            elapsed = max(time.time() - start_t, 1e-9)
+            print(f"Epoch {epoch + 1}/{epochs}: loss {total / max(n, 1):.4f}, "
+                  f"{n * batch_size / elapsed:.0f} transitions/sec")
+            torch.save(agent.model.state_dict(), model_path)
+    except KeyboardInterrupt:
+        print("Training stopped by user.")
 
 def train():
+    if DATASET_DIR:
+        return train_offline(DATASET_DIR, EPOCHS)
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     print("Starting UNO RL Training (Experience Replay + Revised Rewards)...")
     model_path = "uno_rl_model.pth"
     agent = RLAgentHandler(model_path if os.path.exists(model_path) else None)
@@ -43,7 +145,6 @@ def train():
     
     # Use 1e-4 as it is safer than 1e-1
     optimizer = torch.optim.Adam(agent.model.parameters(), lr=1e-4)
-    loss_fn = torch.nn.MSELoss()
     
     log_file_1000 = "train_log_1000.csv"
     log_file_50000 = "train_log_50000.csv"
@@ -62,42 +163,44 @@ def train():
     replay_buffer = ReplayBuffer(capacity=100000)
     BATCH_SIZE = 4096
     
+    pool = None
+    if NUM_WORKERS > 0:
+        pool = RolloutWorkerPool(agent.model, num_workers=NUM_WORKERS)
+        pool.start()
+        print(f"Started {pool.num_workers} rollout workers (sync every {SYNC_EVERY} updates).")
+    else:
+        gm = GameManager([
+            Player(0, "RL", PlayerType.RL),
+            Player(1, "S1", PlayerType.AI),
+            Player(2, "S2", PlayerType.AI),
+            Player(3, "S3", PlayerType.AI),
+        ])
+    updates = 0
+    last_log_t = time.time()
+    
     try:
         while True:
-            # Create Game: 1 RL vs 3 SimpleAI
-            p1 = Player(0, "RL", PlayerType.RL)
-            p2 = Player(1, "S1", PlayerType.AI)
-            p3 = Player(2, "S2", PlayerType.AI)
-            p4 = Player(3, "S3", PlayerType.AI)
-            gm = GameManager([p1, p2, p3, p4])
-            
-            agent.clear_history()
-            won = run_game_epoch(gm, agent)
-            total_games += 1
-            
-            # Revised Reward Structure
-            reward = 1.0 if won else -0.33
-            
-            # Penalize remaining cards if lost
-            rl_player = [p for p in gm.players if p.player_type == PlayerType.RL][0]
-            if not won:
-                reward -= len(rl_player.hand) * 0.05
-            
-            # Collect transitions from this game
-            game_transitions = []
-            for step in agent.history:
-                # Challenge specific reward logic could go here if needed.
-                # For now, apply global outcome reward to all steps.
-                step_reward = reward
+            if pool:
+                # Finished game streamed back from a rollout worker
+                game = pool.get_game()
+                won = game["won"]
+                total_games += 1
+                reward = game_reward(won, game["cards_left"])
+                # Packed trajectory arrays go straight into the ring buffer
+                replay_buffer.push(game["states"], torch.from_numpy(game["heads"]),
+                                   torch.from_numpy(game["actions"]), reward)
+            else:
+                # Pooled game (1 RL vs 3 SimpleAI), reset in place by run_game_epoch
+                agent.clear_history()
+                won = run_game_epoch(gm, agent)
+                total_games += 1
                 
-                game_transitions.append({
-                    "state": step["state"],
-                    "head": step["head"],
-                    "action": step["action"],
-                    "target": torch.tensor([step_reward], dtype=torch.float32)
-                })
-            
-            replay_buffer.push(game_transitions)
+                # Revised Reward Structure: penalize remaining cards if lost
+                rl_player = [p for p in gm.players if p.player_type == PlayerType.RL][0]
+                reward = game_reward(won, len(rl_player.hand))
+                
+                # For now, apply global outcome reward to all steps.
+                replay_buffer.push_history(agent.history, reward)
                 
             if won:
                 wins_1000 += 1
@@ -108,31 +211,15 @@ def train():
                 if len(replay_buffer) >= BATCH_SIZE:
                     optimizer.zero_grad()
                     
-                    batch_items = replay_buffer.sample(BATCH_SIZE)
-                    
-                    grouped = defaultdict(list)
-                    for t in batch_items:
-                        grouped[t["head"]].append(t)
-                        
-                    losses = []
-                    for head, items in grouped.items():
-                        if not items: continue
-                        states = torch.cat([x["state"] for x in items], dim=0)
-                        targets = torch.cat([x["target"] for x in items], dim=0)
-                        
-                        all_outputs = agent.model(states)
-                        head_outputs = all_outputs[head]
-                        
-                        actions = torch.tensor([x["action"] for x in items], dtype=torch.long).unsqueeze(1)
-                        # No sigmoid, pure linear output to predict Q-value (unbounded reward sum)
-                        preds = head_outputs.gather(1, actions).squeeze(1)
-                        
-                        losses.append(loss_fn(preds, targets))
-                        
-                    if losses:
-                        total_loss = sum(losses)
+                    batch = replay_buffer.sample(BATCH_SIZE)
+                    total_loss = replay_loss(agent.model, batch)
+
+                    if total_loss is not None:
                         total_loss.backward()
                         optimizer.step()
+                        updates += 1
+                        if pool and updates % SYNC_EVERY == 0:
+                            pool.broadcast_weights(agent.model)
                         
                     torch.save(agent.model.state_dict(), model_path)
                 
@@ -140,7 +227,10 @@ def train():
                 tr_wins = wins_1000
                 rate = tr_wins / 1000.0
                 t_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                print(f"[{t_str}] Games: {total_games}, Wins (last 1000): {tr_wins}, Rate: {rate:.2%}")
+                now = time.time()
+                games_per_sec = 1000 / max(now - last_log_t, 1e-9)
+                last_log_t = now
+                print(f"[{t_str}] Games: {total_games}, Wins (last 1000): {tr_wins}, Rate: {rate:.2%}, Games/sec: {games_per_sec:.1f}")
                 with open(log_file_1000, 'a', newline='') as f:
                     csv.writer(f).writerow([t_str, tr_wins, 1000, rate])
                 wins_1000 = 0
@@ -156,6 +246,9 @@ def train():
                 
     except KeyboardInterrupt:
         print("Training stopped by user.")
+    finally:
+        if pool:
+            pool.close()
 
 if __name__ == "__main__":
     train()
@@ -1,101 +1,68 @@
 from backend.game_manager import GameManager
-from config.enums import PlayerType, CardColor
+from backend.player import Player
+from config.enums import PlayerType, CardColor, DecisionType
 from rl_agent import RLAgentHandler
 import random
 
-def run_game_epoch(gm: GameManager, rl_agent: RLAgentHandler):
-    # Setup challenge decider
-    def challenge_decider(victim, prev_color):
-        if victim.player_type == PlayerType.RL:
-            initial_count = len(rl_agent.history)
-            choice = rl_agent.should_challenge(victim, gm)
-            
-            if len(rl_agent.history) > initial_count:
-                 # Mark the index we just added
-                 rl_agent.history[-1]["challenge_pending"] = True
-                 
-            return choice
-        else:
-            return random.random() < 0.3 # SimpleAI
-            
-    gm.challenge_decider = challenge_decider
-    
-    # Start
-    gm.start_game()
-    
-    # Loop
-    while not gm.game_over:
-        curr_player = gm.get_current_player()
-        top_card = gm.deck.peek_discard_pile()
-        
-        # Check pending challenge result
-        if rl_agent.is_train and rl_agent.history:
-            last = rl_agent.history[-1]
-            if last.get("challenge_pending"):
-                outcome = gm.last_challenge_result
-                # Outcome: True = Challenger Won. False = Challenger Lost.
-                if outcome is not None and last["action"] == 1: # We Challenged
-                     last["challenge_success"] = outcome
-                
-                del last["challenge_pending"]
+def game_reward(won, cards_left):
+    """Final reward for the RL seat: +1 for a win, otherwise -0.33 minus 0.05 per card left."""
+    if won:
+        return 1.0
+    return -0.33 - cards_left * 0.05
+
+COLORS = [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]
+
+def simple_ai_action(decision, rng=random):
+    """SimpleAI: random legal card, random color, plays a drawn card half the time, challenges ~30%."""
+    if decision.type == DecisionType.PLAY_CARD:
+        return rng.choice(decision.legal_cards) if decision.legal_cards else None
+    if decision.type == DecisionType.CHOOSE_COLOR:
+        return rng.choice(COLORS)
+    if decision.type == DecisionType.PLAY_DRAWN:
+        return rng.random() < 0.5
+    return rng.random() < 0.3
 
-        if curr_player.player_type == PlayerType.RL:
-            # 1. Check legal plays
-            legal_cards = [c for c in curr_player.hand if gm.check_legal_play(c, top_card)]
-            
-            if legal_cards:
-                # Choose card
-                card = rl_agent.select_card(curr_player, gm, legal_cards)
-                
-                # Choose color if Wild
-                color = None
-                if card.color == CardColor.WILD:
-                    color = rl_agent.select_color(curr_player, gm)
-                
-                # Play
-                gm.play_card(curr_player, card, color)
-            else:
-                # Must draw
-                card = gm.deck.draw_card()
-                if card:
-                    curr_player.add_card(card)
-                    # Check if playable
-                    if gm.check_legal_play(card, top_card):
-                        if rl_agent.should_play_drawn(curr_player, gm, card):
-                             color = None
-                             if card.color == CardColor.WILD:
-                                 color = rl_agent.select_color(curr_player, gm)
-                             gm.play_card(curr_player, card, color)
-                        else:
-                             gm._advance_turn()
-                    else:
-                        gm._advance_turn()
-                else:
-                    gm._advance_turn()
-        
+def replay_game(seed: bytes, num_players=4):
+    """Re-simulate an all-SimpleAI game exactly from its 16-byte seed. Returns the finished GameManager."""
+    gm = GameManager([Player(i, f"S{i}", PlayerType.AI) for i in range(num_players)])
+    decision = gm.reset(seed)
+    while decision is not None:
+        decision = gm.step(simple_ai_action(decision, gm.rng))
+    return gm
+
+def rl_action(decision, gm: GameManager, rl_agent: RLAgentHandler):
+    player = decision.player
+    solver = rl_agent.endgame_solver
+    if solver is not None and solver.applies(gm):
+        return solver.oracle_action(gm)
+    if decision.type == DecisionType.PLAY_CARD:
+        # Nothing playable: draw (legal_mask over the hand counts inside select_card otherwise)
+        return rl_agent.select_card(player, gm) if decision.legal_cards else None
+    if decision.type == DecisionType.CHOOSE_COLOR:
+        return rl_agent.select_color(player, gm)
+    if decision.type == DecisionType.PLAY_DRAWN:
+        return rl_agent.should_play_drawn(player, gm, decision.card)
+    return rl_agent.should_challenge(player, gm)
+
+def run_game_epoch(gm: GameManager, rl_agent: RLAgentHandler, seed=None):
+    """
+    Play one game (RL seats driven by rl_agent, the rest by SimpleAI) through the step API.
+    seed is passed to gm.reset(); SimpleAI draws from the game's own RNG.
+    """
+    decision = gm.reset(seed)
+    while decision is not None:
+        if decision.player.player_type == PlayerType.RL:
+            history_len = len(rl_agent.history)
+            action = rl_action(decision, gm, rl_agent)
+            is_challenge = decision.type == DecisionType.CHALLENGE
+            decision = gm.step(action)
+            # Outcome: "Succeeded" = challenger won, "Failed" = challenger lost
+            if is_challenge and action and len(rl_agent.history) > history_len:
+                outcome = gm.last_challenge_result
+                if outcome is not None:
+                    rl_agent.history[-1]["challenge_success"] = outcome
         else:
-            # Simple AI (Random but valid)
-            legal_cards = [c for c in curr_player.hand if gm.check_legal_play(c, top_card)]
-            if legal_cards:
-                 card = random.choice(legal_cards) 
-                 # Pick a valid color from enum, avoiding "WILD" string if we need concrete
-                 color = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
-                 gm.play_card(curr_player, card, color)
-            else:
-                 # Draw
-                 card = gm.deck.draw_card()
-                 if card:
-                     curr_player.add_card(card)
-                     if gm.check_legal_play(card, top_card):
-                         if random.random() < 0.5:
-                             color = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
-                             gm.play_card(curr_player, card, color)
-                         else:
-                             gm._advance_turn()
-                     else:
-                         gm._advance_turn()
-                 else:
-                     gm._advance_turn()
+            decision = gm.step(simple_ai_action(decision, gm.rng))
 
     # Return True if RL won
     return gm.winner and gm.winner.player_type == PlayerType.RL
@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from rl_model import UNOAgent
 from rl_agent import RLAgentHandler
 from train_challenge_backend import ChallengeBackend
+from backend.utils.logger import game_logger
 
 def update_weights(model, optimizer, batch_data):
     if not batch_data:
@@ -51,6 +52,8 @@ def update_weights(model, optimizer, batch_data):
     optimizer.step()
 
 def main():
+    # Simulation profile: no per-move log formatting in the hot loop
+    game_logger.set_profile("simulation")
     # Setup CSVs
     f1 = open("challenge_train_1k.csv", "w", newline='')
     writer1 = csv.writer(f1)
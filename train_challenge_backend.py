@@ -9,7 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from backend.game_manager import GameManager
 from backend.player import Player
-from config.enums import PlayerType
+from config.enums import PlayerType, DecisionType
 from backend.card import Card, CardType, CardColor
 from rl_agent import RLAgentHandler
 
@@ -45,8 +45,7 @@ class ChallengeBackend:
         # Ground Truth: Did attacker have the previous color?
         # If yes, they are bluffing -> Challenge is Correct.
         # If no, they are legal -> Challenge is Incorrect.
-        att_hand = attacker.hand
-        has_color = any(c.color == previous_color for c in att_hand)
+        has_color = attacker.has_color(previous_color)
         
         # Agent Decision
         # Note: We pass gm to agent so it can encode state
@@ -98,94 +97,44 @@ class ChallengeBackend:
     def run_game(self):
         # Setup 4 players: 1 RL, 3 SimpleAI (Random Legal)
         
-        players = [
-            Player(0, "RL_Agent", PlayerType.AI), 
-            Player(1, "SimpleAI_1", PlayerType.AI), 
-            Player(2, "SimpleAI_2", PlayerType.AI),
-            Player(3, "SimpleAI_3", PlayerType.AI)
-        ]
-        
-        self.current_gm = GameManager(players)
-        
-        # Set the challenge decider for the RL agent
-        # We need to hook ONLY the RL agent's decision?
-        # Or GameManager uses one global decider?
-        # GameManager.challenge_decider is a single callback.
-        # We need to filter inside if it's the RL agent.
-        
-        original_decider = self.challenge_decider
-        
-        def filtered_decider(victim, color):
-            if victim.name == "RL_Agent":
-                return original_decider(victim, color)
-            else:
-                # SimpleAI logic (approx 0.3 chance)
-                # Or just return False/Random?
-                # Using standard logic usually inside SimpleAI?
-                # GameManager expects decider to return bool.
-                # If SimpleAI is victim, let's just use random 0.3 like standard SimpleAI
-                return random.random() < 0.3
-                
-        self.current_gm.challenge_decider = filtered_decider
-        
-        # Override RL Agent's selection methods to use our agent
-        # We need to patch the AI logic for RL_Agent?
-        # GameManager calls `player.choose_card` etc.
-        # But `choose_card` is manual for humans.
-        # We need a loop that calls agent.
-        
+        # The GameManager and its players are pooled across games and reset in place
+        if self.current_gm is None:
+            players = [
+                Player(0, "RL_Agent", PlayerType.AI), 
+                Player(1, "SimpleAI_1", PlayerType.AI), 
+                Player(2, "SimpleAI_2", PlayerType.AI),
+                Player(3, "SimpleAI_3", PlayerType.AI)
+            ]
+            self.current_gm = GameManager(players)
         gm = self.current_gm
         
-        # Override decider
-        # Note: We must capture the 'bound' simple decider logic or implement it here
-        # standard_decider uses self.current_gm which is correct.
-        
-        standard_decider = self.challenge_decider
-        
-        def filtered_decider(victim, color):
-            # Log attempts to debug frequency
-            # print(f"DEBUG: +4 Played against {victim.name}")
-            if victim.name == "RL_Agent":
-                 return standard_decider(victim, color)
-            else:
-                 return random.random() < 0.3
-        
-        gm.challenge_decider = filtered_decider
-        
-        gm.start_game()
-        
-        while not gm.game_over:
-            curr_player = gm.get_current_player()
+        # Step API: every choice (including the +4 challenge) comes back as a Decision.
+        # While a CHALLENGE is pending, current_player_index is still the +4 player,
+        # which challenge_decider relies on for the bluff ground truth.
+        decision = gm.reset()
+        while decision is not None:
+            player = decision.player
+            is_rl = player.name == "RL_Agent"
             
-            if curr_player.name == "RL_Agent":
-                 # RL Action
-                 top = gm.deck.peek_discard_pile()
-                 legal_cards = [c for c in curr_player.hand if gm.check_legal_play(c, top)]
-                 
-                 card_to_play = self.agent.select_card(curr_player, gm, legal_cards)
-                 
-                 if card_to_play and (card_to_play.card_type == CardType.WILD or card_to_play.card_type == CardType.WILD_DRAW_FOUR):
-                     color = self.agent.select_color(curr_player, gm)
-                     gm.play_card(curr_player, card_to_play, color)
-                 elif card_to_play:
-                     gm.play_card(curr_player, card_to_play)
-                 else:
-                     gm.draw_card_action(curr_player)
-                     
-            else:
-                # SimpleAI logic
-                top = gm.deck.peek_discard_pile()
-                legal = [c for c in curr_player.hand if gm.check_legal_play(c, top)]
-                if legal:
-                    c = random.choice(legal)
-                    color = None
-                    if c.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-                         # SimpleAI randomly picks color? Or picks most abundant color in hand?
-                         # Let's say random for now.
-                        color = random.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
-                    gm.play_card(curr_player, c, color)
+            if decision.type == DecisionType.CHALLENGE:
+                # SimpleAI victims challenge ~30% of the time
+                action = self.challenge_decider(player, decision.previous_color) if is_rl else gm.rng.random() < 0.3
+            elif decision.type == DecisionType.PLAY_CARD:
+                if is_rl:
+                    # None (no legal card) means draw
+                    action = self.agent.select_card(player, gm, decision.legal_cards)
+                else:
+                    action = gm.rng.choice(decision.legal_cards) if decision.legal_cards else None
+            elif decision.type == DecisionType.CHOOSE_COLOR:
+                if is_rl:
+                    action = self.agent.select_color(player, gm)
                 else:
-                    gm.draw_card_action(curr_player)
+                    action = gm.rng.choice([CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW])
+            else:
+                # PLAY_DRAWN: this trainer always ends the turn after drawing
+                action = False
+            
+            decision = gm.step(action)
 
         if gm.winner and gm.winner.name == "RL_Agent":
             self.stats["wins"] += 1
@@ -0,0 +1,300 @@
+import os
+import sys
+import traceback
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.game_manager import GameManager
+from backend.player import Player
+from backend.card import CARD_KINDS
+from backend.legality import legal_mask
+from config.enums import PlayerType, DecisionType
+from rl_utils import STATE_DIM, HEADS, COLOR_ORDER, HAND_SLICE, IncrementalStateEncoder
+from train_backend import simple_ai_action, game_reward
+
+# Flat action mask: one block per head, in HEADS order
+HEAD_SLICES = {
+    "card": slice(0, 54),
+    "challenge": slice(54, 56),
+    "play_drawn": slice(56, 58),
+    "color": slice(58, 62),
+}
+MASK_DIM = 62
+
+_DECISION_HEADS = {
+    DecisionType.PLAY_CARD: HEADS.index("card"),
+    DecisionType.CHALLENGE: HEADS.index("challenge"),
+    DecisionType.PLAY_DRAWN: HEADS.index("play_drawn"),
+    DecisionType.CHOOSE_COLOR: HEADS.index("color"),
+}
+_HEAD_MASK_SLICES = [HEAD_SLICES[head] for head in HEADS]
+
+# name, dtype, per-game shape of the arrays shared between the env and its backend
+_FIELDS = [
+    ("obs", np.float32, (STATE_DIM,)),
+    ("mask", np.bool_, (MASK_DIM,)),
+    ("head", np.int8, ()),
+    ("reward", np.float32, ()),
+    ("done", np.bool_, ()),
+    ("won", np.bool_, ()),
+    ("cards_left", np.int16, ()),
+    ("action", np.int16, ()),
+]
+
+def _layout(num_envs):
+    """Byte offset of each field inside one contiguous block."""
+    offsets = {}
+    size = 0
+    for name, dtype, shape in _FIELDS:
+        offsets[name] = size
+        size += num_envs * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+    return offsets, size
+
+def _attach(buf, num_envs):
+    offsets, _ = _layout(num_envs)
+    return {name: np.ndarray((num_envs,) + shape, dtype=dtype, buffer=buf, offset=offsets[name])
+            for name, dtype, shape in _FIELDS}
+
+
+class _GameSlots:
+    """
+    Runs a contiguous range of games in-process and writes their outputs into
+    the given field arrays (views of the env block, or of a shared-memory block).
+
+    Seat 0 is the learning player; the other seats are SimpleAI. A game only
+    surfaces decisions of seat 0 that have a choice (a PLAY_CARD with no legal
+    card is answered with a draw automatically).
+    """
+
+    def __init__(self, arrays, lo, hi, num_players):
+        self.lo = lo
+        self.arrays = {name: arr[lo:hi] for name, arr in arrays.items()}
+        self.games = []
+        self.encoders = []
+        for _ in range(hi - lo):
+            players = [Player(0, "RL", PlayerType.RL)] + [
+                Player(i, f"S{i}", PlayerType.AI) for i in range(1, num_players)]
+            gm = GameManager(players)
+            self.games.append(gm)
+            self.encoders.append(IncrementalStateEncoder(gm))
+        self.pending = [None] * len(self.games)
+
+    def reset(self, seed=None):
+        self.arrays["reward"][:] = 0
+        self.arrays["done"][:] = False
+        for i in range(len(self.games)):
+            self._new_game(i, seed)
+
+    def step(self):
+        a = self.arrays
+        for i, gm in enumerate(self.games):
+            decision = self.pending[i]
+            if decision is None:
+                raise RuntimeError("reset() must be called before step()")
+            decision = gm.step(self._to_engine_action(decision, int(a["action"][i])))
+            if self._advance(i, decision):
+                a["reward"][i] = 0.0
+                a["done"][i] = False
+                continue
+            # Game over: report it, then auto-reset so obs holds the next game's first decision
+            rl_player = gm.players[0]
+            won = gm.winner is rl_player
+            a["reward"][i] = game_reward(won, len(rl_player.hand))
+            a["done"][i] = True
+            a["won"][i] = won
+            a["cards_left"][i] = len(rl_player.hand)
+            self._new_game(i)
+
+    def _new_game(self, i, seed=None):
+        """
+        Start the next game of slot i, dealing again until seat 0 has a real choice:
+        a game that ends before then has nothing to surface and is skipped.
+        """
+        gm = self.games[i]
+        # Game k of the env always gets game_seed(seed, k), whichever worker runs it;
+        # later games of that slot follow from its RNG
+        decision = gm.reset(seed, game_id=self.lo + i) if seed is not None else gm.reset()
+        while not self._advance(i, decision):
+            decision = gm.reset()
+
+    def _advance(self, i, decision):
+        """Play opponents until seat 0 has a real choice. Returns False if the game ended first."""
+        gm = self.games[i]
+        while decision is not None:
+            if decision.player.player_id != 0:
+                decision = gm.step(simple_ai_action(decision, gm.rng))
+            elif decision.type == DecisionType.PLAY_CARD and not decision.legal_cards:
+                decision = gm.step(None)
+            else:
+                break
+        self.pending[i] = decision
+        if decision is None:
+            return False
+
+        a = self.arrays
+        obs = a["obs"][i]
+        obs[:] = self.encoders[i].encode(decision.player)
+        head = _DECISION_HEADS[decision.type]
+        a["head"][i] = head
+        mask = a["mask"][i]
+        mask[:] = False
+        if decision.type == DecisionType.PLAY_CARD:
+            mask[HEAD_SLICES["card"]] = legal_mask(obs[HAND_SLICE], gm.deck.peek_discard_pile(), gm.current_color)
+        else:
+            mask[_HEAD_MASK_SLICES[head]] = True
+        return True
+
+    @staticmethod
+    def _to_engine_action(decision, action):
+        if decision.type == DecisionType.PLAY_CARD:
+            card = CARD_KINDS[action]
+            if card not in decision.legal_cards:
+                raise ValueError(f"Illegal card kind {action} for {decision.player.name}")
+            return card
+        if decision.type == DecisionType.CHOOSE_COLOR:
+            return COLOR_ORDER[action]
+        return bool(action)
+
+
+def _worker_main(remote, shm_name, num_envs, lo, hi, num_players):
+    """Async backend worker: owns games [lo, hi) and serves reset/step commands from the pipe."""
+    from backend.utils.logger import game_logger
+
+    game_logger.set_profile("simulation")
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = _attach(shm.buf, num_envs)
+    slots = _GameSlots(arrays, lo, hi, num_players)
+    try:
+        while True:
+            cmd, arg = remote.recv()
+            if cmd == "close":
+                break
+            try:
+                if cmd == "reset":
+                    slots.reset(arg)
+                elif cmd == "step":
+                    slots.step()
+                remote.send(("ok", None))
+            except Exception:
+                remote.send(("error", traceback.format_exc()))
+    finally:
+        del slots, arrays
+        shm.close()
+
+
+class UnoVectorEnv:
+    """
+    N UNO games behind one reset()/step(actions) interface, gym vector-env style.
+
+    Seat 0 of every game is the learning agent and seats 1..P-1 are SimpleAI.
+    Every step returns, per game:
+        obs    [N, STATE_DIM] float32  encode_state of seat 0 at its pending decision
+        reward [N] float32             game_reward() on the step that ends a game, else 0
+        done   [N] bool                the game ended; it is reset automatically and
+                                       obs/info already describe the next game
+    info holds "head" [N] (index into HEADS of the pending decision), "mask"
+    [N, MASK_DIM] (legal actions; HEAD_SLICES gives each head's block) and, for
+    finished games, "won" and "cards_left". actions are head-local indices: a
+    card kind 0-53, 0/1 for challenge and play_drawn, or a COLOR_ORDER index.
+
+    backend="sync" steps all games in this process. backend="async" splits them
+    across worker processes that write straight into one shared-memory block;
+    the returned arrays are views that are overwritten by the next call.
+    """
+
+    def __init__(self, num_envs, backend="sync", num_workers=None, num_players=4):
+        if backend not in ("sync", "async"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.num_envs = num_envs
+        self.backend = backend
+        _, size = _layout(num_envs)
+
+        self._shm = None
+        self._remotes = []
+        self._procs = []
+        if backend == "sync":
+            self._block = bytearray(size)
+            self._arrays = _attach(self._block, num_envs)
+            self._slots = _GameSlots(self._arrays, 0, num_envs, num_players)
+            return
+
+        self.num_workers = min(num_workers or max(1, os.cpu_count() or 1), num_envs)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._arrays = _attach(self._shm.buf, num_envs)
+        ctx = mp.get_context("spawn")
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            remote, child = ctx.Pipe()
+            p = ctx.Process(target=_worker_main,
+                            args=(child, self._shm.name, num_envs, int(lo), int(hi), num_players),
+                            daemon=True)
+            p.start()
+            child.close()
+            self._remotes.append(remote)
+            self._procs.append(p)
+
+    def _info(self):
+        a = self._arrays
+        return {"head": a["head"], "mask": a["mask"], "won": a["won"], "cards_left": a["cards_left"]}
+
+    def _call(self, cmd, args):
+        for remote, arg in zip(self._remotes, args):
+            remote.send((cmd, arg))
+        errors = [msg for status, msg in (remote.recv() for remote in self._remotes) if status == "error"]
+        if errors:
+            raise RuntimeError("UnoVectorEnv worker failed:\n" + errors[0])
+
+    def reset(self, seed=None):
+        """Start every game. Returns (obs, info)."""
+        if self.backend == "sync":
+            self._slots.reset(seed)
+        else:
+            self._call("reset", [seed] * len(self._remotes))
+        return self._arrays["obs"], self._info()
+
+    def step(self, actions):
+        """Apply one head-local action per game. Returns (obs, reward, done, info)."""
+        self._arrays["action"][:] = actions
+        if self.backend == "sync":
+            self._slots.step()
+        else:
+            self._call("step", [None] * len(self._remotes))
+        a = self._arrays
+        return a["obs"], a["reward"], a["done"], self._info()
+
+    def sample_actions(self, rng=None):
+        """Uniformly random legal action per game (the mask's head block)."""
+        rng = rng or np.random.default_rng()
+        actions = np.empty(self.num_envs, dtype=np.int64)
+        for i in range(self.num_envs):
+            block = self._arrays["mask"][i, _HEAD_MASK_SLICES[self._arrays["head"][i]]]
+            actions[i] = rng.choice(np.flatnonzero(block))
+        return actions
+
+    def close(self):
+        for remote in self._remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._remotes = []
+        self._procs = []
+        # Drop array views before closing the block they point into
+        self._arrays = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()